@@ -0,0 +1,303 @@
+"""Benchmarks of the simulation, summary, plotting and rendering hot paths.
+
+Run from the repository root with::
+
+    uv run python benchmarks/run.py --output benchmarks.json
+
+Every benchmark is timed ``--repeat`` times, each time calling it as often as
+fits in ``--min-time`` seconds, and the per-call statistics are printed and
+written as JSON (with the versions and machine they were measured on). Pass
+``--compare old.json`` to show the change relative to an earlier run and
+``--filter`` to only run benchmarks whose name contains a substring.
+
+With ``--check`` the run fails if a benchmark is (more than 10%) slower than
+the one it is meant to beat (see ``FASTER_THAN``), e.g. the NumPy engine than
+the loop.
+
+Today's date is fixed so the simulated horizons, and thereby the timings, do
+not drift between runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import functools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import wenfire.fire
+from wenfire import app as app_module
+from wenfire.fire import (
+    InputData,
+    ParameterChange,
+    ParameterField,
+    Summary,
+    calculate_results_for_month,
+    calculate_results_frame,
+    goal_seek,
+    solve_fire_date,
+    sweep,
+)
+from wenfire.montecarlo import MonteCarloSettings, run_monte_carlo
+from wenfire.plots import (
+    plot_age_vs_net_worth,
+    plot_monthly_financial_flows,
+)
+
+REPO = Path(__file__).resolve().parent.parent
+TODAY = datetime.date(2024, 4, 1)
+HORIZON_YEARS = (10, 50, 100)
+CHANGE_COUNTS = (0, 5, 20)
+CHANGE_FIELDS: tuple[ParameterField, ...] = (
+    "spending_per_month",
+    "growth_rate",
+    "income_per_month",
+    "inflation",
+)
+
+BASE = InputData(
+    growth_rate=7.0,
+    current_nw=50_000.0,
+    spending_per_month=4_000.0,
+    inflation=2.0,
+    annual_salary_increase=5.0,
+    income_per_month=8_000.0,
+    extra_income=0.0,
+    date_of_birth=datetime.date(1990, 1, 1),
+)
+# Never reaches FIRE, so the whole horizon is simulated
+NEVER_FIRE = BASE.model_copy(
+    update={"income_per_month": 3_000.0, "annual_salary_increase": 0.0}
+)
+
+
+def _faster_than() -> dict[str, str]:
+    """Benchmarks that must not be slower than another one, for ``--check``."""
+    pairs = {}
+    for years in HORIZON_YEARS:
+        for n_changes in CHANGE_COUNTS:
+            suffix = f"[horizon={years}y,changes={n_changes}]"
+            loop = f"calculate_results_for_month[loop]{suffix}"
+            pairs[f"calculate_results_for_month[numpy]{suffix}"] = loop
+            pairs[f"calculate_results_frame{suffix}"] = loop
+    return pairs
+
+
+FASTER_THAN = _faster_than()
+# Slack for timing noise, e.g. when a change every few months makes them even
+CHECK_TOLERANCE = 1.1
+
+
+def _with_changes(data: InputData, n_changes: int, years: int) -> InputData:
+    """``data`` with ``n_changes`` parameter changes spread over ``years``."""
+    changes = [
+        ParameterChange(
+            date=TODAY
+            + datetime.timedelta(days=365.25 * years * (i + 1) / (n_changes + 1)),
+            field=CHANGE_FIELDS[i % len(CHANGE_FIELDS)],
+            value=getattr(data, CHANGE_FIELDS[i % len(CHANGE_FIELDS)]) * 1.01,
+        )
+        for i in range(n_changes)
+    ]
+    return data.model_copy(update={"parameter_changes": changes})
+
+
+def _benchmarks() -> dict[str, Callable[[], object]]:
+    benchmarks: dict[str, Callable[[], object]] = {}
+
+    for years in HORIZON_YEARS:
+        for n_changes in CHANGE_COUNTS:
+            data = _with_changes(NEVER_FIRE, n_changes, years)
+            suffix = f"[horizon={years}y,changes={n_changes}]"
+            for engine in ("loop", "numpy"):
+                benchmarks[f"calculate_results_for_month[{engine}]{suffix}"] = (
+                    functools.partial(
+                        calculate_results_for_month, data, years * 12, engine=engine
+                    )
+                )
+            benchmarks[f"calculate_results_frame{suffix}"] = functools.partial(
+                calculate_results_frame, data, years * 12
+            )
+
+    results = calculate_results_for_month(BASE)
+    frame = calculate_results_frame(BASE)
+    summary = Summary.from_results(frame)
+    assert summary is not None  # BASE reaches FIRE
+    benchmarks["Summary.from_results[list]"] = lambda: Summary.from_results(results)
+    benchmarks["Summary.from_results[frame]"] = lambda: Summary.from_results(frame)
+    benchmarks["solve_fire_date"] = lambda: solve_fire_date(BASE)
+    benchmarks["goal_seek[spending_per_month]"] = lambda: goal_seek(
+        BASE, "spending_per_month", fire_age=45
+    )
+    benchmarks["sweep[50x50]"] = lambda: sweep(
+        BASE,
+        "growth_rate",
+        np.linspace(5, 9, 50),
+        "spending_per_month",
+        np.linspace(3_000, 6_000, 50),
+    )
+    benchmarks["run_monte_carlo[10000 paths]"] = lambda: run_monte_carlo(
+        BASE, MonteCarloSettings(n_paths=10_000, seed=0)
+    )
+
+    benchmarks["plot_age_vs_net_worth"] = lambda: plot_age_vs_net_worth(frame, summary)
+    benchmarks["plot_monthly_financial_flows"] = lambda: plot_monthly_financial_flows(
+        frame, summary
+    )
+
+    template = app_module.templates.get_template("results_partial.html.jinja2")
+    context = {
+        "results": frame,
+        "yearly_results": frame.yearly(),
+        "yearly_colors": app_module.interpolate_colors(
+            [year.safe_withdraw_minus_spending for year in frame.yearly()]
+        ),
+        "url_params": "",
+        "summary": summary,
+        "summary_with_extra": summary,
+        "time_difference": None,
+        "extra_spending": 0,
+        "age_vs_net_worth_plot": plot_age_vs_net_worth(frame, summary),
+        "monthly_financial_flows_plot": plot_monthly_financial_flows(frame, summary),
+    }
+    benchmarks["render[results_partial]"] = lambda: template.render(context)
+
+    from fastapi.testclient import TestClient
+
+    client = TestClient(app_module.app)
+    headers = {"HX-Request": "true"}
+
+    def calculate_cold():
+        app_module.projection_cache.clear()
+        app_module.chart_cache.clear()
+        return client.get("/calculate", headers=headers)
+
+    benchmarks["GET /calculate[cold]"] = calculate_cold
+    benchmarks["GET /calculate[cached]"] = lambda: client.get(
+        "/calculate", headers=headers
+    )
+    return benchmarks
+
+
+def _time(fn: Callable[[], object], repeat: int, min_time: float) -> dict:
+    """Per-call seconds over ``repeat`` rounds of the calls that fit in ``min_time``."""
+    fn()  # Warm up lazy imports and caches
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10 or number >= 1_000_000:
+            break
+        number *= 10
+    number = max(1, round(number * min_time / 10 / max(elapsed, 1e-9)))
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "calls_per_round": number,
+        "rounds": repeat,
+    }
+
+
+def _machine() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.datetime.now(datetime.UTC).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--compare", type=Path, help="JSON of an earlier run")
+    parser.add_argument("--filter", default="", help="Only names containing this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds/round")
+    parser.add_argument(
+        "--check", action="store_true", help="Fail if FASTER_THAN does not hold"
+    )
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["benchmarks"]
+
+    # The TestClient route goes through fastapi-htmx, which uses a deprecated API
+    warnings.simplefilter("ignore", DeprecationWarning)
+    os.environ.setdefault("WENFIRE_EXECUTOR", "inline")
+    results = {}
+    with patch.object(wenfire.fire, "_today", return_value=TODAY):
+        for name, fn in _benchmarks().items():
+            if args.filter not in name:
+                continue
+            results[name] = timing = _time(fn, args.repeat, args.min_time)
+            line = f"{name:<70} {_format_seconds(timing['median']):>10}"
+            if name in baseline:
+                ratio = timing["median"] / baseline[name]["median"]
+                line += f"  {ratio:6.2f}x"
+            print(line, flush=True)
+
+    if args.output:
+        report = {"machine": _machine(), "benchmarks": results}
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    slower = [
+        f"{fast} is slower than {slow}"
+        for fast, slow in FASTER_THAN.items()
+        if fast in results
+        and slow in results
+        and results[fast]["min"] > CHECK_TOLERANCE * results[slow]["min"]
+    ]
+    for line in slower:
+        print(f"SLOWER: {line}", file=sys.stderr)
+    if args.check and slower:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
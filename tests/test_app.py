@@ -1,11 +1,9 @@
 import datetime
-from unittest.mock import patch
 
 import pytest
 
 from pydantic import ValidationError
 
-import wenfire.fire
 from wenfire.fire import (
     InputData,
     Results,
@@ -15,33 +13,6 @@ from wenfire.fire import (
 )
 
 
-# Fixtures
-@pytest.fixture
-def input_data() -> InputData:
-    return InputData(
-        growth_rate=5.0,
-        current_nw=100000.0,
-        spending_per_month=3000.0,
-        inflation=2.0,
-        annual_salary_increase=3.0,
-        income_per_month=5000.0,
-        extra_income=500.0,
-        date_of_birth=datetime.date(1990, 1, 1),
-        safe_withdraw_rate=4.0,
-    )
-
-
-# Mock today's date for consistent testing
-@pytest.fixture(autouse=True)
-def fixed_today():
-    """
-    A pytest fixture that mocks datetime.date.today() to return 2024-04-01.
-    """
-    fixed_date = datetime.date(2024, 4, 1)
-    with patch.object(wenfire.fire, "_today", return_value=fixed_date):
-        yield fixed_date
-
-
 # Tests for InputData
 def test_input_data_age_at(input_data: InputData) -> None:
     target_date = datetime.date(2024, 4, 1)
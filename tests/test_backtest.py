@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from wenfire.backtest import (
+    BacktestSettings,
+    HistoryUnavailable,
+    load_history,
+    run_backtest,
+    save_history,
+)
+from wenfire.fire import InputData, ParameterChange, solve_fire_date
+
+
+def _history(path: Path, returns: np.ndarray, inflation: np.ndarray) -> np.ndarray:
+    months = np.datetime64("1900-01") + np.arange(len(returns))
+    save_history(path, months, returns, inflation)
+    return load_history(path)
+
+
+def test_constant_history_matches_the_plan(input_data: InputData, tmp_path) -> None:
+    n_months = 60 * 12
+    returns = np.full(n_months, 1.07 ** (1 / 12) - 1)
+    inflation = np.full(n_months, 1.02 ** (1 / 12) - 1)
+    history = _history(tmp_path / "history.npy", returns, inflation)
+    assert isinstance(history, np.memmap)
+
+    data = input_data.model_copy(update={"growth_rate": 7.0, "inflation": 2.0})
+    settings = BacktestSettings(horizon_years=40, step_months=12)
+    result = run_backtest(data, settings, history)
+    assert result.n_cohorts == 21
+    assert result.success_rate == 1
+    assert result.cohorts[0].start.isoformat() == "1900-01-01"
+    expected = solve_fire_date(data)
+    assert expected is not None
+    for cohort in result.cohorts:
+        assert cohort.fire_age == pytest.approx(expected.fire_age, abs=1 / 365)
+    # The history replaces the assumed growth, also after parameter changes
+    change = ParameterChange(date=expected.fire_date, field="growth_rate", value=50)
+    changed = data.model_copy(update={"parameter_changes": [change]})
+    assert run_backtest(changed, settings, history) == result
+
+
+def test_worst_and_best_cohort(input_data: InputData, tmp_path) -> None:
+    n_months = 50 * 12
+    returns = np.full(n_months, 0.005)
+    returns[120:240] = -0.01  # A lost decade
+    returns[300:] = 0.02
+    history = _history(tmp_path / "history.npy", returns, np.zeros(n_months))
+    result = run_backtest(input_data, BacktestSettings(horizon_years=20), history)
+    assert result.n_cohorts == 31
+    ages = [cohort.fire_age or np.inf for cohort in result.cohorts]
+    assert result.worst_cohort == result.cohorts[int(np.argmax(ages))]
+    assert result.best_cohort.start.year >= 1925
+    assert result.worst_cohort.start.year < 1910
+    assert 0 < result.success_rate <= 1
+    early, median = result.fire_age_percentiles[5], result.fire_age_percentiles[50]
+    assert early is not None and median is not None and early <= median
+
+
+def test_missing_or_short_history(input_data: InputData, tmp_path) -> None:
+    with pytest.raises(HistoryUnavailable):
+        load_history(tmp_path / "missing.npy")
+    history = _history(tmp_path / "short.npy", np.zeros(12), np.zeros(12))
+    with pytest.raises(HistoryUnavailable, match="fewer than the horizon"):
+        run_backtest(input_data, history=history)
+
+
+def test_bundled_sample_history(input_data: InputData, monkeypatch) -> None:
+    monkeypatch.delenv("WENFIRE_BACKTEST_DATA", raising=False)
+    history = load_history()
+    assert len(history) == 100 * 12
+    assert np.all(np.diff(history["month"]) == np.timedelta64(1, "M"))
+    result = run_backtest(input_data, BacktestSettings(horizon_years=40))
+    assert result.n_cohorts == 61
+    assert 0 < result.simulated_months <= 61 * 40 * 12
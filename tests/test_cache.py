@@ -0,0 +1,189 @@
+import asyncio
+import datetime
+from unittest.mock import patch
+
+import pytest
+
+import wenfire.fire
+from wenfire.cache import SimulationCache, canonical_key
+from wenfire.fire import (
+    InputData,
+    ParameterChange,
+    ResultsFrame,
+    calculate_results_frame,
+)
+
+
+def test_canonical_key_ignores_change_order_and_uuid(input_data: InputData) -> None:
+    a = ParameterChange(date=datetime.date(2030, 1, 1), field="inflation", value=3)
+    b = ParameterChange(date=datetime.date(2028, 1, 1), field="growth_rate", value=6)
+    first = input_data.model_copy(update={"parameter_changes": [a, b]})
+    second = input_data.model_copy(
+        update={"parameter_changes": [b.model_copy(update={"uuid": "x"}), a]}
+    )
+    assert canonical_key(first) == canonical_key(second)
+    assert canonical_key(first) != canonical_key(input_data)
+
+
+def test_canonical_key_depends_on_today(input_data: InputData) -> None:
+    key = canonical_key(input_data)
+    with patch.object(wenfire.fire, "_today", return_value=datetime.date(2024, 4, 2)):
+        assert canonical_key(input_data) != key
+
+
+def test_cache_hits_and_misses(input_data: InputData) -> None:
+    cache: SimulationCache[ResultsFrame] = SimulationCache(maxsize=4)
+    first = cache.get_or_compute(input_data, calculate_results_frame)
+    second = cache.get_or_compute(input_data.model_copy(), calculate_results_frame)
+    assert first is second
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "size": 1,
+        "maxsize": 4,
+        "hit_ratio": 0.5,
+        "coalesced": 0,
+        "in_flight": 0,
+    }
+
+
+def test_cache_evicts_least_recently_used(input_data: InputData) -> None:
+    cache: SimulationCache[ResultsFrame] = SimulationCache(maxsize=2)
+    inputs = [input_data.model_copy(update={"current_nw": nw}) for nw in (1, 2, 3)]
+    cache.get_or_compute(inputs[0], calculate_results_frame)
+    cache.get_or_compute(inputs[1], calculate_results_frame)
+    cache.get_or_compute(inputs[0], calculate_results_frame)  # Now most recent
+    cache.get_or_compute(inputs[2], calculate_results_frame)  # Evicts inputs[1]
+    assert len(cache) == 2
+    cache.get_or_compute(inputs[0], calculate_results_frame)
+    assert cache.hits == 2
+    cache.get_or_compute(inputs[1], calculate_results_frame)
+    assert cache.misses == 4
+
+
+def test_cache_invalidates_at_midnight(input_data: InputData) -> None:
+    cache: SimulationCache[ResultsFrame] = SimulationCache()
+    cache.get_or_compute(input_data, calculate_results_frame)
+    with patch.object(wenfire.fire, "_today", return_value=datetime.date(2024, 4, 2)):
+        cache.get_or_compute(input_data, calculate_results_frame)
+        assert len(cache) == 1
+    assert cache.misses == 2
+
+
+def test_cache_expires_after_ttl(input_data: InputData) -> None:
+    cache: SimulationCache[ResultsFrame] = SimulationCache(ttl=60)
+    with patch("wenfire.cache.time.monotonic", return_value=0):
+        cache.get_or_compute(input_data, calculate_results_frame)
+    with patch("wenfire.cache.time.monotonic", return_value=61):
+        cache.get_or_compute(input_data, calculate_results_frame)
+    assert cache.misses == 2
+
+
+def test_cache_does_not_alias_input(input_data: InputData) -> None:
+    cache: SimulationCache[ResultsFrame] = SimulationCache()
+    results = cache.get_or_compute(input_data, calculate_results_frame)
+    input_data.current_nw = 0
+    assert results.input_data is not input_data
+    assert results[0].nw == 100000.0
+
+
+def test_cache_coalesces_concurrent_computations(input_data: InputData) -> None:
+    cache: SimulationCache[ResultsFrame] = SimulationCache()
+    calls = []
+
+    async def compute(data: InputData):
+        calls.append(data)
+        await asyncio.sleep(0.01)
+        return calculate_results_frame(data)
+
+    async def burst():
+        requests = [input_data.model_copy() for _ in range(5)]
+        return await asyncio.gather(
+            *(cache.get_or_compute_async(data, compute) for data in requests)
+        )
+
+    results = asyncio.run(burst())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert cache.stats()["coalesced"] == 4
+    assert cache.stats()["in_flight"] == 0
+    assert cache.get_or_compute(input_data, calculate_results_frame) is results[0]
+
+
+def test_cache_coalesced_failure_is_not_cached(input_data: InputData) -> None:
+    cache: SimulationCache[ResultsFrame] = SimulationCache()
+
+    async def fail(data: InputData):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def burst():
+        return await asyncio.gather(
+            *(cache.get_or_compute_async(input_data, fail) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(burst())
+    assert [str(error) for error in errors] == ["boom"] * 3
+    assert len(cache) == 0
+
+
+def test_cache_keeps_computing_when_leader_is_cancelled(input_data: InputData) -> None:
+    cache: SimulationCache[ResultsFrame] = SimulationCache()
+
+    async def compute(data: InputData):
+        await asyncio.sleep(0.01)
+        return calculate_results_frame(data)
+
+    async def cancel_leader():
+        leader = asyncio.ensure_future(cache.get_or_compute_async(input_data, compute))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(
+            cache.get_or_compute_async(input_data, compute)
+        )
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    result = asyncio.run(cancel_leader())
+    assert cache.get_or_compute(input_data, calculate_results_frame) is result
+    assert cache.coalesced == 1
+
+
+def test_cache_cancels_computation_nobody_awaits(input_data: InputData) -> None:
+    cache: SimulationCache[ResultsFrame] = SimulationCache()
+    started = []
+    cancelled = []
+
+    async def compute(data: InputData):
+        started.append(data)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(data)
+            raise
+        return calculate_results_frame(data)
+
+    async def cancel_all():
+        waiters = [
+            asyncio.ensure_future(cache.get_or_compute_async(input_data, compute))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.01)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert cache.stats()["in_flight"] == 0
+        # A new request starts over instead of joining the cancelled computation
+        return await cache.get_or_compute_async(input_data, calculate_async)
+
+    async def calculate_async(data: InputData):
+        return calculate_results_frame(data)
+
+    asyncio.run(cancel_all())
+    assert len(started) == len(cancelled) == 1
+    assert cache.misses == 3
+    assert len(cache) == 1
@@ -0,0 +1,88 @@
+import csv
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from wenfire.cli import main, run
+from wenfire.fire import InputData, solve_fire_date
+
+
+def _scenarios(input_data: InputData) -> list[dict]:
+    scenarios = [
+        input_data.model_copy(update={"current_nw": nw}).model_dump(mode="json")
+        for nw in (0, 50_000, 100_000)
+    ]
+    scenarios.insert(1, {**scenarios[0], "growth_rate": "fast"})
+    return scenarios
+
+
+def test_cli_writes_summaries_and_trajectories(
+    input_data: InputData, tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    scenarios = _scenarios(input_data)
+    path = tmp_path / "scenarios.csv"
+    with path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, list(scenarios[0]))
+        writer.writeheader()
+        for scenario in scenarios:
+            changes = json.dumps(scenario["parameter_changes"])
+            writer.writerow({**scenario, "parameter_changes": changes})
+    output = tmp_path / "summaries.csv"
+    trajectories = tmp_path / "months.npz"
+    main([str(path), "-o", str(output), "--trajectories", str(trajectories)])
+    assert "4 scenarios" in capsys.readouterr().err
+
+    with output.open() as f:
+        rows = list(csv.DictReader(f))
+    assert [row["index"] for row in rows] == ["0", "1", "2", "3"]
+    assert "growth_rate" in rows[1]["error"]
+    expected = solve_fire_date(input_data.model_copy(update={"current_nw": 0}))
+    assert expected is not None
+    assert rows[0]["fire_date"] == expected.fire_date.isoformat()
+    assert float(rows[0]["fire_age"]) == pytest.approx(expected.fire_age)
+
+    months = np.load(trajectories)
+    np.testing.assert_array_equal(np.unique(months["scenario"]), [0, 2, 3])
+    first = months["scenario"] == 0
+    assert months["nw"][first][0] == 0
+    assert months["date"].dtype == np.dtype("datetime64[D]")
+
+
+def test_cli_reads_ndjson_and_runs_in_processes(
+    input_data: InputData, tmp_path: Path
+) -> None:
+    path = tmp_path / "scenarios.ndjson"
+    path.write_text("".join(json.dumps(s) + "\n" for s in _scenarios(input_data)))
+    output = tmp_path / "summaries.ndjson"
+    main([str(path), "-o", str(output), "--workers", "1", "--quiet"])
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [line["index"] for line in lines] == [0, 1, 2, 3]
+    assert lines[3]["fire_date"] < lines[2]["fire_date"] < lines[0]["fire_date"]
+
+    # Worker processes do not see the mocked date, so only check the order
+    with path.open() as f:
+        chunks = list(run(f, workers=2, chunk_size=1))
+    assert [row["index"] for chunk in chunks for row in chunk.rows] == [0, 1, 2, 3]
+
+
+def test_cli_reports_invalid_parameter_changes_per_scenario(
+    input_data: InputData, tmp_path: Path
+) -> None:
+    scenario = input_data.model_dump(mode="json")
+    bogus = [{"date": "2030-01-01", "field": "bogus", "value": 1}]
+    path = tmp_path / "scenarios.csv"
+    with path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, list(scenario))
+        writer.writeheader()
+        for changes in ("[]", "[{", json.dumps(bogus), "[]"):
+            writer.writerow({**scenario, "parameter_changes": changes})
+    output = tmp_path / "summaries.csv"
+    main([str(path), "-o", str(output), "--workers", "1", "--quiet"])
+    with output.open() as f:
+        rows = list(csv.DictReader(f))
+    assert [row["index"] for row in rows] == ["0", "1", "2", "3"]
+    assert [bool(row["error"]) for row in rows] == [False, True, True, False]
+    assert "field" in rows[2]["error"]
+    assert rows[0]["fire_date"] == rows[3]["fire_date"] != ""
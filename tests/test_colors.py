@@ -0,0 +1,44 @@
+import numpy as np
+
+from wenfire.colors import ColorScale, interpolate_color, interpolate_colors
+
+
+def _reference_rgb(x: float) -> tuple[int, ...]:
+    """The exact piecewise-linear interpolation the lookup table approximates."""
+    points = [-2000, -1000, 0, 1000, 2000]
+    colors = [(255, 0, 0), (255, 167, 0), (255, 244, 0), (163, 255, 0), (44, 186, 0)]
+    if x <= points[0]:
+        return colors[0]
+    if x >= points[-1]:
+        return colors[-1]
+    i = np.searchsorted(points, x, side="right") - 1
+    ratio = (x - points[i]) / (points[i + 1] - points[i])
+    c1, c2 = colors[i], colors[i + 1]
+    return tuple(int(c1[j] + (c2[j] - c1[j]) * ratio) for j in range(3))
+
+
+def test_interpolate_color_matches_reference() -> None:
+    rng = np.random.default_rng(0)
+    for x in [*range(-2100, 2101, 50), *rng.uniform(-3000, 3000, 500)]:
+        expected = _reference_rgb(x)
+        rgb = interpolate_color(x, return_hex=False)
+        assert max(abs(a - b) for a, b in zip(rgb, expected, strict=True)) <= 1, x
+        if float(x).is_integer():
+            assert rgb == expected
+    assert interpolate_color(-5000) == "#ff0000"
+    assert interpolate_color(0) == "#fff400"
+    assert interpolate_color(5000) == "#2cba00"
+
+
+def test_interpolate_colors_vectorized() -> None:
+    values = np.array([-2500.0, -1234.5, 0.0, 999.9, 1500.0, 9e9, np.nan])
+    colors = interpolate_colors(values)
+    assert colors == [interpolate_color(x) for x in values]
+    assert interpolate_color(float("nan")) == interpolate_color(-np.inf)
+
+
+def test_color_scale_custom_breakpoints() -> None:
+    scale = ColorScale({0: (0, 0, 0), 10: (100, 200, 250)}, resolution=0.5)
+    assert scale.rgb(5) == (50, 100, 125)
+    assert scale.hex(-1) == "#000000"
+    assert scale.hex_many([10, 20]) == ["#64c8fa", "#64c8fa"]
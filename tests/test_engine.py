@@ -0,0 +1,182 @@
+import datetime
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from wenfire.fire import (
+    DEFAULT_HORIZON_MONTHS,
+    InputData,
+    ParameterChange,
+    ParameterSchedule,
+    ResultsFrame,
+    Simulation,
+    Summary,
+    calculate_results_for_month,
+    calculate_results_frame,
+    sweep,
+)
+
+FIELDS = [
+    "months",
+    "nw",
+    "income",
+    "extra_income",
+    "spending",
+    "post_fire_spending",
+    "delta_nw",
+    "total_saved",
+]
+
+CHANGES = [
+    ParameterChange(
+        date=datetime.date(2024, 4, 1), field="income_per_month", value=6000
+    ),
+    ParameterChange(date=datetime.date(2026, 7, 15), field="extra_income", value=0),
+    ParameterChange(date=datetime.date(2030, 5, 3), field="growth_rate", value=8),
+    ParameterChange(
+        date=datetime.date(2031, 1, 1), field="spending_per_month", value=2500
+    ),
+    ParameterChange(date=datetime.date(2031, 1, 1), field="inflation", value=3),
+    ParameterChange(
+        date=datetime.date(2033, 2, 1), field="annual_salary_increase", value=1
+    ),
+]
+
+
+def _assert_same_results(loop, vectorized) -> None:
+    assert len(loop) == len(vectorized)
+    for field in FIELDS:
+        expected = [getattr(r, field) for r in loop]
+        actual = [getattr(r, field) for r in vectorized]
+        if expected[0] is None:
+            assert all(value is None for value in actual)
+        else:
+            np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-8)
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        {},
+        {"post_fire_spending_per_month": 2000.0},
+        {"parameter_changes": CHANGES},
+        {"parameter_changes": CHANGES, "post_fire_spending_per_month": 1500.0},
+        {"growth_rate": 0.0, "current_nw": 0.0},
+        {"income_per_month": 3000.0},  # Never reaches FIRE
+    ],
+)
+@pytest.mark.parametrize("target", [None, 24, datetime.date(2040, 1, 1)])
+def test_numpy_engine_matches_loop(
+    input_data: InputData, update: dict, target: int | datetime.date | None
+) -> None:
+    data = input_data.model_copy(update=update)
+    loop = calculate_results_for_month(data.model_copy(deep=True), target)
+    vectorized = calculate_results_for_month(
+        data.model_copy(deep=True), target, engine="numpy"
+    )
+    _assert_same_results(loop, vectorized)
+
+
+def test_numpy_engine_matches_loop_for_past_target(input_data: InputData) -> None:
+    target = datetime.date(2020, 1, 1)  # Before today
+    loop = calculate_results_for_month(input_data, target)
+    vectorized = calculate_results_for_month(input_data, target, engine="numpy")
+    _assert_same_results(loop, vectorized)
+    assert len(loop) == len(calculate_results_frame(input_data, target)) == 1
+
+
+@pytest.mark.parametrize("engine", ["loop", "numpy"])
+def test_engine_does_not_mutate_input(input_data: InputData, engine: str) -> None:
+    data = input_data.model_copy(update={"parameter_changes": CHANGES})
+    before = data.model_dump()
+    first = calculate_results_for_month(data, engine=engine)
+    assert data.model_dump() == before
+    # So running it again gives the same results
+    _assert_same_results(first, calculate_results_for_month(data, engine=engine))
+
+
+def test_parameter_schedule(input_data: InputData) -> None:
+    data = input_data.model_copy(update={"parameter_changes": CHANGES})
+    schedule = ParameterSchedule(data, DEFAULT_HORIZON_MONTHS)
+    assert schedule.events == {
+        0: {"income_per_month": 6000},
+        28: {"extra_income": 0},
+        74: {"growth_rate": 8},
+        82: {"spending_per_month": 2500, "inflation": 3},
+        107: {"annual_salary_increase": 1},
+    }
+    assert schedule.get(1) == {}
+    # Changes beyond the horizon are dropped
+    assert ParameterSchedule(data, 74).months == [0, 28]
+
+
+def test_loop_engine_keeps_rates_per_month(input_data: InputData) -> None:
+    data = input_data.model_copy(update={"parameter_changes": CHANGES})
+    results = calculate_results_for_month(data)
+    np.testing.assert_allclose(
+        ResultsFrame.from_results(results).column("investment_profits"),
+        calculate_results_frame(data).column("investment_profits"),
+    )
+    # Months before the growth rate change (in month 74) keep the old rate
+    assert results[73].input_data.growth_rate == input_data.growth_rate
+    assert results[74].input_data.growth_rate == 8
+
+
+def test_parameter_change_unknown_field() -> None:
+    with pytest.raises(ValidationError, match="field"):
+        ParameterChange(date=datetime.date(2025, 1, 1), field="age", value=1)  # type: ignore[arg-type]
+
+
+def test_calculate_results_for_month_unknown_engine(input_data: InputData) -> None:
+    with pytest.raises(ValueError, match="Unknown engine"):
+        calculate_results_for_month(input_data, engine="fortran")
+
+
+@pytest.mark.parametrize("extra_spending", [0.0, 20_000.0, 95_000.0, -50_000.0])
+@pytest.mark.parametrize(
+    "update",
+    [{}, {"parameter_changes": CHANGES, "post_fire_spending_per_month": 2500.0}],
+)
+def test_rebased_simulation_matches_second_run(
+    input_data: InputData, update: dict, extra_spending: float
+) -> None:
+    data = input_data.model_copy(update=update)
+    current_nw = data.current_nw - extra_spending
+    rebased = Simulation(data, DEFAULT_HORIZON_MONTHS).frame(current_nw)
+    second_run = calculate_results_for_month(
+        data.model_copy(update={"current_nw": current_nw}, deep=True)
+    )
+    _assert_same_results(second_run, rebased)
+    assert rebased.input_data.current_nw == current_nw
+    expected = Summary.from_results(second_run)
+    actual = Summary.from_results(rebased)
+    assert expected is not None and actual is not None
+    assert actual.fire_date == expected.fire_date
+    assert actual.nw_at_fi == pytest.approx(expected.nw_at_fi, rel=1e-9)
+    assert actual.safe_withdraw_at_age == pytest.approx(expected.safe_withdraw_at_age)
+
+
+def test_sweep_matches_summaries(input_data: InputData) -> None:
+    growth_rates = [4.0, 7.0]
+    spendings = [2500.0, 3000.0, 1e9]
+    ages, simulated_months = sweep(
+        input_data, "growth_rate", growth_rates, "spending_per_month", spendings
+    )
+    assert ages.shape == (3, 2)
+    assert simulated_months == 6 * DEFAULT_HORIZON_MONTHS  # Some never reach FIRE
+    for i, spending in enumerate(spendings[:2]):
+        for j, growth_rate in enumerate(growth_rates):
+            data = input_data.model_copy(
+                update={"growth_rate": growth_rate, "spending_per_month": spending}
+            )
+            expected = Summary.from_results(calculate_results_frame(data))
+            assert expected is not None
+            assert ages[i, j] == pytest.approx(expected.fire_age, abs=1e-9)
+    assert np.isnan(ages[2]).all()
+    reached = sweep(input_data, "current_nw", [0, 1e5, 1e6])
+    assert reached.ages.shape == (3,)
+    # Stops a block of months after every cell reached FIRE
+    assert 0 < reached.simulated_months < 3 * DEFAULT_HORIZON_MONTHS
+    with pytest.raises(ValueError, match="different fields"):
+        sweep(input_data, "inflation", [1], "inflation", [2])
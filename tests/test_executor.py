@@ -0,0 +1,77 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from wenfire import executor
+from wenfire.executor import (
+    SimulationExecutor,
+    executor_for,
+    projection_task,
+    shutdown_executors,
+    start_executors,
+)
+from wenfire.fire import DEFAULT_HORIZON_MONTHS, InputData, Simulation
+
+
+def test_simulation_round_trips_through_arrays(input_data: InputData) -> None:
+    for data in [
+        input_data,
+        input_data.model_copy(update={"post_fire_spending_per_month": 2000.0}),
+    ]:
+        simulation = Simulation(data, DEFAULT_HORIZON_MONTHS)
+        rebuilt = Simulation.from_arrays(data, simulation.to_arrays())
+        for current_nw in [None, 0.0]:
+            expected = simulation.columns(current_nw)
+            actual = rebuilt.columns(current_nw)
+            assert expected.keys() == actual.keys()
+            for name, column in expected.items():
+                np.testing.assert_array_equal(actual[name], column)
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+def test_executor_runs_projection_task(input_data: InputData, mode: str) -> None:
+    pool = SimulationExecutor(mode, max_workers=1)
+    try:
+        arrays = asyncio.run(pool.run(projection_task, input_data.model_dump_json()))
+    finally:
+        pool.shutdown()
+    # Worker processes do not see the mocked date, so only check the shape
+    assert arrays["nw"].shape == (DEFAULT_HORIZON_MONTHS + 1,)
+    assert arrays["nw"][0] == input_data.current_nw
+
+
+def test_executor_for_reads_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(executor, "_executors", {})
+    monkeypatch.setenv("WENFIRE_EXECUTOR", "inline")
+    monkeypatch.setenv("WENFIRE_EXECUTOR_MONTE_CARLO", "process")
+    assert executor_for("calculate").mode == "inline"
+    assert executor_for("monte_carlo").mode == "process"
+    assert executor_for("charts", picklable=False).mode == "inline"
+    monkeypatch.setenv("WENFIRE_EXECUTOR_CHARTS", "process")
+    assert executor_for("charts", picklable=False).mode == "thread"
+    assert executor_for("calculate") is executor_for("other")
+    with pytest.raises(ValueError, match="Unknown executor"):
+        SimulationExecutor("cluster")
+
+
+def test_start_warms_up_every_worker() -> None:
+    pool = SimulationExecutor("process", max_workers=2)
+    try:
+        asyncio.run(pool.start())
+        assert isinstance(pool._pool, ProcessPoolExecutor)
+        assert len(pool._pool._processes) == 2
+    finally:
+        pool.shutdown()
+
+
+def test_start_executors_reads_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(executor, "_executors", {})
+    monkeypatch.setenv("WENFIRE_EXECUTOR", "inline")
+    monkeypatch.setenv("WENFIRE_EXECUTOR_MONTE_CARLO", "thread")
+    asyncio.run(start_executors())
+    assert executor_for("monte_carlo")._pool is not None
+    assert executor_for("calculate")._pool is None  # Inline has no pool
+    shutdown_executors()
+    assert executor._executors == {}
@@ -0,0 +1,32 @@
+import csv
+import io
+
+import numpy as np
+
+from wenfire.export import csv_chunks, npz_bytes, result_columns
+from wenfire.fire import RESULT_COLUMNS, InputData, calculate_results_frame
+
+
+def test_csv_chunks_match_the_columns(input_data: InputData) -> None:
+    columns = result_columns(calculate_results_frame(input_data))
+    assert columns.keys() == set(RESULT_COLUMNS)
+    chunks = list(csv_chunks(columns, chunk_rows=100))
+    n_rows = len(columns["nw"])
+    assert len(chunks) == -(-n_rows // 100)
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert len(rows) == n_rows
+    assert rows[0]["date"] == "2024-04-01"
+    assert rows[0]["post_fire_spending"] == ""  # NaN
+    assert float(rows[-1]["nw"]) == columns["nw"][-1]
+    assert rows[-1]["is_fire_reached"] == "True"
+    assert list(csv_chunks(columns, [])) == ["\r\n"]
+    nw = next(csv_chunks(columns, ["nw"], header=False))
+    assert nw.startswith(f"{input_data.current_nw}\r\n")
+
+
+def test_npz_bytes_round_trip(input_data: InputData) -> None:
+    columns = result_columns(calculate_results_frame(input_data))
+    loaded = np.load(io.BytesIO(npz_bytes(columns)))
+    assert loaded.files == list(RESULT_COLUMNS)
+    for name, column in columns.items():
+        np.testing.assert_array_equal(loaded[name], column)
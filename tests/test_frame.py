@@ -0,0 +1,222 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from wenfire.fire import (
+    InputData,
+    MonthCalendar,
+    ParameterChange,
+    ResultsFrame,
+    Summary,
+    calculate_results_for_month,
+    calculate_results_frame,
+    month_calendar,
+    retirement_index,
+)
+from wenfire.plots import (
+    _lttb,
+    plot_age_vs_net_worth,
+    plot_monthly_financial_flows,
+)
+
+PROPERTIES = [
+    "months",
+    "nw",
+    "income",
+    "spending",
+    "post_fire_spending",
+    "delta_nw",
+    "total_saved",
+    "date",
+    "age",
+    "years",
+    "saving",
+    "safe_withdraw_rule_monthly",
+    "safe_withdraw_minus_spending",
+    "is_fire_reached",
+    "actual_spending",
+    "investment_profits",
+    "total_investment_profits",
+]
+
+
+def assert_summaries_close(a: Summary | None, b: Summary | None) -> None:
+    assert a is not None and b is not None
+    assert a.fire_date == b.fire_date
+    assert a.safe_withdraw_at_age.keys() == b.safe_withdraw_at_age.keys()
+    for field, value in a.model_dump().items():
+        other = getattr(b, field)
+        if isinstance(value, (float, dict)):
+            assert other == pytest.approx(value, rel=1e-9)
+
+
+@pytest.fixture(params=[None, 2000.0])
+def data(request, input_data: InputData) -> InputData:
+    return input_data.model_copy(update={"post_fire_spending_per_month": request.param})
+
+
+def test_frame_rows_match_results(data: InputData) -> None:
+    results = calculate_results_for_month(data.model_copy(deep=True))
+    frame = calculate_results_frame(data)
+    assert len(frame) == len(results)
+    for i in [0, 1, len(results) // 2, -1]:
+        for name in PROPERTIES:
+            expected = getattr(results[i], name)
+            assert getattr(frame[i], name) == pytest.approx(expected, rel=1e-9)
+
+
+def test_summary_from_frame_matches_list(data: InputData) -> None:
+    results = calculate_results_for_month(data.model_copy(deep=True))
+    frame = calculate_results_frame(data)
+    assert retirement_index(frame) == retirement_index(results)
+    assert_summaries_close(Summary.from_results(results), Summary.from_results(frame))
+
+
+def test_summary_from_frame_no_retirement(input_data: InputData) -> None:
+    frame = calculate_results_frame(input_data, target=100)
+    assert retirement_index(frame) is None
+    assert Summary.from_results(frame) is None
+
+
+def test_frame_with_parameter_changes(input_data: InputData) -> None:
+    change = ParameterChange(
+        date=datetime.date(2030, 1, 1), field="growth_rate", value=10
+    )
+    data = input_data.model_copy(update={"parameter_changes": [change]})
+    frame = calculate_results_frame(data)
+    row = frame[100]  # Month 100 is after the change
+    assert row.investment_profits == pytest.approx(row.nw * (1.1 ** (1 / 12)) - row.nw)
+
+
+def test_frame_is_read_only_and_sliceable(input_data: InputData) -> None:
+    frame = calculate_results_frame(input_data)
+    with pytest.raises(ValueError):
+        frame.column("nw")[0] = 0
+    head = frame[:12]
+    assert isinstance(head, ResultsFrame)
+    assert len(head) == 12
+    np.testing.assert_array_equal(head.column("nw"), frame.column("nw")[:12])
+    assert [row.months for row in head] == list(range(12))
+    with pytest.raises(IndexError):
+        frame[len(frame)]
+
+
+def test_month_calendar(input_data: InputData) -> None:
+    calendar = month_calendar(input_data, 1000)
+    month = datetime.timedelta(days=365.25 / 12)
+    for m in [0, 1, 11, 12, 500, 999, 1000]:
+        assert calendar.dates[m] == input_data.now + month * m
+        assert calendar.ages[m] == input_data.age_at(calendar.dates[m])
+    # Shared by every frame of the same person, whatever its length
+    short = calculate_results_frame(input_data, target=24)
+    long = calculate_results_frame(input_data)
+    assert short.calendar_rows[0] is long.calendar_rows[0] is calendar
+    np.testing.assert_array_equal(long[12:24].ages, long.ages[12:24])
+    assert long[12:24].dates == long.dates[12:24]
+    assert len(month_calendar(input_data, 1500)) == 2401
+
+
+@pytest.mark.parametrize(
+    "date_of_birth",
+    [
+        datetime.date(1990, 1, 31),  # Anniversaries on shorter month ends
+        datetime.date(2000, 2, 29),
+        datetime.date(2024, 4, 1),  # Born today
+        datetime.date(2030, 7, 15),  # Not born yet, negative ages
+    ],
+)
+def test_month_calendar_ages_match_age_at(date_of_birth: datetime.date) -> None:
+    person = InputData.model_construct(date_of_birth=date_of_birth)
+    calendar = MonthCalendar(datetime.date(2024, 4, 1), date_of_birth, 1200)
+    expected = [person.age_at(date) for date in calendar.dates]
+    assert calendar.ages.tolist() == expected
+
+
+def test_frame_round_trips_results(input_data: InputData) -> None:
+    results = calculate_results_for_month(input_data)
+    frame = ResultsFrame.from_results(results)
+    for a, b in zip(results, frame.to_results(), strict=True):
+        assert a.nw == b.nw
+        assert a.total_saved == b.total_saved
+
+
+@pytest.mark.parametrize("plot", [plot_age_vs_net_worth, plot_monthly_financial_flows])
+def test_plots_accept_frame(input_data: InputData, plot) -> None:
+    results = calculate_results_for_month(input_data.model_copy(deep=True))
+    frame = calculate_results_frame(input_data)
+    summary = Summary.from_results(frame)
+    from_list = plot(results, summary)
+    from_frame = plot(frame, summary)
+    assert from_list["x"] == from_frame["x"]
+    for a, b in zip(from_list["series"], from_frame["series"], strict=True):
+        assert a["name"] == b["name"]
+        np.testing.assert_allclose(a["data"], b["data"], atol=0.01)
+
+
+@pytest.mark.parametrize("plot", [plot_age_vs_net_worth, plot_monthly_financial_flows])
+def test_plot_columns(input_data: InputData, plot) -> None:
+    frame = calculate_results_frame(input_data)
+    chart = plot(frame, Summary.from_results(frame))
+    assert len(chart["x"]) == len(chart["age"]) == len(chart["time_from_now"])
+    assert all(len(s["data"]) == len(frame) for s in chart["series"])
+    assert chart["x"][0] == 1711929600000  # 2024-04-01 in milliseconds
+    assert chart["age"][0] == pytest.approx(frame[0].age, abs=1e-3)
+    assert chart["time_from_now"][0] == 0
+    assert chart["time_from_now"][12] == pytest.approx(1, abs=0.01)
+    assert "series" not in chart["config"]
+    assert set(chart["theme_colors"]) == {"light", "dark"}
+
+
+def test_plots_downsample_keeping_fire_and_changes(input_data: InputData) -> None:
+    changes = [
+        ParameterChange(
+            date=datetime.date(2030, 5, 3), field="spending_per_month", value=2500
+        ),
+        ParameterChange(date=datetime.date(2031, 1, 1), field="growth_rate", value=8),
+    ]
+    data = input_data.model_copy(update={"parameter_changes": changes})
+    frame = calculate_results_frame(data)
+    summary = Summary.from_results(frame)
+    assert summary is not None
+    full = plot_monthly_financial_flows(frame, summary)
+    chart = plot_monthly_financial_flows(frame, summary, max_points=50)
+    assert len(chart["x"]) < len(frame) / 2
+    assert len(chart["x"]) == len(chart["age"]) == len(chart["series"][0]["data"])
+    assert chart["x"] == sorted(chart["x"])
+    assert frame.change_months == [74, 82]
+    index = retirement_index(frame)
+    assert index is not None
+    for row in [0, 73, 74, 81, 82, index - 1, index, len(frame) - 1]:
+        assert full["x"][row] in chart["x"]
+        position = chart["x"].index(full["x"][row])
+        for a, b in zip(full["series"], chart["series"], strict=True):
+            assert b["data"][position] == a["data"][row]
+    assert plot_age_vs_net_worth(frame, summary, max_points=10_000) == (
+        plot_age_vs_net_worth(frame, summary)
+    )
+
+
+def test_lttb() -> None:
+    y = np.sin(np.linspace(0, 20, 1000))
+    kept = _lttb(y, 100)
+    assert len(kept) == 100
+    assert kept[0] == 0 and kept[-1] == 999
+    assert (np.diff(kept) > 0).all()
+    # Keeps the peaks of the waves
+    assert np.abs(y[kept]).max() == pytest.approx(1, abs=1e-3)
+    np.testing.assert_array_equal(_lttb(y[:10], 20), np.arange(10))
+
+
+def test_yearly(input_data: InputData) -> None:
+    frame = calculate_results_frame(input_data)
+    years = frame.yearly()
+    assert len(years) == -(-len(frame) // 12)
+    assert sum(year.months for year in years) == len(frame)
+    second = years[1]
+    assert second.year == 1
+    assert second.age == pytest.approx(frame[12].age)
+    assert second.nw == frame[23].nw
+    assert second.saving == pytest.approx(sum(frame[m].saving for m in range(12, 24)))
+    assert second.delta_nw == pytest.approx(frame[23].nw - frame[11].nw)
+    assert years[-1].nw == frame[len(frame) - 1].nw
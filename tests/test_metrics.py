@@ -0,0 +1,29 @@
+from wenfire.metrics import REGISTRY, Counter, Histogram
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    histogram = Histogram("test_seconds", "Test.", ("route",), buckets=(0.1, 1))
+    REGISTRY.remove(histogram)
+    for value in (0.05, 0.5, 0.5, 5):
+        histogram.observe(value, route="/a")
+    assert histogram.render().splitlines() == [
+        "# HELP test_seconds Test.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{route="/a",le="0.1"} 1',
+        'test_seconds_bucket{route="/a",le="1"} 3',
+        'test_seconds_bucket{route="/a",le="+Inf"} 4',
+        'test_seconds_sum{route="/a"} 6.05',
+        'test_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_counter_per_label() -> None:
+    counter = Counter("test_total", "Test.", ("kind",))
+    REGISTRY.remove(counter)
+    counter.inc(kind="a")
+    counter.inc(2.5, kind="b")
+    counter.inc(kind="a")
+    assert counter.render().splitlines()[2:] == [
+        'test_total{kind="a"} 2',
+        'test_total{kind="b"} 2.5',
+    ]
@@ -0,0 +1,147 @@
+import datetime
+from typing import Literal
+
+import numpy as np
+import pytest
+
+from wenfire.fire import (
+    DEFAULT_HORIZON_MONTHS,
+    InputData,
+    ParameterChange,
+    SimulationCancelled,
+    Summary,
+    calculate_results_frame,
+    simulate_paths,
+)
+from wenfire.montecarlo import MonteCarloSettings, _shock_source, run_monte_carlo
+
+CHANGES = [
+    ParameterChange(
+        date=datetime.date(2024, 4, 1), field="income_per_month", value=6000
+    ),
+    ParameterChange(date=datetime.date(2030, 5, 3), field="growth_rate", value=8),
+    ParameterChange(
+        date=datetime.date(2031, 1, 1), field="spending_per_month", value=2500
+    ),
+    ParameterChange(date=datetime.date(2031, 1, 1), field="inflation", value=3),
+]
+# Reaches FIRE at the change itself, between two months
+SPENDING_DROP = ParameterChange(
+    date=datetime.date(2030, 1, 1), field="spending_per_month", value=100
+)
+TODAY = datetime.date(2024, 4, 1)
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        {},
+        {"post_fire_spending_per_month": 2000.0},
+        {"parameter_changes": CHANGES},
+        {"current_nw": 2_000_000.0},  # Already FIRE
+        {"parameter_changes": [SPENDING_DROP]},
+        {"parameter_changes": [SPENDING_DROP.model_copy(update={"date": TODAY})]},
+    ],
+)
+def test_simulate_paths_without_shocks_matches_summary(
+    input_data: InputData, update: dict
+) -> None:
+    data = input_data.model_copy(update=update)
+    summary = Summary.from_results(calculate_results_frame(data))
+    assert summary is not None
+    paths = simulate_paths(data, n_paths=3)
+    np.testing.assert_allclose(paths.fire_months, summary.years_till_fi * 12)
+
+
+def test_simulate_paths_overrides(input_data: InputData) -> None:
+    spending = np.array([2000.0, 3000.0, 1e9])
+    paths = simulate_paths(
+        input_data, 3, overrides={"spending_per_month": spending}, chunk_size=2
+    )
+    expected = Summary.from_results(calculate_results_frame(input_data))
+    assert expected is not None
+    assert paths.fire_months[0] < paths.fire_months[1]
+    assert paths.fire_months[1] == pytest.approx(expected.years_till_fi * 12)
+    assert np.isnan(paths.fire_months[2])
+    with pytest.raises(ValueError, match="Cannot vary"):
+        simulate_paths(input_data, 1, overrides={"date_of_birth": spending})
+
+
+def test_simulate_paths_stops_when_cancelled(input_data: InputData) -> None:
+    checks = []
+
+    def cancelled() -> bool:
+        checks.append(True)
+        return len(checks) > 2
+
+    with pytest.raises(SimulationCancelled):
+        simulate_paths(input_data, 10, sample_every=12, cancelled=cancelled)
+    assert len(checks) == 3
+
+
+def test_monte_carlo_is_reproducible(input_data: InputData) -> None:
+    settings = MonteCarloSettings(n_paths=500, seed=42)
+    result = run_monte_carlo(input_data, settings)
+    assert result == run_monte_carlo(input_data, settings)
+    assert 0 < result.success_probability <= 1
+    ages = np.array(list(result.fire_age_percentiles.values()), dtype=float)
+    assert (np.diff(ages) >= 0).all()
+    assert sum(result.fire_age_histogram["counts"]) == round(
+        result.success_probability * 500
+    )
+    assert len(result.band_ages) == len(result.net_worth_bands[50]) == 101
+    # Every path runs the whole horizon to sample the net worth bands
+    assert result.simulated_months == 500 * DEFAULT_HORIZON_MONTHS
+
+
+@pytest.mark.parametrize("distribution", ["lognormal", "student_t"])
+def test_monte_carlo_median_near_deterministic(
+    input_data: InputData, distribution: Literal["lognormal", "student_t"]
+) -> None:
+    settings = MonteCarloSettings(
+        n_paths=2000, seed=0, return_volatility=5, distribution=distribution
+    )
+    result = run_monte_carlo(input_data, settings)
+    expected = Summary.from_results(calculate_results_frame(input_data))
+    assert expected is not None
+    assert result.fire_age_percentiles[50] == pytest.approx(expected.fire_age, abs=1)
+
+
+def test_lognormal_shocks_have_mean_one() -> None:
+    settings = MonteCarloSettings(seed=0, return_volatility=20, inflation_volatility=10)
+    growth, inflation = _shock_source(settings)(0, 120, slice(0, 10_001))
+    assert growth.shape == inflation.shape == (120, 10_001)
+    assert growth.mean() == pytest.approx(1, abs=1e-4)
+    assert inflation.mean() == pytest.approx(1, abs=1e-4)
+    # Held for a year, and antithetic: the second half of the paths mirrors the first
+    np.testing.assert_array_equal(inflation[0], inflation[11])
+    np.testing.assert_allclose(
+        np.log(growth[:, :5000]) + np.log(growth[:, 5001:]), -(0.2**2) / 12, atol=1e-6
+    )
+
+
+def test_monte_carlo_without_volatility_is_deterministic(
+    input_data: InputData,
+) -> None:
+    settings = MonteCarloSettings(
+        n_paths=10, return_volatility=0, inflation_volatility=0
+    )
+    result = run_monte_carlo(input_data, settings)
+    expected = Summary.from_results(calculate_results_frame(input_data))
+    assert expected is not None
+    assert result.success_probability == 1
+    assert result.fire_date_percentiles[5] == result.fire_date_percentiles[95]
+    assert result.fire_age_percentiles[50] == pytest.approx(expected.fire_age, abs=0.1)
+
+
+def test_monte_carlo_never_fire(input_data: InputData) -> None:
+    data = input_data.model_copy(
+        update={"income_per_month": 2500.0, "annual_salary_increase": 0.0}
+    )
+    settings = MonteCarloSettings(
+        n_paths=10, return_volatility=0, inflation_volatility=0
+    )
+    result = run_monte_carlo(data, settings)
+    assert result.success_probability == 0
+    assert set(result.fire_age_percentiles.values()) == {None}
+    assert result.fire_age_histogram == {"edges": [], "counts": []}
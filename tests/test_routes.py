@@ -0,0 +1,472 @@
+import asyncio
+import html
+import io
+import json
+import re
+import threading
+from typing import Any
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from wenfire import fire
+from wenfire.app import app, projection_cache
+from wenfire.backtest import save_history
+from wenfire.fire import RESULT_COLUMNS
+from wenfire.timing import _parse_sample_rate
+
+# fastapi-htmx still calls ``TemplateResponse(name, context)``
+pytestmark = pytest.mark.filterwarnings(
+    "ignore:The `name` is not the first parameter:DeprecationWarning"
+)
+
+client = TestClient(app)
+
+HX = {"HX-Request": "true"}
+
+# ``InputData`` of the default query parameters
+BODY = {
+    "growth_rate": 7,
+    "current_nw": 50_000,
+    "spending_per_month": 4_000,
+    "inflation": 2,
+    "annual_salary_increase": 5,
+    "income_per_month": 8_000,
+    "extra_income": 0,
+    "date_of_birth": "1990-01-01",
+}
+
+
+def test_calculate_renders_results() -> None:
+    response = client.get("/calculate", headers=HX)
+    assert response.status_code == 200
+    assert "FIRE Age" in response.text
+    assert "Detailed Yearly Projections" in response.text
+    # Months are not rendered until a year is expanded
+    assert response.text.count('class="year-row') > 10
+    assert 'class="month-row"' not in response.text
+
+
+def test_calculate_reports_server_timing(monkeypatch, caplog) -> None:
+    monkeypatch.setattr("wenfire.timing.SAMPLE_RATE", 1.0)
+    with caplog.at_level("INFO", logger="wenfire.timing"):
+        response = client.get("/calculate", headers=HX)
+    stages = [
+        part.split(";")[0] for part in response.headers["server-timing"].split(", ")
+    ]
+    assert stages == [
+        "parse",
+        "simulate",
+        "summary",
+        "plots",
+        "context",
+        "render",
+        "total",
+    ]
+    assert "/calculate parse;dur=" in caplog.text
+    # Other routes only report their total
+    response = client.get("/goal-seek", params={"field": "growth_rate"})
+    assert response.headers["server-timing"].startswith("total;dur=")
+
+
+@pytest.mark.parametrize("value", ["", "1%", "-0.1", "2", "nan"])
+def test_timing_sample_rate_must_be_a_fraction(value: str) -> None:
+    with pytest.raises(ValueError, match="WENFIRE_TIMING_SAMPLE_RATE"):
+        _parse_sample_rate(value)
+
+
+def test_profile_requires_debug(monkeypatch) -> None:
+    response = client.get("/calculate", params={"profile": 1}, headers=HX)
+    assert "FIRE Age" in response.text
+    monkeypatch.setenv("WENFIRE_DEBUG", "1")
+    response = client.get("/calculate", params={"profile": 1}, headers=HX)
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "function calls" in response.text
+
+
+def _metric(text: str, line_prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_metrics_endpoint() -> None:
+    before = client.get("/metrics").text
+    params: dict[str, Any] = {
+        "current_nw": 54321,
+        "change_dates": ["2030-01-01"],
+        "change_fields": ["inflation"],
+        "change_values": ["3"],
+        "extra_spending": 1234,
+    }
+    client.get("/calculate", params=params, headers=HX)
+    sweep: dict[str, Any] = {
+        "x_field": "growth_rate",
+        "x_start": 5,
+        "x_stop": 9,
+        "x_steps": 3,
+    }
+    client.get("/sweep", params=sweep)
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = response.text
+    for prefix, increase in [
+        ('wenfire_request_duration_seconds_count{route="/calculate",status="200"}', 1),
+        ('wenfire_response_size_bytes_count{route="/calculate"}', 1),
+        ("wenfire_projection_months_count", 1),
+        ("wenfire_parameter_changes_sum", 1),
+        ('wenfire_cache_misses_total{cache="projection"}', 2),
+    ]:
+        assert _metric(after, prefix) - _metric(before, prefix) == increase, prefix
+    # The sweep stops once all its cells reached FIRE
+    swept = 'wenfire_simulated_months_total{kind="sweep"}'
+    assert 0 < _metric(after, swept) - _metric(before, swept) < 3 * 1200
+    rebased = 'wenfire_simulated_months_total{kind="rebased_projection"}'
+    assert _metric(after, rebased) > _metric(before, rebased)
+    assert "# TYPE wenfire_event_loop_lag_seconds histogram" in after
+
+
+def test_projection_api() -> None:
+    response = client.get("/api/v1/projection", params={"current_nw": 60000})
+    assert response.status_code == 200
+    result = response.json()
+    assert 40 < result["summary"]["fire_age"] < 60
+    columns = result["columns"]
+    assert set(columns) >= {"months", "date", "age", "nw", "is_fire_reached"}
+    assert len(columns["nw"]) == len(columns["date"]) > 12
+    assert columns["nw"][0] == 60000
+    assert columns["post_fire_spending"][0] is None
+
+
+def test_projection_api_selects_fields_and_accepts_json() -> None:
+    params = {"fields": ["age", "nw"]}
+    result = client.get("/api/v1/projection", params=params).json()
+    assert result.keys() == {"columns"}
+    assert result["columns"].keys() == {"age", "nw"}
+    posted = client.post("/api/v1/projection?fields=summary", json=BODY).json()
+    expected = client.get("/api/v1/projection", params={"fields": "summary"}).json()
+    assert posted == expected
+    assert posted["columns"] == {}
+    assert client.get("/api/v1/projection?fields=bogus").status_code == 422
+
+
+def test_projection_api_rejects_unknown_parameter_changes() -> None:
+    change = {"date": "2030-01-01", "field": "bogus", "value": 1}
+    body = BODY | {"parameter_changes": [change]}
+    assert client.post("/api/v1/projection", json=body).status_code == 422
+    params = {
+        "change_dates": ["2030-01-01"],
+        "change_fields": ["bogus"],
+        "change_values": ["1"],
+    }
+    assert client.get("/api/v1/projection", params=params).status_code == 422
+
+
+def test_export_streams_every_month() -> None:
+    params = {"current_nw": 60000}
+    response = client.get("/api/v1/export", params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert "wenfire.csv" in response.headers["content-disposition"]
+    header, *rows = response.text.splitlines()
+    assert header.split(",") == list(RESULT_COLUMNS)
+    columns = client.get("/api/v1/projection", params=params).json()["columns"]
+    assert len(rows) == len(columns["nw"])
+    first = dict(zip(header.split(","), rows[0].split(","), strict=True))
+    assert float(first["nw"]) == 60000
+    assert float(first["safe_withdraw_minus_spending"]) == pytest.approx(
+        columns["safe_withdraw_minus_spending"][0]
+    )
+    npz = client.get("/api/v1/export", params={**params, "format": "npz"})
+    months = np.load(io.BytesIO(npz.content))
+    np.testing.assert_allclose(
+        months["total_investment_profits"], columns["total_investment_profits"]
+    )
+    assert client.get("/api/v1/export?format=xlsx").status_code == 422
+
+
+def test_calculate_links_to_the_export() -> None:
+    params: dict[str, Any] = {
+        "current_nw": 60000,
+        "change_dates": ["2030-01-01"],
+        "change_fields": ["income_per_month"],
+        "change_values": ["9000"],
+    }
+    response = client.get("/calculate", params=params, headers=HX)
+    link = re.search(r'href="(/api/v1/export\?[^"]*)" download', response.text)
+    assert link is not None
+    export = client.get(html.unescape(link.group(1)))
+    assert export.status_code == 200
+    assert export.text == client.get("/api/v1/export", params=params).text
+    assert export.text != client.get("/api/v1/export").text
+
+
+def test_batch_streams_summaries_in_order() -> None:
+    households = [
+        {**BODY, "current_nw": current_nw} for current_nw in range(0, 200_000, 5_000)
+    ]
+    households[3] = {**BODY, "growth_rate": "fast"}
+    ndjson = "\n".join(json.dumps(household) for household in households) + "\n"
+    response = client.post(
+        "/api/v1/batch",
+        content=ndjson,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["index"] for line in lines] == list(range(len(households)))
+    assert lines[3]["error"][0]["loc"] == ["growth_rate"]
+    expected = client.post("/api/v1/projection?fields=summary", json=BODY).json()
+    summary = lines[10]["summary"]
+    assert summary["fire_date"] == expected["summary"]["fire_date"]
+    assert summary["nw_at_fi"] == pytest.approx(expected["summary"]["nw_at_fi"])
+    ages = [line["summary"]["fire_age"] for line in lines if "summary" in line]
+    assert ages == sorted(ages, reverse=True)
+    # The same households as a JSON array
+    as_array = client.post("/api/v1/batch", json=households)
+    assert as_array.text == response.text
+    assert client.post("/api/v1/batch", content=b"").text == ""
+    assert client.post("/api/v1/batch", content=b"[{").status_code == 422
+
+
+def test_batch_reports_unknown_parameter_changes_per_household() -> None:
+    change = {"date": "2030-01-01", "field": "bogus", "value": 1}
+    households = [BODY, BODY | {"parameter_changes": [change]}, BODY]
+    response = client.post("/api/v1/batch", json=households)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["index"] for line in lines] == [0, 1, 2]
+    assert lines[0]["summary"] == lines[2]["summary"] is not None
+    assert lines[1]["error"][0]["loc"] == ["parameter_changes", 0, "field"]
+
+
+def test_batch_streams_results_before_the_body_ends() -> None:
+    first = json.dumps(BODY).encode() + b"\n" + json.dumps(BODY).encode()[:20]
+    last = json.dumps(BODY).encode()[20:] + b"\n"
+    messages: list[dict] = []
+
+    async def stream() -> None:
+        responded = asyncio.Event()
+        chunks = [first, last]
+
+        async def receive():
+            if len(chunks) == 1:
+                # The second chunk is only sent once the first line's result is
+                await responded.wait()
+            if chunks:
+                body = chunks.pop(0)
+                return {"type": "http.request", "body": body, "more_body": bool(chunks)}
+            await asyncio.Event().wait()  # The client never disconnects
+
+        async def send(message):
+            messages.append(message)
+            if message["type"] == "http.response.body" and message.get("body"):
+                responded.set()
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/api/v1/batch",
+            "raw_path": b"/api/v1/batch",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [
+                (b"host", b"testserver"),
+                (b"content-type", b"application/x-ndjson"),
+            ],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+        await asyncio.wait_for(app(scope, receive, send), timeout=10)
+
+    asyncio.run(stream())
+    assert messages[0]["status"] == 200
+    lines = [
+        json.loads(line)
+        for message in messages[1:]
+        for line in message.get("body", b"").splitlines()
+    ]
+    assert [line["index"] for line in lines] == [0, 1]
+    assert lines[0]["summary"] == lines[1]["summary"] is not None
+
+
+def test_results_year_renders_months() -> None:
+    response = client.get("/results/year/2", params={"extra_spending": 100})
+    assert response.status_code == 200
+    assert response.text.count('class="month-row"') == 12
+    assert "<td>24.0</td>" in response.text
+    assert client.get("/results/year/-1").status_code == 422
+    # Past the end of the projection there are no months
+    assert "month-row" not in client.get("/results/year/999").text
+
+
+def test_calculate_with_parameter_changes_and_extra_spending() -> None:
+    params: dict[str, Any] = {
+        "extra_spending": 20000,
+        "change_dates": ["2030-01-01"],
+        "change_fields": ["spending_per_month"],
+        "change_values": ["3000"],
+    }
+    response = client.get("/calculate", params=params, headers=HX)
+    assert response.status_code == 200
+    assert "Delay to FIRE Date" in response.text
+
+
+def test_calculate_links_to_the_months_of_a_year() -> None:
+    params = {
+        "change_dates": ["2030-01-01", "2035-01-01"],
+        "change_fields": ["spending_per_month", "income_per_month"],
+        "change_values": ["3000", "9000"],
+    }
+    response = client.get("/calculate", params=params, headers=HX)
+    link = re.search(r'hx-get="(/results/year/8\?[^"]*)"', response.text)
+    assert link is not None
+    months = client.get(html.unescape(link.group(1)))
+    assert months.status_code == 200
+    assert months.text == client.get("/results/year/8", params=params).text
+    assert months.text != client.get("/results/year/8").text
+
+
+def test_monte_carlo_endpoint() -> None:
+    params: dict[str, Any] = {"n_paths": 200, "seed": 1, "change_dates": ["2030-01-01"]}
+    params |= {"change_fields": ["growth_rate"], "change_values": ["5"]}
+    response = client.get("/monte-carlo", params=params)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["n_paths"] == 200
+    assert set(result["net_worth_bands"]) == {"5", "25", "50", "75", "95"}
+    assert client.get("/monte-carlo", params={"n_paths": 0}).status_code == 422
+
+
+def test_backtest_endpoint(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("WENFIRE_BACKTEST_DATA", str(tmp_path / "history.npy"))
+    params = {"horizon_years": 30}
+    assert client.get("/backtest", params=params).status_code == 503
+    months = np.datetime64("1926-01") + np.arange(50 * 12)
+    returns = np.where(np.arange(50 * 12) % 60 < 12, -0.02, 0.01)
+    save_history(tmp_path / "history.npy", months, returns, np.full(600, 0.002))
+    before = client.get("/metrics").text
+    response = client.get("/backtest", params=params)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["n_cohorts"] == len(result["cohorts"]) == 21
+    assert result["cohorts"][0]["start"] == "1926-01-01"
+    assert result["success_rate"] == 1
+    assert result["worst_cohort"]["fire_date"] >= result["best_cohort"]["fire_date"]
+    simulated = 'wenfire_simulated_months_total{kind="backtest"}'
+    increase = _metric(client.get("/metrics").text, simulated) - _metric(
+        before, simulated
+    )
+    assert increase == result["simulated_months"] > 0
+    assert client.get("/backtest", params={"step_months": 0}).status_code == 422
+
+
+def test_sweep_endpoint() -> None:
+    params: dict[str, Any] = {
+        "x_field": "growth_rate",
+        "x_start": 5,
+        "x_stop": 9,
+        "x_steps": 5,
+    }
+    params |= {"y_field": "spending_per_month", "y_start": 3000, "y_stop": 6000}
+    response = client.get("/sweep", params=params)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["x_values"] == [5, 6, 7, 8, 9]
+    assert len(result["fire_ages"]) == 10
+    assert len(result["heatmap"]["config"]["series"]) == 10
+
+    response = client.get(
+        "/sweep",
+        params={"x_field": "spending_per_month"}
+        | {
+            "x_start": 1e9,
+            "x_stop": 1e9,
+            "x_steps": 1,
+        },
+    )
+    assert response.json()["fire_ages"] == [None]
+    assert client.get("/sweep", params=params | {"x_field": "age"}).status_code == 422
+
+
+def test_goal_seek_endpoint() -> None:
+    params: dict[str, Any] = {"field": "spending_per_month", "fire_age": 45}
+    result = client.get("/goal-seek", params=params).json()
+    assert result["converged"]
+    assert result["fire_age"] == pytest.approx(45)
+    params = {"field": "growth_rate", "fire_date": "2040-01-01"}
+    assert client.get("/goal-seek", params=params).json()["fire_date"] == "2040-01-01"
+    assert client.get("/goal-seek", params={"field": "growth_rate"}).status_code == 422
+
+
+def _status_after_disconnect(path: str, query: str, delay: float = 0) -> int:
+    """Status of a request whose client disconnects ``delay`` seconds after it."""
+    messages = []
+    received: list[bool] = []
+
+    async def receive():
+        if delay and not received:
+            received.append(True)
+            return {"type": "http.request", "body": b"", "more_body": False}
+        if delay:
+            await asyncio.sleep(delay)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"host", b"testserver"), (b"hx-request", b"true")],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+    return messages[0]["status"]
+
+
+@pytest.mark.parametrize(
+    "path", ["/calculate", "/monte-carlo", "/sweep", "/goal-seek", "/results/year/0"]
+)
+def test_disconnected_client_skips_the_work(path: str) -> None:
+    query = "current_nw=123457&field=growth_rate&fire_age=50&x_field=growth_rate"
+    query += "&x_start=5&x_stop=9"
+    size = len(projection_cache)
+    assert _status_after_disconnect(path, query) == 499
+    # The projection was abandoned instead of being finished for nobody
+    assert len(projection_cache) == size
+
+
+def test_disconnect_stops_a_running_simulation(monkeypatch) -> None:
+    monkeypatch.setenv("WENFIRE_EXECUTOR", "thread")
+    stopped = threading.Event()
+    errors = []
+
+    def simulate_paths(*args, **kwargs):
+        try:
+            return fire.simulate_paths(*args, **kwargs)
+        except Exception as e:
+            errors.append(e)
+            raise
+        finally:
+            stopped.set()
+
+    monkeypatch.setattr("wenfire.montecarlo.simulate_paths", simulate_paths)
+    # 100k paths take seconds, the client leaves after 50 ms
+    assert _status_after_disconnect("/monte-carlo", "n_paths=100000", 0.05) == 499
+    assert stopped.wait(5)
+    assert [type(error) for error in errors] == [fire.SimulationCancelled]
@@ -0,0 +1,130 @@
+import datetime
+import itertools
+
+import pytest
+
+from wenfire.fire import (
+    DEFAULT_HORIZON_MONTHS,
+    GOAL_SEEK_FIELDS,
+    GoalSeekField,
+    InputData,
+    ParameterChange,
+    Summary,
+    calculate_results_for_month,
+    goal_seek,
+    project_batch,
+    solve_fire_date,
+)
+
+CHANGES = [
+    ParameterChange(
+        date=datetime.date(2024, 4, 1), field="income_per_month", value=6000
+    ),
+    ParameterChange(date=datetime.date(2030, 5, 3), field="growth_rate", value=8),
+    ParameterChange(
+        date=datetime.date(2031, 1, 1), field="spending_per_month", value=2500
+    ),
+    ParameterChange(date=datetime.date(2031, 1, 1), field="inflation", value=3),
+]
+
+
+def assert_summaries_close(expected: Summary | None, actual: Summary | None) -> None:
+    assert expected is not None and actual is not None
+    assert actual.fire_date == expected.fire_date
+    for field, value in expected.model_dump().items():
+        if isinstance(value, float | dict):
+            assert getattr(actual, field) == pytest.approx(value, rel=1e-9)
+        else:
+            assert getattr(actual, field) == value
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        {},
+        {"post_fire_spending_per_month": 2000.0},
+        {"parameter_changes": CHANGES},
+        {"growth_rate": 3.0, "inflation": 3.0},  # Growth equals inflation
+        {"annual_salary_increase": 5.0},  # Salary grows as fast as investments
+        {"current_nw": 2_000_000.0},  # Already FIRE
+    ],
+)
+def test_solve_fire_date_matches_simulation(
+    input_data: InputData, update: dict
+) -> None:
+    data = input_data.model_copy(update=update)
+    expected = Summary.from_results(
+        calculate_results_for_month(data.model_copy(deep=True))
+    )
+    assert_summaries_close(expected, solve_fire_date(data))
+
+
+def test_solve_fire_date_never_fire(input_data: InputData) -> None:
+    data = input_data.model_copy(
+        update={"income_per_month": 2500.0, "annual_salary_increase": 0.0}
+    )
+    assert Summary.from_results(calculate_results_for_month(data)) is None
+    assert solve_fire_date(data) is None
+    assert solve_fire_date(input_data, target=12) is None
+
+
+def test_project_batch_is_lazy_and_in_order(input_data: InputData) -> None:
+    never = input_data.model_copy(
+        update={"income_per_month": 2500.0, "annual_salary_increase": 0.0}
+    )
+    inputs = (input_data.model_copy(update={"current_nw": nw}) for nw in (0, 1e5))
+    batch = project_batch(itertools.chain(inputs, [never]))
+    first = next(batch)
+    assert first == solve_fire_date(input_data.model_copy(update={"current_nw": 0}))
+    second, third = batch
+    assert first is not None and second is not None
+    assert second.fire_date < first.fire_date
+    assert third is None
+
+
+@pytest.mark.parametrize("field", GOAL_SEEK_FIELDS)
+@pytest.mark.parametrize("fire_age", [45.0, 60.0])
+def test_goal_seek_reaches_target_age(
+    input_data: InputData, field: GoalSeekField, fire_age: float
+) -> None:
+    result = goal_seek(input_data, field, fire_age=fire_age)
+    if field == "extra_income" and fire_age == 60:
+        # Even without extra income FIRE comes before 60
+        assert not result.converged and result.value is None
+        return
+    assert result.converged
+    assert result.fire_age == pytest.approx(fire_age, abs=1e-6)
+    assert result.evaluations < 20
+    data = input_data.model_copy(update={field: result.value})
+    summary = Summary.from_results(calculate_results_for_month(data))
+    assert summary is not None
+    assert summary.fire_age == pytest.approx(fire_age, abs=1e-6)
+
+
+def test_goal_seek_fire_date(input_data: InputData) -> None:
+    fire_date = datetime.date(2040, 1, 1)
+    result = goal_seek(input_data, "spending_per_month", fire_date=fire_date)
+    assert result.converged
+    assert result.fire_date == fire_date
+    assert result.value is not None
+    assert result.value < input_data.spending_per_month
+
+
+@pytest.mark.parametrize("years_left", [0.3, 0.9])
+def test_goal_seek_beyond_the_horizon_does_not_converge(
+    input_data: InputData, years_left: float
+) -> None:
+    # Brent's method converges on the edge between FIRE at the end of the
+    # horizon and never, which misses a target age after the horizon
+    fire_age = input_data.age + DEFAULT_HORIZON_MONTHS / 12 + years_left
+    result = goal_seek(input_data, "spending_per_month", fire_age=fire_age)
+    assert not result.converged
+
+
+def test_goal_seek_unreachable(input_data: InputData) -> None:
+    result = goal_seek(input_data, "current_nw", fire_age=input_data.age - 1)
+    assert (result.value, result.converged, result.evaluations) == (None, False, 0)
+    with pytest.raises(ValueError, match="exactly one"):
+        goal_seek(input_data, "current_nw")
+    with pytest.raises(ValueError, match="Cannot goal seek"):
+        goal_seek(input_data, "date_of_birth", fire_age=50)  # type: ignore[arg-type]
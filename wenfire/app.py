@@ -1,27 +1,153 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import datetime
+import functools
+import inspect
+import itertools
+import json
 import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
 from pathlib import Path
-from typing import Optional
+from typing import Annotated, Any, Literal, NamedTuple, Optional
 from urllib.parse import urlencode
 
-from fastapi import FastAPI, Query, Request
-from fastapi.responses import HTMLResponse, Response
+import numpy as np
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi import Path as PathParameter
+from fastapi.responses import (
+    HTMLResponse,
+    ORJSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi_htmx import htmx, htmx_init
-
-from .fire import InputData, ParameterChange, Summary, calculate_results_for_month
+from pydantic import ValidationError
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive
+
+from .backtest import BacktestResult, BacktestSettings, HistoryUnavailable
+from .cache import SimulationCache
+from .colors import interpolate_color, interpolate_colors
+from .executor import (
+    backtest_task,
+    batch_task,
+    executor_for,
+    goal_seek_task,
+    monte_carlo_task,
+    projection_task,
+    shutdown_executors,
+    start_executors,
+    sweep_task,
+)
+from .export import csv_chunks, npz_bytes, result_columns
+from .fire import (
+    RESULT_COLUMNS,
+    GoalSeekField,
+    GoalSeekResult,
+    InputData,
+    ParameterChange,
+    PathField,
+    ResultColumn,
+    ResultsFrame,
+    Simulation,
+    Summary,
+)
+from .metrics import (
+    PARAMETER_CHANGES,
+    PROJECTION_MONTHS,
+    SIMULATED_MONTHS,
+    CallbackCounter,
+    Gauge,
+    MetricsMiddleware,
+    monitor_event_loop_lag,
+)
+from .metrics import render as render_metrics
+from .montecarlo import MonteCarloResult, MonteCarloSettings
 from .plots import (
     plot_age_vs_net_worth,
     plot_monthly_financial_flows,
+    plot_sweep_heatmap,
 )
+from .timing import StageTimer, TimingMiddleware
 
 FOLDER = Path(__file__).parent.resolve()
 
 
-app = FastAPI()
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Worker processes start (and warm up) before the first request, not during it
+    await start_executors()
+    monitor = asyncio.create_task(monitor_event_loop_lag())
+    try:
+        yield
+    finally:
+        monitor.cancel()
+        shutdown_executors()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(TimingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+
+class ClientDisconnected(Exception):
+    """The client went away (e.g. htmx replaced the request), so stop working for it."""
+
+
+@app.exception_handler(ClientDisconnected)
+async def client_disconnected(request: Request, exc: ClientDisconnected) -> Response:
+    # Nobody reads this response, 499 (client closed request) marks it in the logs
+    return Response(status_code=499)
+
+
+async def checkpoint(request: Request) -> None:
+    """Cancellation point between the stages of a heavy request.
+
+    Raises ``ClientDisconnected`` once the client has disconnected, so the
+    remaining stages (simulating, summarizing, plotting, rendering) are skipped.
+    Stages that were already finished are cached for the next request with the
+    same inputs.
+    """
+    if await request.is_disconnected():
+        raise ClientDisconnected
+
+
+async def _disconnect(request: Request) -> None:
+    """Wait for the client to disconnect, once the request body has been read."""
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+async def until_disconnected[T](request: Request, work: Awaitable[T]) -> T:
+    """``await work``, cancelling it if the client disconnects in the meantime.
+
+    Unlike a ``checkpoint`` this notices a client that leaves while a heavy
+    stage runs. The stage is then cancelled instead of finishing for nobody,
+    which stops a cached computation nobody else awaits and, through
+    ``SimulationExecutor.run_cancellable``, simulations in a thread.
+    """
+    task = asyncio.ensure_future(work)
+    disconnect = asyncio.ensure_future(_disconnect(request))
+    try:
+        done, _ = await asyncio.wait(
+            {task, disconnect}, return_when=asyncio.FIRST_COMPLETED
+        )
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    finally:
+        disconnect.cancel()
+    if task in done:
+        return task.result()
+    task.cancel()
+    raise ClientDisconnected
+
+
 app.mount("/static", StaticFiles(directory=FOLDER / "static"), name="static")
 templates = Jinja2Templates(directory=FOLDER / "templates")
 htmx_init(templates=templates)
@@ -39,6 +165,20 @@ DEFAULT_SAFE_WITHDRAW_RATE = 4
 DEFAULT_EXTRA_SPENDING = 0
 DEFAULT_POST_FIRE_SPENDING_PER_MONTH = 0  # 0 means use current spending
 
+# Maximum number of values per axis of a ``/sweep`` grid
+MAX_SWEEP_STEPS = 100
+
+# Longer chart series are downsampled to about this many points
+CHART_MAX_POINTS = 300
+
+# Households per task of ``/api/v1/batch``, and how many tasks may be queued
+# ahead of the one being streamed (bounding the memory of the results)
+BATCH_CHUNK_SIZE = 32
+BATCH_MAX_PENDING_CHUNKS = 8
+
+# Number of distinct inputs whose projections and charts are kept in memory
+CACHE_MAXSIZE = 512
+
 # Choices for parameter select boxes used across templates
 PARAMETER_CHOICES: list[tuple[str, str]] = [
     ("growth_rate", "📈 Investment Growth Rate (%)"),
@@ -148,48 +288,6 @@ def format_currency(value):
         return f"${value / 1_000_000:.0f}M"
 
 
-def interpolate_color(
-    x: float,
-    x_red: int = -2000,
-    x_orange: int = -1000,
-    x_yellow: int = 0,
-    x_light_green: int = 1000,
-    x_green: int = 2000,
-    return_hex: bool = True,
-):
-    color_points = {
-        x_red: (255, 0, 0),
-        x_orange: (255, 167, 0),
-        x_yellow: (255, 244, 0),
-        x_light_green: (163, 255, 0),
-        x_green: (44, 186, 0),
-    }
-
-    def _interpolate_color(c1, c2, ratio):
-        return tuple(int(c1[i] + (c2[i] - c1[i]) * ratio) for i in range(3))
-
-    if x <= x_red:
-        rgb = color_points[x_red]
-        return _rgb_to_hex(rgb) if return_hex else rgb
-
-    elif x >= x_green:
-        rgb = color_points[x_green]
-        return _rgb_to_hex(rgb) if return_hex else rgb
-    else:
-        sorted_keys = sorted(color_points.keys())
-        for i, key in enumerate(sorted_keys[:-1]):
-            if key <= x < sorted_keys[i + 1]:
-                c1 = color_points[key]
-                c2 = color_points[sorted_keys[i + 1]]
-                ratio = (x - key) / (sorted_keys[i + 1] - key)
-                rgb = _interpolate_color(c1, c2, ratio)
-                return _rgb_to_hex(rgb) if return_hex else rgb
-
-
-def _rgb_to_hex(rgb: tuple[int, int, int]) -> str:
-    return "#{:02x}{:02x}{:02x}".format(*rgb)
-
-
 def _date_str_to_date(date_str: str) -> datetime.date:
     return datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
 
@@ -202,14 +300,18 @@ def _parameter_changes(
     parameter_changes = []
     for date, field, value in zip(change_dates, change_fields, change_values):
         date_ = _date_str_to_date(date)
-        parameter_changes.append(ParameterChange(date=date_, field=field, value=value))
+        try:
+            change = ParameterChange.model_validate(
+                {"date": date_, "field": field, "value": value}
+            )
+        except ValidationError as e:
+            errors = e.errors(include_url=False, include_context=False)
+            raise HTTPException(422, errors) from None
+        parameter_changes.append(change)
     return sorted(parameter_changes, key=lambda x: x.date)
 
 
-@app.get("/calculate", response_class=HTMLResponse)
-@htmx("results_partial.html", "index.html")
-async def calculate(
-    request: Request,
+def projection_input(
     growth_rate: float = Query(default=DEFAULT_GROWTH_RATE),
     current_nw: float = Query(default=DEFAULT_CURRENT_NW),
     spending_per_month: float = Query(default=DEFAULT_SPENDING_PER_MONTH),
@@ -219,21 +321,22 @@ async def calculate(
     extra_income: float = Query(default=DEFAULT_EXTRA_INCOME),
     date_of_birth: str = Query(default=DEFAULT_DATE_OF_BIRTH),
     safe_withdraw_rate: float = Query(default=DEFAULT_SAFE_WITHDRAW_RATE),
-    extra_spending: float = Query(default=DEFAULT_EXTRA_SPENDING),
     post_fire_spending_per_month: float = Query(
         default=DEFAULT_POST_FIRE_SPENDING_PER_MONTH
     ),
-    change_dates: list[str] = Query(default=[]),
-    change_fields: list[str] = Query(default=[]),
-    change_values: list[str] = Query(default=[]),
-):
-    parameter_changes = _parameter_changes(change_dates, change_fields, change_values)
-    dob = _date_str_to_date(date_of_birth)
+    change_dates: Annotated[list[str] | None, Query()] = None,
+    change_fields: Annotated[list[str] | None, Query()] = None,
+    change_values: Annotated[list[str] | None, Query()] = None,
+) -> InputData:
+    """The ``InputData`` described by the same query parameters as the form."""
     # Convert post_fire_spending_per_month: 0 or empty means use current spending (None)
     post_fire_spending = (
         post_fire_spending_per_month if post_fire_spending_per_month > 0 else None
     )
-    input_data = InputData(
+    parameter_changes = _parameter_changes(
+        change_dates or [], change_fields or [], change_values or []
+    )
+    return InputData(
         growth_rate=growth_rate,
         current_nw=current_nw,
         spending_per_month=spending_per_month,
@@ -241,71 +344,187 @@ async def calculate(
         annual_salary_increase=annual_salary_increase,
         income_per_month=income_per_month,
         extra_income=extra_income,
-        date_of_birth=dob,
+        date_of_birth=_date_str_to_date(date_of_birth),
         safe_withdraw_rate=safe_withdraw_rate,
         post_fire_spending_per_month=post_fire_spending,
         parameter_changes=parameter_changes,
     )
+
+
+class Projection(NamedTuple):
+    simulation: Simulation
+    results: ResultsFrame
+    summary: Summary | None
+
+
+class Charts(NamedTuple):
+    age_vs_net_worth_plot: dict | None
+    monthly_financial_flows_plot: dict | None
+
+
+async def _projection(input_data: InputData) -> Projection:
+    arrays = await executor_for("calculate").run(
+        projection_task, input_data.model_dump_json()
+    )
+    simulation = Simulation.from_arrays(input_data, arrays)
+    results = simulation.frame()
+    PROJECTION_MONTHS.observe(len(results) - 1)
+    PARAMETER_CHANGES.observe(len(input_data.parameter_changes))
+    SIMULATED_MONTHS.inc(len(results) - 1, kind="projection")
+    return Projection(simulation, results, Summary.from_results(results))
+
+
+def _rebased_projection(base: Projection, current_nw: float) -> Projection:
+    """Projection with another starting net worth, reusing ``base``'s simulation."""
+    results = base.simulation.frame(current_nw)
+    SIMULATED_MONTHS.inc(len(results) - 1, kind="rebased_projection")
+    return Projection(base.simulation, results, Summary.from_results(results))
+
+
+def _charts(projection: Projection) -> Charts:
+    _, results, summary = projection
+    if summary is None:
+        return Charts(None, None)
+    return Charts(
+        plot_age_vs_net_worth(results, summary, CHART_MAX_POINTS),
+        plot_monthly_financial_flows(results, summary, CHART_MAX_POINTS),
+    )
+
+
+# Popular inputs (the defaults, shared links) are requested over and over
+projection_cache: SimulationCache[Projection] = SimulationCache(CACHE_MAXSIZE)
+chart_cache: SimulationCache[Charts] = SimulationCache(CACHE_MAXSIZE)
+CACHES: dict[str, SimulationCache] = {
+    "projection": projection_cache,
+    "chart": chart_cache,
+}
+
+
+def _cache_stat(name: str) -> dict[tuple[str, ...], float]:
+    return {(cache,): value.stats()[name] for cache, value in CACHES.items()}
+
+
+for _stat, _help in [
+    ("hits", "Cache lookups that found a value."),
+    ("misses", "Cache lookups that had to compute (or join a computation)."),
+    ("coalesced", "Misses that joined a computation already in flight."),
+]:
+    CallbackCounter(
+        f"wenfire_cache_{_stat}_total",
+        _help,
+        ("cache",),
+        functools.partial(_cache_stat, _stat),
+    )
+Gauge(
+    "wenfire_cache_hit_ratio",
+    "Fraction of the cache lookups that were hits.",
+    ("cache",),
+    lambda: _cache_stat("hit_ratio"),
+)
+Gauge(
+    "wenfire_cache_entries",
+    "Values in the cache.",
+    ("cache",),
+    lambda: _cache_stat("size"),
+)
+
+
+def _resolve_annotations[F: Callable[..., Any]](func: F) -> F:
+    """Evaluate the (postponed) annotations of ``func`` in this module.
+
+    ``@htmx`` wraps a route in a function of its own module, in whose globals
+    FastAPI would look up the names of the annotations. The evaluated signature
+    is copied onto that wrapper along with the rest of ``func.__dict__``.
+    """
+    func.__signature__ = inspect.signature(func, eval_str=True)  # type: ignore[attr-defined]
+    return func
+
+
+@app.get("/calculate", response_class=HTMLResponse)
+@htmx("results_partial.html", "index.html")
+@_resolve_annotations
+async def calculate(
+    request: Request,
+    input_data: Annotated[InputData, Depends(projection_input)],
+    extra_spending: Annotated[float, Query()] = DEFAULT_EXTRA_SPENDING,
+):
+    timer: StageTimer = request.state.timer
+    timer.lap("parse")
+    parameter_changes = input_data.parameter_changes
+    form = {
+        "growth_rate": input_data.growth_rate,
+        "current_nw": input_data.current_nw,
+        "spending_per_month": input_data.spending_per_month,
+        "inflation": input_data.inflation,
+        "annual_salary_increase": input_data.annual_salary_increase,
+        "income_per_month": input_data.income_per_month,
+        "extra_income": input_data.extra_income,
+        "date_of_birth": input_data.date_of_birth.strftime("%Y-%m-%d"),
+        "safe_withdraw_rate": input_data.safe_withdraw_rate,
+        "extra_spending": extra_spending,
+        # 0 means use current spending, as in the form
+        "post_fire_spending_per_month": input_data.post_fire_spending_per_month or 0,
+    }
     input_data_with_extra = input_data.model_copy(
-        update={"current_nw": current_nw - extra_spending}
+        update={"current_nw": input_data.current_nw - extra_spending}
     )
 
     # Calculate results without extra spending (main results)
-    results = calculate_results_for_month(input_data)
-    summary = Summary.from_results(results)
+    await checkpoint(request)
+    projection = await until_disconnected(
+        request, projection_cache.get_or_compute_async(input_data, _projection)
+    )
+    results, summary = projection.results, projection.summary
+    timer.lap("simulate")
 
-    # Calculate results with extra spending only for comparison
-    results_with_extra = calculate_results_for_month(input_data_with_extra)
-    summary_with_extra = Summary.from_results(results_with_extra)
+    # The results with extra spending (only for comparison) follow from the
+    # main simulation because the model is linear in the starting net worth
+    summary_with_extra = projection_cache.get_or_compute(
+        input_data_with_extra,
+        lambda data: _rebased_projection(projection, data.current_nw),
+    ).summary
 
     time_difference = None
     if summary and summary_with_extra:
         time_difference = (
             summary_with_extra.fire_date - summary.fire_date
         ).total_seconds() / (365.25 * 24 * 3600)
-
-    if summary is not None:
-        age_vs_net_worth_plot = plot_age_vs_net_worth(results, summary)
-        monthly_financial_flows_plot = plot_monthly_financial_flows(results, summary)
-    else:
-        age_vs_net_worth_plot = None
-        monthly_financial_flows_plot = None
+    timer.lap("summary")
+
+    # Building the chart configs is pure Python and only worth a thread
+    await checkpoint(request)
+    age_vs_net_worth_plot, monthly_financial_flows_plot = await until_disconnected(
+        request,
+        chart_cache.get_or_compute_async(
+            input_data,
+            lambda _: executor_for("charts", picklable=False).run(_charts, projection),
+        ),
+    )
+    timer.lap("plots")
+    await checkpoint(request)  # Before rendering the results
 
     # Create URL parameters string
     url_params = urlencode(
         {
-            "growth_rate": growth_rate,
-            "current_nw": current_nw,
-            "spending_per_month": spending_per_month,
-            "inflation": inflation,
-            "annual_salary_increase": annual_salary_increase,
-            "income_per_month": income_per_month,
-            "extra_income": extra_income,
-            "date_of_birth": date_of_birth,
-            "safe_withdraw_rate": safe_withdraw_rate,
-            "extra_spending": extra_spending,
-            "post_fire_spending_per_month": post_fire_spending_per_month,
-            "change_dates": change_dates,
-            "change_fields": change_fields,
-            "change_values": change_values,
-        }
+            **form,
+            "change_dates": [c.date.strftime("%Y-%m-%d") for c in parameter_changes],
+            "change_fields": [c.field for c in parameter_changes],
+            "change_values": [c.value for c in parameter_changes],
+        },
+        doseq=True,  # One parameter per parameter change
     )
 
+    yearly_results = results.yearly()
     context = {
         "request": request,
         "results": results,
+        # Only the years are rendered, their months load on demand (``results_year``)
+        "yearly_results": yearly_results,
+        "yearly_colors": interpolate_colors(
+            [year.safe_withdraw_minus_spending for year in yearly_results]
+        ),
         "summary": summary,
-        "growth_rate": growth_rate,
-        "current_nw": current_nw,
-        "spending_per_month": spending_per_month,
-        "inflation": inflation,
-        "annual_salary_increase": annual_salary_increase,
-        "income_per_month": income_per_month,
-        "extra_income": extra_income,
-        "date_of_birth": dob.strftime("%Y-%m-%d"),
-        "safe_withdraw_rate": safe_withdraw_rate,
-        "extra_spending": extra_spending,
-        "post_fire_spending_per_month": post_fire_spending_per_month,
+        **form,
         "parameter_changes": parameter_changes,
         "age_vs_net_worth_plot": age_vs_net_worth_plot,
         "monthly_financial_flows_plot": monthly_financial_flows_plot,
@@ -313,10 +532,347 @@ async def calculate(
         "summary_with_extra": summary_with_extra,
         "url_params": url_params,
     }
+    timer.lap("context")
 
     return context
 
 
+@app.get("/results/year/{year}", response_class=HTMLResponse)
+async def results_year(
+    request: Request,
+    input_data: Annotated[InputData, Depends(projection_input)],
+    year: int = PathParameter(ge=0),
+):
+    """Table rows of every month in ``year`` of the (usually cached) projection."""
+    await checkpoint(request)
+    projection = await until_disconnected(
+        request, projection_cache.get_or_compute_async(input_data, _projection)
+    )
+    months = projection.results[12 * year : 12 * (year + 1)]
+    colors = interpolate_colors(months.column("safe_withdraw_minus_spending"))
+    return templates.TemplateResponse(
+        request, "results_months.html.jinja2", {"results": months, "colors": colors}
+    )
+
+
+@app.get("/monte-carlo", response_model=MonteCarloResult)
+async def monte_carlo(
+    request: Request,
+    input_data: Annotated[InputData, Depends(projection_input)],
+    settings: Annotated[MonteCarloSettings, Query()],
+):
+    """Distribution of FIRE dates under random returns and inflation."""
+    await checkpoint(request)
+    result = await until_disconnected(
+        request,
+        executor_for("monte_carlo").run_cancellable(
+            monte_carlo_task, input_data.model_dump_json(), settings.model_dump_json()
+        ),
+    )
+    monte_carlo_result = MonteCarloResult.model_validate_json(result)
+    SIMULATED_MONTHS.inc(monte_carlo_result.simulated_months, kind="monte_carlo")
+    return monte_carlo_result
+
+
+@app.get("/backtest", response_model=BacktestResult)
+async def backtest(
+    request: Request,
+    input_data: Annotated[InputData, Depends(projection_input)],
+    settings: Annotated[BacktestSettings, Query()],
+):
+    """FIRE dates when historical returns and inflation replace the assumed ones."""
+    await checkpoint(request)
+    try:
+        result = await until_disconnected(
+            request,
+            executor_for("backtest").run_cancellable(
+                backtest_task, input_data.model_dump_json(), settings.model_dump_json()
+            ),
+        )
+    except HistoryUnavailable as e:
+        raise HTTPException(503, str(e)) from None
+    backtest_result = BacktestResult.model_validate_json(result)
+    SIMULATED_MONTHS.inc(backtest_result.simulated_months, kind="backtest")
+    return backtest_result
+
+
+@app.get("/sweep")
+async def sweep_grid(
+    request: Request,
+    input_data: Annotated[InputData, Depends(projection_input)],
+    x_field: PathField,
+    x_start: float,
+    x_stop: float,
+    x_steps: int = Query(default=10, ge=1, le=MAX_SWEEP_STEPS),
+    y_field: PathField | None = None,
+    y_start: float = 0,
+    y_stop: float = 0,
+    y_steps: int = Query(default=10, ge=1, le=MAX_SWEEP_STEPS),
+):
+    """FIRE age for a grid of values of one or two inputs, with a heatmap."""
+    x_values = np.linspace(x_start, x_stop, x_steps).tolist()
+    y_values = np.linspace(y_start, y_stop, y_steps).tolist() if y_field else []
+    await checkpoint(request)
+    ages, simulated_months = await until_disconnected(
+        request,
+        executor_for("sweep").run_cancellable(
+            sweep_task,
+            input_data.model_dump_json(),
+            x_field,
+            x_values,
+            y_field,
+            y_values,
+        ),
+    )
+    SIMULATED_MONTHS.inc(simulated_months, kind="sweep")
+    cells = ages.astype(object)
+    cells[np.isnan(ages)] = None  # Never FIRE is null
+    fire_ages = cells.tolist()
+    return {
+        "x_field": x_field,
+        "x_values": x_values,
+        "y_field": y_field,
+        "y_values": y_values,
+        "fire_ages": fire_ages,
+        "heatmap": plot_sweep_heatmap(x_field, x_values, y_field, y_values, fire_ages),
+    }
+
+
+@app.get("/goal-seek", response_model=GoalSeekResult)
+async def goal_seek_value(
+    request: Request,
+    input_data: Annotated[InputData, Depends(projection_input)],
+    field: GoalSeekField,
+    fire_age: float | None = None,
+    fire_date: datetime.date | None = None,
+):
+    """Value of ``field`` that makes FIRE happen at ``fire_age`` or ``fire_date``."""
+    if (fire_age is None) == (fire_date is None):
+        raise HTTPException(422, "Specify exactly one of fire_age and fire_date")
+    await checkpoint(request)
+    result = await until_disconnected(
+        request,
+        executor_for("goal_seek").run_cancellable(
+            goal_seek_task, input_data.model_dump_json(), field, fire_age, fire_date
+        ),
+    )
+    return GoalSeekResult.model_validate_json(result)
+
+
+ProjectionField = Literal["summary", ResultColumn]
+
+
+async def _projection_response(
+    request: Request, input_data: InputData, fields: list[ProjectionField] | None
+) -> ORJSONResponse:
+    """The summary and the requested monthly columns, serialized by orjson.
+
+    The columns are sent as the NumPy arrays themselves, which orjson
+    serializes natively, so no per-month Python objects are created.
+    """
+    projection = await projection_cache.get_or_compute_async(input_data, _projection)
+    await checkpoint(request)
+    fields = fields or ["summary", *RESULT_COLUMNS]
+    content: dict = {}
+    if "summary" in fields:
+        summary = projection.summary
+        content["summary"] = summary.model_dump() if summary is not None else None
+    content["columns"] = {
+        field: projection.results.column(field)
+        for field in dict.fromkeys(fields)
+        if field != "summary"
+    }
+    return ORJSONResponse(content)
+
+
+@app.get("/api/v1/projection", response_class=ORJSONResponse)
+async def projection_api(
+    request: Request,
+    input_data: Annotated[InputData, Depends(projection_input)],
+    fields: Annotated[list[ProjectionField] | None, Query()] = None,
+):
+    """Projection of the same query parameters as ``/calculate``, as JSON.
+
+    Pass ``fields`` (e.g. ``?fields=summary&fields=age&fields=nw``) to only get
+    the summary and those monthly columns, by default everything is returned.
+    """
+    return await _projection_response(request, input_data, fields)
+
+
+@app.post("/api/v1/projection", response_class=ORJSONResponse)
+async def projection_api_post(
+    request: Request,
+    input_data: InputData,
+    fields: Annotated[list[ProjectionField] | None, Query()] = None,
+):
+    """Like ``GET /api/v1/projection``, for an ``InputData`` JSON body."""
+    return await _projection_response(request, input_data, fields)
+
+
+@app.get("/api/v1/export")
+async def export(
+    request: Request,
+    input_data: Annotated[InputData, Depends(projection_input)],
+    format: Literal["csv", "npz"] = "csv",
+) -> StreamingResponse:
+    """Every month of the projection (all ``RESULT_COLUMNS``) as a download.
+
+    The CSV is formatted and sent in chunks of rows, ``npz`` is NumPy's
+    compressed columnar format (one array per column, read with ``np.load``).
+    """
+    projection = await projection_cache.get_or_compute_async(input_data, _projection)
+    await checkpoint(request)
+    columns = result_columns(projection.results)
+    content: Iterator[str | bytes]
+    if format == "csv":
+        content = csv_chunks(columns)
+        media_type = "text/csv; charset=utf-8"
+    else:
+        content = iter([npz_bytes(columns)])
+        media_type = "application/octet-stream"
+    headers = {"Content-Disposition": f'attachment; filename="wenfire.{format}"'}
+    return StreamingResponse(content, media_type=media_type, headers=headers)
+
+
+async def _batch_lines(
+    request: Request, body_received: asyncio.Event
+) -> AsyncIterator[list[bytes]]:
+    """The ``InputData`` JSON documents of a JSON array or NDJSON body, in lists.
+
+    NDJSON is split into lines as the body arrives, so households are evaluated
+    while the rest is still being uploaded and only an incomplete line is held.
+    A JSON array is one document, so it is received and parsed first (and a
+    malformed one rejected); its items are serialized again as they are needed.
+    ``body_received`` is set once the whole body has been received.
+    """
+    chunks = request.stream()
+    head = bytearray()
+    async for chunk in chunks:
+        head += chunk
+        if head.strip():
+            break
+    if not head.lstrip().startswith(b"["):
+        return _ndjson_lines(head, chunks, body_received)
+    async for chunk in chunks:
+        head += chunk
+    body_received.set()
+    try:
+        items = json.loads(head)
+    except ValueError as e:
+        raise HTTPException(422, f"Invalid JSON array: {e}") from None
+    return _json_items(items)
+
+
+async def _ndjson_lines(
+    buffer: bytearray, chunks: AsyncIterator[bytes], body_received: asyncio.Event
+) -> AsyncIterator[list[bytes]]:
+    """The complete lines in ``buffer`` and then in each of ``chunks``."""
+    try:
+        while True:
+            end = buffer.rfind(b"\n") + 1
+            lines = [bytes(line) for line in buffer[:end].split(b"\n") if line.strip()]
+            del buffer[:end]
+            if lines:
+                yield lines
+            chunk = await anext(chunks, None)
+            if chunk is None:
+                break
+            buffer += chunk
+    except ClientDisconnect:
+        return  # Nobody reads the results of the remaining lines
+    finally:
+        body_received.set()
+    if buffer.strip():  # The last line need not end with a newline
+        yield [bytes(buffer)]
+
+
+async def _json_items(items: list) -> AsyncIterator[list[bytes]]:
+    for chunk in itertools.batched(items, BATCH_CHUNK_SIZE):
+        yield [json.dumps(item).encode() for item in chunk]
+
+
+async def _batch_results(batches: AsyncIterator[list[bytes]]) -> AsyncIterator[bytes]:
+    """Run ``batch_task`` on chunks of ``batches`` and yield their NDJSON in order.
+
+    Chunks are submitted as soon as their lines arrive, while the results of
+    earlier chunks are yielded as soon as they are done.
+    """
+    executor = executor_for("batch")
+    # Submitted chunks in input order, then None once every chunk is submitted
+    pending: asyncio.Queue[asyncio.Future[bytes] | None] = asyncio.Queue(
+        BATCH_MAX_PENDING_CHUNKS
+    )
+
+    async def submit() -> None:
+        start = 0
+        try:
+            async for lines in batches:
+                for i in range(0, len(lines), BATCH_CHUNK_SIZE):
+                    chunk = lines[i : i + BATCH_CHUNK_SIZE]
+                    task = asyncio.ensure_future(executor.run(batch_task, chunk, start))
+                    await pending.put(task)
+                    start += len(chunk)
+        except Exception as e:  # Raised where the results are awaited instead
+            failed = asyncio.get_running_loop().create_future()
+            failed.set_exception(e)
+            await pending.put(failed)
+        await pending.put(None)
+
+    submitter = asyncio.ensure_future(submit())
+    try:
+        while (task := await pending.get()) is not None:
+            yield await task
+    finally:
+        submitter.cancel()
+        while not pending.empty():  # The client disconnected
+            if (task := pending.get_nowait()) is not None:
+                task.cancel()
+
+
+class _BatchResponse(StreamingResponse):
+    """NDJSON streamed back while the request body is still being received.
+
+    Below ASGI spec 2.4 Starlette receives messages while streaming to notice a
+    disconnect, which would swallow the body chunks not read yet, so that only
+    starts once ``body_received`` is set.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def __init__(
+        self, content: AsyncIterator[bytes], body_received: asyncio.Event
+    ) -> None:
+        super().__init__(content)
+        self.body_received = body_received
+
+    async def listen_for_disconnect(self, receive: Receive) -> None:
+        await self.body_received.wait()
+        await super().listen_for_disconnect(receive)
+
+
+@app.post("/api/v1/batch")
+async def batch(request: Request) -> StreamingResponse:
+    """Summaries of many households, streamed back as NDJSON in input order.
+
+    The body is a JSON array or NDJSON (one document per line) of ``InputData``.
+    Every output line has the ``index`` of its input and either its ``summary``
+    (``null`` if FIRE is never reached) or the validation ``error``. The
+    households are evaluated in chunks on the ``batch`` executor, several
+    chunks at a time, so use ``WENFIRE_EXECUTOR_BATCH=process`` to use all cores.
+    """
+    body_received = asyncio.Event()
+    batches = await _batch_lines(request, body_received)
+    return _BatchResponse(_batch_results(batches), body_received)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Request, simulation and cache metrics of this process, for Prometheus."""
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # Register helper functions once they are defined so templates can access them
 templates.env.globals.update(
     format_currency=format_currency,
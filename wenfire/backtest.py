@@ -0,0 +1,190 @@
+"""Backtests: how a plan would have fared starting in every historical year.
+
+History replaces the assumed ``growth_rate`` and ``inflation`` (including
+their parameter changes): every cohort starts at another month of a dataset of
+monthly returns and inflation, and all cohorts are simulated together, one
+vector operation per month, by ``simulate_paths``.
+
+The dataset is a NumPy ``.npy`` file with ``HISTORY_DTYPE`` records, which is
+memory-mapped, so worker processes share it and only read the months they
+need. Its path is ``WENFIRE_BACKTEST_DATA``, by default the bundled
+``data/sample_history.npy``: a synthetic century (seeded lognormal returns
+with an expected 7% a year and 15% volatility, inflation around 2.5%), so
+backtests work out of the box. It is not market history; convert a CSV of real
+data with ``month`` (e.g. ``1871-01``), ``returns`` and ``inflation`` columns
+(monthly fractions, e.g. ``0.01`` for 1%) with::
+
+    python -m wenfire.backtest history.csv history.npy
+"""
+
+from __future__ import annotations
+
+import datetime
+import functools
+import math
+import os
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from .fire import InputData, simulate_paths
+from .montecarlo import PERCENTILES, fire_date_after
+
+HISTORY_DTYPE = np.dtype(
+    [("month", "datetime64[M]"), ("returns", "f8"), ("inflation", "f8")]
+)
+DEFAULT_HISTORY_PATH = Path(__file__).parent / "data" / "sample_history.npy"
+
+
+class HistoryUnavailable(Exception):
+    """The dataset of historical returns is missing or malformed."""
+
+
+def history_path() -> Path:
+    return Path(os.environ.get("WENFIRE_BACKTEST_DATA", DEFAULT_HISTORY_PATH))
+
+
+def load_history(path: Path | None = None) -> np.ndarray:
+    """The (memory-mapped) monthly records of the dataset at ``path``."""
+    return _load_history(path or history_path())
+
+
+@functools.lru_cache(maxsize=4)
+def _load_history(path: Path) -> np.ndarray:
+    try:
+        history = np.load(path, mmap_mode="r")
+    except (OSError, ValueError) as e:
+        raise HistoryUnavailable(f"Cannot read the history at {path}: {e}") from e
+    if history.dtype != HISTORY_DTYPE or history.ndim != 1:
+        raise HistoryUnavailable(f"{path} does not contain {HISTORY_DTYPE} records")
+    return history
+
+
+def save_history(
+    path: Path, months: np.ndarray, returns: np.ndarray, inflation: np.ndarray
+) -> None:
+    """Write consecutive ``months`` of ``returns`` and ``inflation`` for backtests."""
+    history = np.empty(len(months), HISTORY_DTYPE)
+    history["month"] = np.asarray(months, dtype="datetime64[M]")
+    history["returns"] = returns
+    history["inflation"] = inflation
+    if np.any(np.diff(history["month"]) != np.timedelta64(1, "M")):
+        raise ValueError("The months must be consecutive")
+    np.save(path, history)
+
+
+class BacktestSettings(BaseModel):
+    horizon_years: int = Field(default=40, ge=1, le=100)  # Of every cohort
+    step_months: int = Field(default=12, ge=1, le=120)  # Between cohort starts
+
+
+class BacktestCohort(BaseModel):
+    start: datetime.date  # Historical month the cohort starts in
+    fire_date: datetime.date | None  # When following the plan from today
+    fire_age: float | None
+
+
+class BacktestResult(BaseModel):
+    n_cohorts: int
+    success_rate: float  # Fraction of cohorts that reach FIRE in the horizon
+    fire_age_percentiles: dict[int, float | None]
+    fire_date_percentiles: dict[int, datetime.date | None]
+    worst_cohort: BacktestCohort  # The latest FIRE, or the first never reaching it
+    best_cohort: BacktestCohort
+    cohorts: list[BacktestCohort]
+    simulated_months: int  # Months stepped, summed over the cohorts
+
+
+def _history_shocks(history: np.ndarray, starts: np.ndarray):
+    """Historical growth and inflation factors of the cohorts starting at ``starts``."""
+    returns = history["returns"]
+    inflation = history["inflation"]
+
+    def shocks(first_month: int, n_months: int, paths: slice):
+        months = starts[paths] + first_month + np.arange(n_months)[:, None]
+        return 1 + returns[months], 1 + inflation[months]
+
+    return shocks
+
+
+def run_backtest(
+    data: InputData,
+    settings: BacktestSettings | None = None,
+    history: np.ndarray | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> BacktestResult:
+    """Follow ``data`` through every rolling window of the historical dataset.
+
+    ``cancelled`` stops the simulation early, see ``simulate_paths``.
+    """
+    settings = settings or BacktestSettings()
+    history = load_history() if history is None else history
+    n_months = settings.horizon_years * 12
+    starts = np.arange(0, len(history) - n_months + 1, settings.step_months)
+    if not len(starts):
+        raise HistoryUnavailable(
+            f"The history has {len(history)} months, fewer than the horizon"
+        )
+    changes = [
+        change
+        for change in data.parameter_changes
+        if change.field not in ("growth_rate", "inflation")
+    ]
+    planned = data.model_copy(
+        update={"growth_rate": 0.0, "inflation": 0.0, "parameter_changes": changes}
+    )
+    paths = simulate_paths(
+        planned,
+        len(starts),
+        n_months,
+        shocks=_history_shocks(history, starts),
+        cancelled=cancelled,
+    )
+    fire_months = paths.fire_months
+    reached = ~np.isnan(fire_months)
+
+    cohorts = []
+    for start, months in zip(
+        history["month"][starts].tolist(), fire_months.tolist(), strict=True
+    ):
+        fire_date = None if math.isnan(months) else fire_date_after(data, months)
+        fire_age = data.age_at(fire_date) if fire_date is not None else None
+        cohorts.append(
+            BacktestCohort(start=start, fire_date=fire_date, fire_age=fire_age)
+        )
+
+    # Cohorts that never reach FIRE count as "later than the horizon"
+    ranked = np.where(reached, fire_months, np.inf)
+    month_percentiles = np.percentile(ranked, PERCENTILES, method="lower")
+    fire_dates = {
+        p: fire_date_after(data, m) if np.isfinite(m) else None
+        for p, m in zip(PERCENTILES, month_percentiles.tolist(), strict=True)
+    }
+    return BacktestResult(
+        n_cohorts=len(starts),
+        success_rate=float(reached.mean()),
+        fire_age_percentiles={
+            p: data.age_at(date) if date is not None else None
+            for p, date in fire_dates.items()
+        },
+        fire_date_percentiles=fire_dates,
+        worst_cohort=cohorts[int(np.argmax(ranked))],
+        best_cohort=cohorts[int(np.argmin(ranked))],
+        cohorts=cohorts,
+        simulated_months=paths.simulated_months,
+    )
+
+
+def _convert(csv_path: str, npy_path: str) -> None:
+    """Convert a CSV with ``month``, ``returns`` and ``inflation`` columns."""
+    table = np.genfromtxt(
+        csv_path, delimiter=",", names=True, dtype=None, encoding="utf-8"
+    )
+    save_history(Path(npy_path), table["month"], table["returns"], table["inflation"])
+
+
+if __name__ == "__main__":
+    _convert(*sys.argv[1:])
@@ -0,0 +1,163 @@
+"""In-process LRU/TTL cache for simulation results."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from . import fire
+from .fire import InputData
+
+
+def canonical_key(data: InputData) -> str:
+    """Hash of everything that determines a projection of ``data``.
+
+    Parameter changes are ordered by date (their random ``uuid`` is ignored)
+    and today's date is included because all projections start today.
+    """
+    payload = data.model_dump(mode="json", exclude={"parameter_changes"})
+    changes = sorted(data.parameter_changes, key=lambda change: change.date)
+    payload["parameter_changes"] = [
+        [change.date.isoformat(), change.field, change.value] for change in changes
+    ]
+    payload["today"] = fire._today().isoformat()
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class SimulationCache[T]:
+    """Size-bounded LRU cache keyed by ``canonical_key``.
+
+    Entries expire after ``ttl`` seconds (if set) and the whole cache is
+    invalidated when the date changes, because the projections depend on today.
+    Values are computed from a deep copy of the ``InputData``, so neither the
+    caller nor the computation can mutate what is cached behind the other's back.
+
+    ``get_or_compute_async`` is single-flight: requests for a key that is
+    already being computed await that computation instead of starting their
+    own (counted in ``coalesced``), e.g. for a burst of visitors of one link.
+    The computation is cancelled once every request awaiting it is.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: OrderedDict[str, tuple[float, T]] = OrderedDict()
+        self._day = fire._today()
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, asyncio.Task[T]] = {}
+        self._waiters: dict[asyncio.Task[T], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, data: InputData, compute: Callable[[InputData], T]) -> T:
+        key = canonical_key(data)
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry[1]
+        value = compute(data.model_copy(deep=True))
+        self._store(key, value)
+        return value
+
+    async def get_or_compute_async(
+        self, data: InputData, compute: Callable[[InputData], Awaitable[T]]
+    ) -> T:
+        """Like ``get_or_compute``, for computations that run in an executor.
+
+        Concurrent calls with the same key share one computation. It runs as a
+        task of its own, so it still completes (and is cached) when the request
+        that started it is cancelled, as long as another request awaits it.
+        When the last one is cancelled, so is the computation.
+        """
+        key = canonical_key(data)
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry[1]
+        task = self._in_flight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(compute(data.model_copy(deep=True)))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda task: self._finish(key, task))
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                self._abandon(key, task)
+
+    def _abandon(self, key: str, task: asyncio.Task[T]) -> None:
+        """Cancel ``task`` that nobody awaits any more, unless it is done."""
+        if task.done():
+            return
+        # Later requests must not join a computation that is being cancelled
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        task.cancel()
+
+    def _finish(self, key: str, task: asyncio.Task[T]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Also retrieves the exception, which the waiters re-raise
+        if not task.cancelled() and task.exception() is None:
+            self._store(key, task.result())
+
+    def _lookup(self, key: str) -> tuple[float, T] | None:
+        """The ``(created, value)`` entry of ``key``, if cached and not expired."""
+        with self._lock:
+            self._invalidate_if_new_day()
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def _store(self, key: str, value: T) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _invalidate_if_new_day(self) -> None:
+        today = fire._today()
+        if today != self._day:  # Midnight passed, every projection shifted
+            self._entries.clear()
+            self._day = today
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.monotonic() - created > self.ttl
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        """Counters of the cache; ``misses`` include the ``coalesced`` requests."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
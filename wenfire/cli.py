@@ -0,0 +1,289 @@
+"""Project many scenarios from the command line, without running the server.
+
+Reads ``InputData`` scenarios from a CSV, JSON (array) or NDJSON file and
+writes one summary per scenario, in input order, to CSV or NDJSON::
+
+    wenfire scenarios.csv --output summaries.csv --trajectories months.npz
+
+The columns of a CSV are the ``InputData`` fields, empty cells use the
+defaults and ``parameter_changes`` is a JSON list. The scenarios are projected
+in chunks on a pool of ``--workers`` processes (all cores by default), and
+the progress and throughput are reported on stderr.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import IO, NamedTuple
+
+import numpy as np
+from pydantic import ValidationError
+
+from .export import csv_chunks, npz_bytes, result_columns
+from .fire import (
+    DEFAULT_HORIZON_MONTHS,
+    RESULT_COLUMNS,
+    InputData,
+    Simulation,
+    Summary,
+    project_batch,
+)
+
+INPUT_FORMATS = ("csv", "json", "ndjson")
+SUMMARY_FIELDS = tuple(
+    field for field in Summary.model_fields if field != "safe_withdraw_at_age"
+)
+# Trajectory columns written to the ``--trajectories`` file
+TRAJECTORY_COLUMNS = ("scenario", *RESULT_COLUMNS)
+
+
+def read_scenarios(file: IO[str], format: str) -> Iterator[str]:
+    """The ``InputData`` JSON of every scenario in ``file``, one at a time."""
+    if format == "csv":
+        for row in csv.DictReader(file):
+            data = {key: value for key, value in row.items() if value not in ("", None)}
+            yield json.dumps(data)  # ``parameter_changes`` is decoded by ``_scenario``
+    elif format == "json":
+        for item in json.load(file):
+            yield json.dumps(item)
+    elif format == "ndjson":
+        yield from (line for line in file if line.strip())
+    else:
+        raise ValueError(f"Unknown format {format!r}, choose from {INPUT_FORMATS}")
+
+
+class ChunkResult(NamedTuple):
+    """Summaries (or errors) of a chunk of scenarios, and their trajectories."""
+
+    rows: list[dict]
+    trajectories: dict[str, np.ndarray] | None
+
+
+def _scenario(line: str) -> InputData:
+    """The ``InputData`` of a scenario's JSON.
+
+    The ``parameter_changes`` of a CSV are JSON text in a cell, decoded here so
+    an invalid cell only fails its own scenario.
+    """
+    data = json.loads(line)
+    if isinstance(data, dict) and isinstance(data.get("parameter_changes"), str):
+        data["parameter_changes"] = json.loads(data["parameter_changes"])
+    return InputData.model_validate(data)
+
+
+def _trajectory(index: int, data: InputData) -> tuple[dict, Summary | None]:
+    """The monthly columns (as in ``/calculate``) and summary of a scenario."""
+    results = Simulation(data, DEFAULT_HORIZON_MONTHS).frame()
+    columns = {"scenario": np.full(len(results), index), **result_columns(results)}
+    return columns, Summary.from_results(results)
+
+
+def project_chunk(lines: list[str], start: int, trajectories: bool) -> ChunkResult:
+    """Project the scenarios in ``lines``, numbered from ``start``.
+
+    Only the summaries are computed, with ``solve_fire_date``, unless the
+    monthly ``trajectories`` are needed too.
+    """
+    rows: dict[int, dict] = {}
+    valid: dict[int, InputData] = {}
+    for index, line in enumerate(lines, start):
+        try:
+            valid[index] = _scenario(line)
+        except ValidationError as e:
+            errors = e.errors(include_url=False, include_context=False)
+            rows[index] = {"error": json.dumps(errors, default=str)}
+        except ValueError as e:  # Invalid JSON
+            rows[index] = {"error": str(e)}
+    parts: list[dict] = []
+    summaries: Iterable[Summary | None]
+    if trajectories:
+        projected = [_trajectory(index, data) for index, data in valid.items()]
+        parts = [columns for columns, _ in projected]
+        summaries = [summary for _, summary in projected]
+    else:
+        summaries = project_batch(valid.values())
+    for index, summary in zip(valid, summaries, strict=True):
+        rows[index] = summary.model_dump(mode="json") if summary is not None else {}
+    joined = None
+    if parts:
+        joined = {name: np.concatenate([p[name] for p in parts]) for name in parts[0]}
+    return ChunkResult([{"index": i, **rows[i]} for i in sorted(rows)], joined)
+
+
+def _chunks(lines: Iterable[str], size: int) -> Iterator[tuple[int, list[str]]]:
+    lines = iter(lines)
+    for start in itertools.count(0, size):
+        chunk = list(itertools.islice(lines, size))
+        if not chunk:
+            return
+        yield start, chunk
+
+
+def run(
+    lines: Iterable[str],
+    trajectories: bool = False,
+    workers: int | None = None,
+    chunk_size: int = 64,
+) -> Iterator[ChunkResult]:
+    """``project_chunk`` of every chunk of ``lines``, in order.
+
+    With more than one worker, the chunks run in a process pool and at most
+    two chunks per worker are in flight, so memory stays bounded.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(lines, chunk_size)
+    if workers == 1:
+        for start, chunk in chunks:
+            yield project_chunk(chunk, start, trajectories)
+        return
+    # Fresh interpreters, forking a process that runs threads can deadlock
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        pending: deque[Future[ChunkResult]] = deque()
+        try:
+            for start, chunk in chunks:
+                pending.append(pool.submit(project_chunk, chunk, start, trajectories))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class SummaryWriter:
+    """Writes the summary rows as CSV or NDJSON."""
+
+    def __init__(self, file: IO[str], format: str) -> None:
+        self.file = file
+        self.format = format
+        if format == "csv":
+            fields = ("index", *SUMMARY_FIELDS, "error")
+            self._csv = csv.DictWriter(file, fields, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, rows: list[dict]) -> None:
+        if self.format == "csv":
+            self._csv.writerows(rows)
+        else:
+            self.file.writelines(json.dumps(row) + "\n" for row in rows)
+
+
+class TrajectoryWriter:
+    """Writes the monthly columns of all scenarios to a CSV or ``.npz`` file.
+
+    A CSV is written as the chunks come in. NumPy's ``.npz`` (one array per
+    column) can only be written at once, so its columns are kept in memory.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._parts: list[dict[str, np.ndarray]] = []
+        if path.suffix != ".npz":
+            self._file = path.open("w", newline="")
+            csv.writer(self._file).writerow(TRAJECTORY_COLUMNS)
+
+    def write(self, columns: dict[str, np.ndarray]) -> None:
+        if self.path.suffix == ".npz":
+            self._parts.append(columns)
+        else:
+            self._file.writelines(csv_chunks(columns, TRAJECTORY_COLUMNS, False))
+
+    def close(self) -> None:
+        if self.path.suffix == ".npz":
+            columns = {
+                name: np.concatenate([part[name] for part in self._parts])
+                for name in TRAJECTORY_COLUMNS
+                if self._parts
+            }
+            self.path.write_bytes(npz_bytes(columns))
+        else:
+            self._file.close()
+
+
+def _open(path: str, mode: str) -> contextlib.AbstractContextManager[IO[str]]:
+    """``path``, or stdin/stdout (which are not closed afterwards) for ``-``."""
+    if path == "-":
+        return contextlib.nullcontext(sys.stdin if mode == "r" else sys.stdout)
+    return open(path, mode, newline="")
+
+
+def _format(path: str, format: str | None, choices: tuple[str, ...]) -> str:
+    if format is not None:
+        return format
+    suffix = Path(path).suffix.lstrip(".")
+    suffix = {"jsonl": "ndjson"}.get(suffix, suffix)
+    return suffix if suffix in choices else choices[0]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="wenfire", description=__doc__.split("\n")[0])
+    parser.add_argument("input", help="CSV, JSON or NDJSON file, or - for stdin")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS)
+    parser.add_argument(
+        "-o", "--output", default="-", help="Summaries (.csv or .ndjson), - for stdout"
+    )
+    parser.add_argument("--output-format", choices=("csv", "ndjson"))
+    parser.add_argument(
+        "--trajectories", type=Path, help="Also write the months (.csv or .npz)"
+    )
+    parser.add_argument("--workers", type=int, help="Processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("-q", "--quiet", action="store_true", help="No progress")
+    args = parser.parse_args(argv)
+
+    input_format = _format(args.input, args.input_format, INPUT_FORMATS)
+    output_format = _format(args.output, args.output_format, ("csv", "ndjson"))
+    with _open(args.input, "r") as input_file, _open(args.output, "w") as output_file:
+        summaries = SummaryWriter(output_file, output_format)
+        trajectories = args.trajectories and TrajectoryWriter(args.trajectories)
+        start = time.perf_counter()
+        n_scenarios = n_errors = n_months = 0
+        results = run(
+            read_scenarios(input_file, input_format),
+            trajectories=bool(trajectories),
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+        )
+        for result in results:
+            summaries.write(result.rows)
+            n_scenarios += len(result.rows)
+            n_errors += sum("error" in row for row in result.rows)
+            if trajectories and result.trajectories is not None:
+                trajectories.write(result.trajectories)
+                n_months += len(result.trajectories["scenario"])
+            if not args.quiet:
+                rate = n_scenarios / (time.perf_counter() - start)
+                print(
+                    f"\r{n_scenarios} scenarios ({rate:.0f}/s)",
+                    end="",
+                    file=sys.stderr,
+                )
+        if trajectories:
+            trajectories.close()
+    if not args.quiet:
+        seconds = time.perf_counter() - start
+        print(
+            f"\r{n_scenarios} scenarios in {seconds:.2f} s"
+            f" ({n_scenarios / max(seconds, 1e-9):.0f}/s, {n_errors} invalid"
+            + (f", {n_months} months" if trajectories else "")
+            + ")",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
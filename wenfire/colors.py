@@ -0,0 +1,103 @@
+"""Color scales for the safe-withdraw-minus-spending cells and heatmaps."""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Iterable, Mapping
+
+import numpy as np
+
+RGB = tuple[int, int, int]
+
+# From "far from FIRE" (red) to "comfortably FIRE" (green), in $ per month
+DEFAULT_BREAKPOINTS: dict[float, RGB] = {
+    -2000: (255, 0, 0),
+    -1000: (255, 167, 0),
+    0: (255, 244, 0),
+    1000: (163, 255, 0),
+    2000: (44, 186, 0),
+}
+
+
+class ColorScale:
+    """Piecewise-linear color scale, precomputed as a lookup table.
+
+    The colors between the breakpoints are computed once, every ``resolution``
+    units, so looking one up is a bounds check and an index. Values below the
+    first or above the last breakpoint get its color.
+    """
+
+    def __init__(
+        self,
+        breakpoints: Mapping[float, RGB] = DEFAULT_BREAKPOINTS,
+        resolution: float = 1.0,
+    ) -> None:
+        xs = np.array(sorted(breakpoints), dtype=float)
+        colors = np.array([breakpoints[x] for x in sorted(breakpoints)], dtype=float)
+        self.lower, self.upper = float(xs[0]), float(xs[-1])
+        self.resolution = resolution
+        n = int(np.ceil((self.upper - self.lower) / resolution)) + 1
+        grid = np.minimum(self.lower + np.arange(n) * resolution, self.upper)
+        segment = np.clip(np.searchsorted(xs, grid, side="right") - 1, 0, len(xs) - 2)
+        ratio = (grid - xs[segment]) / (xs[segment + 1] - xs[segment])
+        start, end = colors[segment], colors[segment + 1]
+        # Truncated like ``int()`` so the table keeps its familiar colors
+        rgb = (start + (end - start) * ratio[:, None]).astype(int)
+        self._rgb: list[RGB] = [tuple(color) for color in rgb.tolist()]
+        self._hex = np.array(
+            ["#{:02x}{:02x}{:02x}".format(*color) for color in self._rgb]
+        )
+        self._hex_list: list[str] = self._hex.tolist()
+
+    def _index(self, x: float) -> int:
+        if not x > self.lower:  # Also NaN, like ``hex_many``
+            return 0
+        if x >= self.upper:
+            return len(self._rgb) - 1
+        return int((x - self.lower) / self.resolution)
+
+    def hex(self, x: float) -> str:
+        return self._hex_list[self._index(x)]
+
+    def rgb(self, x: float) -> RGB:
+        return self._rgb[self._index(x)]
+
+    def hex_many(self, values: Iterable[float] | np.ndarray) -> list[str]:
+        """Colors of a whole column (e.g. ``safe_withdraw_minus_spending``) at once."""
+        x = np.asarray(values, dtype=float)
+        # NaN (e.g. never FIRE in a sweep) gets the color of the lowest value
+        steps = np.nan_to_num((x - self.lower) / self.resolution, nan=0.0)
+        index = np.clip(steps, 0, len(self._rgb) - 1).astype(int)
+        return self._hex[index].tolist()
+
+
+@functools.lru_cache(maxsize=16)
+def color_scale(
+    x_red: float = -2000,
+    x_orange: float = -1000,
+    x_yellow: float = 0,
+    x_light_green: float = 1000,
+    x_green: float = 2000,
+) -> ColorScale:
+    """The default color scale, with its breakpoints moved to the given values."""
+    colors = DEFAULT_BREAKPOINTS.values()
+    points = (x_red, x_orange, x_yellow, x_light_green, x_green)
+    return ColorScale(dict(zip(points, colors, strict=True)))
+
+
+def interpolate_color(
+    x: float,
+    x_red: int = -2000,
+    x_orange: int = -1000,
+    x_yellow: int = 0,
+    x_light_green: int = 1000,
+    x_green: int = 2000,
+    return_hex: bool = True,
+):
+    scale = color_scale(x_red, x_orange, x_yellow, x_light_green, x_green)
+    return scale.hex(x) if return_hex else scale.rgb(x)
+
+
+def interpolate_colors(values: Iterable[float] | np.ndarray) -> list[str]:
+    """Vectorized ``interpolate_color`` with the default breakpoints."""
+    return color_scale().hex_many(values)
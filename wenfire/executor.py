@@ -0,0 +1,267 @@
+"""Run CPU-bound simulations off the event loop.
+
+Every endpoint that simulates picks an execution mode, from the environment:
+
+- ``inline``: on the event loop itself (no overhead, blocks other requests)
+- ``thread``: in a thread pool (numpy releases the GIL for large arrays)
+- ``process``: in a pool of warm worker processes
+
+``WENFIRE_EXECUTOR`` sets the default (``thread``) and e.g.
+``WENFIRE_EXECUTOR_MONTE_CARLO=process`` overrides it for one endpoint.
+``WENFIRE_WORKERS`` sets the size of the pools.
+
+The tasks in this module only take and return JSON and numpy arrays,
+which are cheap to send to worker processes, unlike pydantic object graphs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TypeVar
+
+import numpy as np
+from pydantic import ValidationError
+
+from .backtest import BacktestSettings, run_backtest
+from .fire import (
+    DEFAULT_HORIZON_MONTHS,
+    GoalSeekField,
+    InputData,
+    Simulation,
+    SweepResult,
+    goal_seek,
+    project_batch,
+    sweep,
+)
+from .montecarlo import MonteCarloSettings, run_monte_carlo
+
+T = TypeVar("T")
+
+EXECUTOR_MODES = ("inline", "thread", "process")
+DEFAULT_EXECUTOR_MODE = "thread"
+
+
+def projection_task(payload: str) -> dict[str, np.ndarray]:
+    """``Simulation`` of the ``InputData`` JSON in ``payload``, as arrays."""
+    data = InputData.model_validate_json(payload)
+    return Simulation(data, DEFAULT_HORIZON_MONTHS).to_arrays()
+
+
+def _cancelled(cancel: threading.Event | None) -> Callable[[], bool] | None:
+    return cancel.is_set if cancel is not None else None
+
+
+def monte_carlo_task(
+    payload: str, settings: str, cancel: threading.Event | None = None
+) -> str:
+    """``run_monte_carlo`` on JSON inputs, returning the result as JSON."""
+    data = InputData.model_validate_json(payload)
+    result = run_monte_carlo(
+        data,
+        MonteCarloSettings.model_validate_json(settings),
+        cancelled=_cancelled(cancel),
+    )
+    return result.model_dump_json()
+
+
+def backtest_task(
+    payload: str, settings: str, cancel: threading.Event | None = None
+) -> str:
+    """``run_backtest`` on JSON inputs, returning the result as JSON."""
+    data = InputData.model_validate_json(payload)
+    result = run_backtest(
+        data,
+        BacktestSettings.model_validate_json(settings),
+        cancelled=_cancelled(cancel),
+    )
+    return result.model_dump_json()
+
+
+def sweep_task(
+    payload: str,
+    x_field: str,
+    x_values: list[float],
+    y_field: str | None,
+    y_values: list[float],
+    cancel: threading.Event | None = None,
+) -> SweepResult:
+    """``sweep`` of the ``InputData`` JSON in ``payload``."""
+    data = InputData.model_validate_json(payload)
+    return sweep(
+        data, x_field, x_values, y_field, y_values, cancelled=_cancelled(cancel)
+    )
+
+
+def goal_seek_task(
+    payload: str,
+    field: GoalSeekField,
+    fire_age: float | None,
+    fire_date: datetime.date | None,
+    cancel: threading.Event | None = None,
+) -> str:
+    """``goal_seek`` of the ``InputData`` JSON in ``payload``, returning JSON."""
+    data = InputData.model_validate_json(payload)
+    result = goal_seek(data, field, fire_age, fire_date, cancelled=_cancelled(cancel))
+    return result.model_dump_json()
+
+
+def batch_task(lines: list[bytes], start: int) -> bytes:
+    """NDJSON with the ``Summary`` of each ``InputData`` JSON in ``lines``.
+
+    Every output line has the ``index`` of its input (counting from
+    ``start``) and either its ``summary`` or the validation ``error``.
+    """
+    valid: dict[int, InputData] = {}
+    output: dict[int, str] = {}
+    for index, line in enumerate(lines, start):
+        try:
+            valid[index] = InputData.model_validate_json(line)
+        except ValidationError as e:
+            errors = e.errors(include_url=False, include_context=False)
+            output[index] = json.dumps({"index": index, "error": errors}, default=str)
+    for index, summary in zip(valid, project_batch(valid.values()), strict=True):
+        body = summary.model_dump_json() if summary is not None else "null"
+        output[index] = f'{{"index": {index}, "summary": {body}}}'
+    return "".join(output[i] + "\n" for i in sorted(output)).encode()
+
+
+def _warm_up() -> None:
+    """Import everything and run a small simulation once per worker process."""
+    data = InputData(
+        growth_rate=7,
+        current_nw=0,
+        spending_per_month=1_000,
+        inflation=2,
+        annual_salary_increase=0,
+        income_per_month=2_000,
+        extra_income=0,
+        date_of_birth=datetime.date(1990, 1, 1),
+    )
+    projection_task(data.model_dump_json())
+
+
+def _ready() -> None:
+    """Nothing, once the worker process running it has warmed up."""
+
+
+class SimulationExecutor:
+    """Runs functions inline, in a thread pool, or in worker processes.
+
+    The pool is created by ``start`` or else on first use. In ``process`` mode
+    the functions and their arguments must be picklable, so use the ``*_task``
+    functions.
+    """
+
+    def __init__(
+        self, mode: str = DEFAULT_EXECUTOR_MODE, max_workers: int | None = None
+    ):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor {mode!r}, choose from {EXECUTOR_MODES}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self._pool: Executor | None = None
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.mode == "process":
+                # Forking a process that runs threads (like the event loop's
+                # thread pool) can deadlock, so start fresh interpreters
+                self._pool = ProcessPoolExecutor(
+                    self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_up,
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="wenfire"
+                )
+        return self._pool
+
+    async def start(self) -> None:
+        """Create the pool now and wait for all its worker processes to warm up.
+
+        Worker processes are started on demand, one per submitted task while
+        none is idle, so submitting one task per worker starts them all.
+        """
+        if self.mode == "inline":
+            return
+        pool = self._get_pool()
+        if self.mode == "process":
+            loop = asyncio.get_running_loop()
+            workers = self.max_workers or os.cpu_count() or 1
+            await asyncio.gather(
+                *(loop.run_in_executor(pool, _ready) for _ in range(workers))
+            )
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        if self.mode == "inline":
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), fn, *args)
+
+    async def run_cancellable(self, fn: Callable[..., T], *args) -> T:
+        """``run(fn, *args, cancel)``, setting the ``cancel`` event when cancelled.
+
+        Cancelling a thread's work does not stop it, so ``fn`` checks ``cancel``
+        to stop early, like the Monte Carlo, sweep and goal seek tasks do.
+        Worker processes cannot share the event, so they get ``None`` and only
+        work that has not started yet is cancelled.
+        """
+        cancel = threading.Event() if self.mode != "process" else None
+        try:
+            return await self.run(fn, *args, cancel)
+        except asyncio.CancelledError:
+            if cancel is not None:
+                cancel.set()
+            raise
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+_executors: dict[str, SimulationExecutor] = {}
+
+
+def executor_for(endpoint: str, picklable: bool = True) -> SimulationExecutor:
+    """The executor configured for ``endpoint``, shared by endpoints in the same mode.
+
+    Work that is not ``picklable`` runs in the thread pool instead of processes.
+    """
+    default = os.environ.get("WENFIRE_EXECUTOR", DEFAULT_EXECUTOR_MODE)
+    mode = os.environ.get(f"WENFIRE_EXECUTOR_{endpoint.upper()}", default)
+    if mode == "process" and not picklable:
+        mode = "thread"
+    return _executor(mode)
+
+
+def _executor(mode: str) -> SimulationExecutor:
+    if mode not in _executors:
+        workers = os.environ.get("WENFIRE_WORKERS")
+        _executors[mode] = SimulationExecutor(mode, int(workers) if workers else None)
+    return _executors[mode]
+
+
+async def start_executors() -> None:
+    """``start`` the executor of every mode configured in the environment."""
+    modes = {os.environ.get("WENFIRE_EXECUTOR", DEFAULT_EXECUTOR_MODE)}
+    modes.update(
+        mode
+        for name, mode in os.environ.items()
+        if name.startswith("WENFIRE_EXECUTOR_")
+    )
+    await asyncio.gather(*(_executor(mode).start() for mode in modes))
+
+
+def shutdown_executors() -> None:
+    for executor in _executors.values():
+        executor.shutdown()
+    _executors.clear()
@@ -0,0 +1,73 @@
+"""Export the monthly results as CSV or NumPy's columnar ``.npz`` format."""
+
+from __future__ import annotations
+
+import csv
+import io
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import numpy as np
+
+from .fire import RESULT_COLUMNS, ResultsFrame
+
+# Rows formatted at a time, so CSV exports only hold one chunk of text
+CSV_CHUNK_ROWS = 512
+
+
+def result_columns(results: ResultsFrame) -> dict[str, np.ndarray]:
+    """Every column of ``RESULT_COLUMNS`` as a NumPy array.
+
+    Dates become ``datetime64[D]`` and a missing ``post_fire_spending`` NaN.
+    """
+    columns: dict[str, np.ndarray] = {}
+    for name in RESULT_COLUMNS:
+        column = results.column(name)
+        if name == "date":
+            column = np.array(column, dtype="datetime64[D]")
+        elif name == "post_fire_spending" and column[0] is None:
+            column = np.full(len(results), np.nan)
+        columns[name] = np.asarray(column)
+    return columns
+
+
+def csv_chunks(
+    columns: dict[str, np.ndarray],
+    names: Iterable[str] | None = None,
+    header: bool = True,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+) -> Iterator[str]:
+    """CSV text of ``columns`` (or only ``names``), ``chunk_rows`` rows at a time.
+
+    NaN is written as an empty cell.
+    """
+    names = list(columns if names is None else names)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(names)
+    n_rows = len(columns[names[0]]) if names else 0
+    for start in range(0, n_rows, chunk_rows):
+        values = []
+        for name in names:
+            chunk = columns[name][start : start + chunk_rows]
+            missing = np.isnan(chunk) if chunk.dtype.kind == "f" else None
+            if missing is not None and missing.any():
+                chunk = chunk.astype(object)
+                chunk[missing] = None
+            values.append(chunk.tolist())
+        writer.writerows(zip(*values, strict=True))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():  # Only the header
+        yield buffer.getvalue()
+
+
+def npz_bytes(columns: dict[str, np.ndarray]) -> bytes:
+    """``columns`` as a compressed ``.npz`` file, read back with ``np.load``."""
+    buffer = io.BytesIO()
+    # Typed loosely, as mypy checks the arrays against ``allow_pickle: bool``
+    arrays: dict[str, Any] = columns
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
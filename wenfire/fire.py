@@ -1,11 +1,88 @@
 from __future__ import annotations
 
+import bisect
 import datetime
+import itertools
+import math
 import uuid
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from functools import cached_property, lru_cache
+from typing import Any, Literal, NamedTuple, get_args, overload
 
+import numpy as np
 from dateutil.relativedelta import relativedelta
 from pydantic import BaseModel, Field
 
+# Fields of ``InputData`` that a ``ParameterChange`` may target
+ParameterField = Literal[
+    "growth_rate",
+    "inflation",
+    "annual_salary_increase",
+    "income_per_month",
+    "extra_income",
+    "spending_per_month",
+]
+PARAMETER_FIELDS: tuple[ParameterField, ...] = get_args(ParameterField)
+_RATE_FIELDS = ("growth_rate", "inflation", "annual_salary_increase")
+_FLOW_FIELDS = {
+    "income_per_month": "income",
+    "extra_income": "extra_income",
+    "spending_per_month": "spending",
+}
+
+# Numeric fields of ``Results``, in the order ``simulate_columns`` produces them
+_RESULT_FIELDS = (
+    "months",
+    "nw",
+    "income",
+    "extra_income",
+    "spending",
+    "post_fire_spending",
+    "delta_nw",
+    "total_saved",
+)
+
+# Everything ``ResultsFrame.column`` returns, stored and derived
+ResultColumn = Literal[
+    "months",
+    "years",
+    "date",
+    "age",
+    "nw",
+    "delta_nw",
+    "income",
+    "extra_income",
+    "spending",
+    "post_fire_spending",
+    "actual_spending",
+    "fire_spending_target",
+    "saving",
+    "total_saved",
+    "investment_profits",
+    "total_investment_profits",
+    "safe_withdraw_rule_yearly",
+    "safe_withdraw_rule_monthly",
+    "safe_withdraw_minus_spending",
+    "is_fire_reached",
+]
+RESULT_COLUMNS: tuple[ResultColumn, ...] = get_args(ResultColumn)
+
+# Engines accepted by ``calculate_results_for_month``
+ENGINES = ("loop", "numpy")
+
+# Months simulated when no target is given (100 years)
+DEFAULT_HORIZON_MONTHS = 100 * 12
+
+# Calendars kept by ``month_calendar``, one per distinct person and day (each
+# takes about a millisecond to rebuild)
+_CALENDAR_CACHE_SIZE = 32
+
+# Stop the simulation after this many months with FIRE reached (6 years)
+_MONTHS_AFTER_FIRE = 6 * 12
+
+# Maximum number of months solved in one closed-form block (keeps powers finite)
+_BLOCK_MONTHS = 120
+
 
 def _today() -> datetime.date:
     return datetime.date.today()
@@ -13,7 +90,7 @@ def _today() -> datetime.date:
 
 class ParameterChange(BaseModel):
     date: datetime.date
-    field: str
+    field: ParameterField
     value: float
     uuid: str = Field(default_factory=lambda: uuid.uuid4().hex[:8])
 
@@ -67,6 +144,81 @@ class InputData(BaseModel):
         return (1 + self.annual_salary_increase / 100) ** (1 / 12)
 
 
+def _ages(date_of_birth: datetime.date, dates: np.ndarray) -> np.ndarray:
+    """``InputData.age_at`` of every ``datetime64[D]`` in ``dates``, vectorized.
+
+    Like ``relativedelta`` it counts the whole months to the last monthly
+    anniversary of ``date_of_birth`` (on the last day of shorter months) and
+    the days since, and adds them up in the same order so the ages are equal.
+    """
+    born = np.datetime64(date_of_birth, "D")
+    birth_month = np.datetime64(date_of_birth, "M")
+
+    def anniversary(months: np.ndarray) -> np.ndarray:
+        month = birth_month + months
+        start = month.astype("datetime64[D]")
+        length = ((month + 1).astype("datetime64[D]") - start).astype(int)
+        return start + np.minimum(date_of_birth.day, length) - 1
+
+    months = (dates.astype("datetime64[M]") - birth_month).astype(int)
+    anchor = anniversary(months)
+    before = dates < born  # Negative ages count towards the birth instead
+    months += (before & (dates > anchor)).astype(int)
+    months -= (~before & (dates < anchor)).astype(int)
+    anchor = anniversary(months)
+    years = np.sign(months) * (np.abs(months) // 12)
+    days = (dates - anchor).astype(int)
+    return years + (months - 12 * years) / 12 + days / 365.25
+
+
+class MonthCalendar:
+    """Dates and ages of the whole months of simulations started on ``now``.
+
+    Month ``m`` starts ``487 * m // 16`` days from ``now`` (a month is 365.25 /
+    12 days). Use ``month_calendar`` to share one calendar between all
+    simulations of the same person started on the same day.
+    """
+
+    def __init__(
+        self, now: datetime.date, date_of_birth: datetime.date, n_months: int
+    ) -> None:
+        self.now = now
+        self.date_of_birth = date_of_birth
+        days = 487 * np.arange(n_months + 1) // 16
+        dates = np.datetime64(now, "D") + days.astype("timedelta64[D]")
+        self.dates: list[datetime.date] = dates.tolist()
+        self.ages = _ages(date_of_birth, dates)
+        self.datetimes = dates.astype("datetime64[ms]")
+        self.years_from_now = days / 365.25
+        for array in (self.ages, self.datetimes, self.years_from_now):
+            array.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def birthday_months(self, last: int) -> list[int]:
+        """Months up to ``last`` whose age rounds to a whole number of years."""
+        ages = self.ages[: last + 1]
+        (near,) = np.nonzero(np.abs(ages - np.round(ages)) < 0.1)
+        return [m for m in near.tolist() if round(ages[m], 1) % 1 == 0]
+
+
+@lru_cache(maxsize=_CALENDAR_CACHE_SIZE)
+def _calendar(
+    now: datetime.date, date_of_birth: datetime.date, n_months: int
+) -> MonthCalendar:
+    return MonthCalendar(now, date_of_birth, n_months)
+
+
+def month_calendar(
+    data: InputData, n_months: int = DEFAULT_HORIZON_MONTHS
+) -> MonthCalendar:
+    """The process-wide ``MonthCalendar`` of ``data``, for at least ``n_months``."""
+    # Whole horizons, so runs that stop at different months share a calendar
+    horizons = max(1, -(-n_months // DEFAULT_HORIZON_MONTHS))
+    return _calendar(data.now, data.date_of_birth, horizons * DEFAULT_HORIZON_MONTHS)
+
+
 class Results(BaseModel):
     months: float
     nw: float
@@ -82,10 +234,16 @@ class Results(BaseModel):
 
     @property
     def date(self):
+        if self.months % 1 == 0:
+            month = int(self.months)
+            return month_calendar(self.input_data, month).dates[month]
         return self.input_data.now + datetime.timedelta(days=365.25 / 12) * self.months
 
     @property
     def age(self):
+        if self.months % 1 == 0:
+            month = int(self.months)
+            return month_calendar(self.input_data, month).ages[month].item()
         return self.input_data.age_at(self.date)
 
     @property
@@ -138,25 +296,24 @@ class Results(BaseModel):
     def total_investment_profits(self) -> float:
         return self.nw - self.total_saved
 
-    def next_month(self) -> "Results":
-        while (
-            self.input_data.parameter_changes
-            and self.input_data.parameter_changes[0].date
-            and self.date >= self.input_data.parameter_changes[0].date
-        ):
-            change = self.input_data.parameter_changes.pop(0)
-            print(f"Changing {change.field} to {change.value} at {change.date}")
-            if change.field in ("growth_rate", "inflation", "annual_salary_increase"):
-                setattr(self.input_data, change.field, change.value)
-            elif change.field == "income_per_month":
-                self.income = change.value
-            elif change.field == "extra_income":
-                self.extra_income = change.value
-            elif change.field == "spending_per_month":
-                self.spending = change.value
-            else:
-                raise ValueError(f"Unknown field {change.field}")
+    def with_changes(self, updates: dict[str, float]) -> Results:
+        """Copy of this month with the ``ParameterSchedule`` updates applied.
 
+        Rate changes go into a copy of ``input_data``, so the caller's
+        ``InputData`` (and every earlier month) keeps its rates.
+        """
+        rates = {field: v for field, v in updates.items() if field in _RATE_FIELDS}
+        flows = {
+            _FLOW_FIELDS[field]: v
+            for field, v in updates.items()
+            if field in _FLOW_FIELDS
+        }
+        input_data = self.input_data
+        if rates:
+            input_data = input_data.model_copy(update=rates)
+        return self.model_copy(update={**flows, "input_data": input_data})
+
+    def next_month(self) -> Results:
         new_nw = self.nw + self.investment_profits + self.saving
         new_months = self.months + 1
         new_spending = self.spending * self.input_data.monthly_inflation
@@ -181,7 +338,260 @@ class Results(BaseModel):
         )
 
 
-def retirement_index(results: list[Results]) -> int | None:
+class ResultRow:
+    """Read-only view of one month of a ``ResultsFrame``, quacking like ``Results``."""
+
+    __slots__ = ("_frame", "_index")
+
+    def __init__(self, frame: ResultsFrame, index: int) -> None:
+        self._frame = frame
+        self._index = index
+
+    @property
+    def input_data(self) -> InputData:
+        return self._frame.input_data
+
+    def __getattr__(self, name: str):
+        return self._frame.values(name)[self._index]
+
+    def __repr__(self) -> str:
+        return f"ResultRow(months={self.months}, nw={self.nw})"
+
+
+class YearRow(NamedTuple):
+    """One year of a ``ResultsFrame``: flows summed, balances at the year's end."""
+
+    year: int  # Years from now, starting at 0
+    months: int  # Number of months of the projection in this year
+    age: float  # At the start of the year
+    nw: float
+    delta_nw: float
+    saving: float
+    income: float
+    investment_profits: float
+    total_saved: float
+    total_investment_profits: float
+    spending: float
+    safe_withdraw_rule_monthly: float
+    safe_withdraw_minus_spending: float
+
+
+# Columns of ``YearRow`` that are summed over a year, the others are taken at its end
+_YEARLY_SUMS = ("delta_nw", "saving", "income", "investment_profits", "spending")
+_YEARLY_ENDS = (
+    "nw",
+    "total_saved",
+    "total_investment_profits",
+    "safe_withdraw_rule_monthly",
+    "safe_withdraw_minus_spending",
+)
+
+
+class ResultsFrame:
+    """Column-oriented alternative to ``list[Results]``.
+
+    Each ``Results`` field is stored as one NumPy array and the derived
+    properties (``saving``, ``safe_withdraw_minus_spending``, ...) are computed
+    once for all months. Iterating or indexing yields ``ResultRow`` views, so
+    templates and other ``Results`` consumers keep working unchanged.
+    """
+
+    def __init__(
+        self, columns: Mapping[str, np.ndarray | None], input_data: InputData
+    ) -> None:
+        self.input_data = input_data
+        self._columns: dict[str, np.ndarray] = {}
+        self._values: dict[str, list] = {}  # Python lists of ``_columns``
+        for field in (*_RESULT_FIELDS, "growth_factor"):
+            column = columns.get(field)
+            if column is not None:
+                self._columns[field] = np.asarray(column, dtype=float)
+        self._add_derived_columns()
+
+    def _add_derived_columns(self) -> None:
+        c = self._columns
+        nw, spending = c["nw"], c["spending"]
+        post_fire_spending = c.get("post_fire_spending")
+        growth_factor = c.get("growth_factor", self.input_data.monthly_growth_rate)
+
+        c["years"] = c["months"] / 12
+        c["saving"] = c["income"] + c["extra_income"] - spending
+        c["safe_withdraw_rule_yearly"] = nw * self.input_data.safe_withdraw_rate / 100
+        c["safe_withdraw_rule_monthly"] = c["safe_withdraw_rule_yearly"] / 12
+        c["fire_spending_target"] = (
+            post_fire_spending if post_fire_spending is not None else spending
+        )
+        c["safe_withdraw_minus_spending"] = (
+            c["safe_withdraw_rule_monthly"] - c["fire_spending_target"]
+        )
+        c["is_fire_reached"] = c["safe_withdraw_minus_spending"] >= 0
+        c["actual_spending"] = (
+            np.where(c["is_fire_reached"], post_fire_spending, spending)
+            if post_fire_spending is not None
+            else spending
+        )
+        c["investment_profits"] = nw * growth_factor - nw
+        c["total_investment_profits"] = nw - c["total_saved"]
+        for column in c.values():
+            column.flags.writeable = False
+
+    @classmethod
+    def from_results(cls, results: list[Results]) -> ResultsFrame:
+        """Pack ``Results`` objects (e.g. from the loop engine) into columns."""
+        columns: dict[str, np.ndarray | None] = {
+            field: np.array([getattr(r, field) for r in results], dtype=float)
+            for field in _RESULT_FIELDS
+            if field != "post_fire_spending"
+        }
+        if results and results[0].post_fire_spending is not None:
+            columns["post_fire_spending"] = np.array(
+                [r.post_fire_spending for r in results], dtype=float
+            )
+        # Rate changes give later months their own ``input_data``
+        columns["growth_factor"] = np.array(
+            [r.input_data.monthly_growth_rate for r in results], dtype=float
+        )
+        return cls(columns, results[0].input_data)
+
+    @classmethod
+    def coerce(cls, results: ResultsFrame | list[Results]) -> ResultsFrame:
+        return (
+            results if isinstance(results, ResultsFrame) else cls.from_results(results)
+        )
+
+    def __len__(self) -> int:
+        return len(self._columns["months"])
+
+    @overload
+    def __getitem__(self, index: int) -> ResultRow: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> ResultsFrame: ...
+
+    def __getitem__(self, index: int | slice) -> ResultRow | ResultsFrame:
+        if isinstance(index, slice):
+            columns = {
+                field: self._columns.get(field)
+                for field in (*_RESULT_FIELDS, "growth_factor")
+            }
+            return ResultsFrame(
+                {k: v[index] for k, v in columns.items() if v is not None},
+                self.input_data,
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ResultsFrame index out of range")
+        return ResultRow(self, index)
+
+    def __iter__(self) -> Iterator[ResultRow]:
+        return (ResultRow(self, i) for i in range(len(self)))
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def column(self, name: str) -> np.ndarray | list:
+        """Array of ``name`` for every month, e.g. ``"nw"`` or ``"date"``."""
+        if name == "date":
+            return self.dates
+        if name == "age":
+            return self.ages
+        if name == "post_fire_spending" and name not in self._columns:
+            return [None] * len(self)
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    @cached_property
+    def calendar_rows(self) -> tuple[MonthCalendar, slice]:
+        """The shared ``MonthCalendar`` and its rows for these (consecutive) months."""
+        first = int(self._columns["months"][0]) if len(self) else 0
+        calendar = month_calendar(self.input_data, first + len(self))
+        return calendar, slice(first, first + len(self))
+
+    @cached_property
+    def dates(self) -> list[datetime.date]:
+        calendar, rows = self.calendar_rows
+        return calendar.dates[rows]
+
+    def yearly(self) -> list[YearRow]:
+        """Aggregate the months into years (the last one may be shorter)."""
+        starts = np.arange(0, len(self), 12)
+        ends = np.minimum(starts + 12, len(self)) - 1
+        columns = {
+            field: np.add.reduceat(self._columns[field], starts).tolist()
+            for field in _YEARLY_SUMS
+        }
+        columns |= {
+            field: self._columns[field][ends].tolist() for field in _YEARLY_ENDS
+        }
+        ages = self.ages[starts].tolist()
+        return [
+            YearRow(
+                year=year,
+                months=int(end - start + 1),
+                age=ages[year],
+                **{field: values[year] for field, values in columns.items()},
+            )
+            for year, (start, end) in enumerate(
+                zip(starts.tolist(), ends.tolist(), strict=True)
+            )
+        ]
+
+    @cached_property
+    def change_months(self) -> list[int]:
+        """Months in which a ``ParameterChange`` of ``input_data`` takes effect."""
+        return ParameterSchedule(self.input_data, len(self)).months
+
+    @property
+    def ages(self) -> np.ndarray:
+        calendar, rows = self.calendar_rows
+        return calendar.ages[rows]
+
+    def values(self, name: str) -> list:
+        """``column(name)`` as a list of Python scalars, converted once."""
+        values = self._values.get(name)
+        if values is None:
+            column = self.column(name)
+            values = self._values[name] = (
+                column.tolist() if isinstance(column, np.ndarray) else list(column)
+            )
+        return values
+
+    def to_results(self) -> list[Results]:
+        """Materialize (unvalidated) ``Results`` objects, one per month."""
+        columns = [self.values(field) for field in _RESULT_FIELDS]
+        return [
+            _construct_results(
+                self.input_data, dict(zip(_RESULT_FIELDS, row, strict=True))
+            )
+            for row in zip(*columns, strict=True)
+        ]
+
+
+_RESULTS_FIELDS_SET = frozenset((*_RESULT_FIELDS, "input_data"))
+
+
+def _construct_results(input_data: InputData, fields: dict[str, Any]) -> Results:
+    """``Results.model_construct(input_data=input_data, **fields)``, but ~5x faster.
+
+    Sets the same instance state as ``model_construct`` (all fields given, no
+    extras or private attributes) without looking up defaults and aliases.
+    """
+    results = Results.__new__(Results)
+    fields["input_data"] = input_data
+    object.__setattr__(results, "__dict__", fields)
+    object.__setattr__(results, "__pydantic_fields_set__", set(_RESULTS_FIELDS_SET))
+    object.__setattr__(results, "__pydantic_extra__", None)
+    object.__setattr__(results, "__pydantic_private__", None)
+    return results
+
+
+def retirement_index(results: ResultsFrame | list[Results]) -> int | None:
+    if isinstance(results, ResultsFrame):
+        (reached,) = np.nonzero(results.column("is_fire_reached"))
+        return int(reached[0]) if len(reached) else None
     for i, r in enumerate(results):
         if r.safe_withdraw_minus_spending >= 0:
             return i
@@ -207,7 +617,9 @@ class Summary(BaseModel):
     safe_withdraw_at_age: dict[int, float]
 
     @classmethod
-    def _interpolate_result(cls, results: list[Results], index: int) -> Results:
+    def _interpolate_result(
+        cls, results: ResultsFrame | list[Results], index: int
+    ) -> Results | ResultRow:
         if index == 0:
             return results[index]
 
@@ -243,18 +655,36 @@ class Summary(BaseModel):
         )
 
     @classmethod
-    def from_results(cls, results: list[Results]) -> Summary | None:
+    def from_results(cls, results: ResultsFrame | list[Results]) -> Summary | None:
         index = retirement_index(results)
         if index is None:
             return None
 
         r = cls._interpolate_result(results, index)
 
+        if isinstance(results, ResultsFrame):
+            calendar, rows = results.calendar_rows
+            yearly = results.values("safe_withdraw_rule_yearly")
+            ages_and_withdraws = (
+                (calendar.ages[month], yearly[month - rows.start])
+                for month in calendar.birthday_months(rows.stop - 1)
+                if month >= rows.start
+            )
+        else:
+            ages_and_withdraws = (
+                (result.age, result.safe_withdraw_rule_yearly) for result in results
+            )
         safe_withdraw_at_age = {
-            round(r.age): r.safe_withdraw_rule_yearly / 12
-            for r in results
-            if round(r.age, 1) % 1 == 0
+            round(age): yearly / 12
+            for age, yearly in ages_and_withdraws
+            if round(age, 1) % 1 == 0
         }
+        return cls._from_fire_result(r, safe_withdraw_at_age)
+
+    @classmethod
+    def _from_fire_result(
+        cls, r: Results | ResultRow, safe_withdraw_at_age: dict[int, float]
+    ) -> Summary:
         return cls(
             age=r.input_data.age,
             fire_date=r.date,
@@ -271,19 +701,310 @@ class Summary(BaseModel):
         )
 
 
+def _horizon_months(data: InputData, target: int | datetime.date | None) -> int:
+    # If target is a date, calculate the target month
+    if isinstance(target, datetime.date):
+        return (target.year - data.now.year) * 12 + target.month - data.now.month
+    elif target is None:
+        return DEFAULT_HORIZON_MONTHS
+    return target
+
+
+def _change_month(now: datetime.date, date: datetime.date) -> int:
+    """First month index whose ``Results.date`` is on or after ``date``."""
+    # A month is 365.25 / 12 = 487 / 16 days and ``Results.date`` drops the fraction
+    days = (date - now).days
+    return max(0, -(-16 * days // 487))
+
+
+class ParameterSchedule:
+    """The ``ParameterChange``s of ``InputData`` as a table of month → updates.
+
+    Dates are converted to month offsets once, before simulating, so the
+    engines look a month's updates up by index instead of comparing dates
+    every month, and never touch ``InputData.parameter_changes`` itself.
+    A month's updates map each changed field to its new value and take effect
+    from that month's row on. Changes to months beyond the horizon are dropped.
+    """
+
+    def __init__(self, data: InputData, n_months: int) -> None:
+        self.events: dict[int, dict[str, float]] = {}
+        now = data.now
+        month = 0
+        for change in data.parameter_changes:
+            # Changes apply in list order, so a change never precedes the previous one
+            month = max(month, _change_month(now, change.date))
+            if month >= n_months:
+                break
+            self.events.setdefault(month, {})[change.field] = change.value
+
+    @property
+    def months(self) -> list[int]:
+        return list(self.events)
+
+    def get(self, month: int) -> dict[str, float]:
+        return self.events.get(month, {})
+
+
+def _apply_updates(
+    updates: dict[str, float], rates: dict[str, float], flows: dict[str, float]
+) -> None:
+    """Apply one month of ``ParameterSchedule`` updates to the running state."""
+    for field, value in updates.items():
+        if field in _RATE_FIELDS:
+            rates[field] = value
+        else:
+            flows[_FLOW_FIELDS[field]] = value
+
+
+def _monthly_factor(annual_percent: float) -> float:
+    return (1 + annual_percent / 100) ** (1 / 12)
+
+
+def _compounded(start: float, factor: float, steps: int) -> np.ndarray:
+    """``start * factor ** k`` for ``k`` up to ``steps``, as a cumulative product."""
+    out = np.empty(steps + 1)
+    out.fill(factor)
+    out[0] = start
+    return out.cumprod(out=out)
+
+
+def _linear_recurrence(
+    start: float, factor: float, increments: np.ndarray
+) -> np.ndarray:
+    """Solve ``x[k + 1] = factor * x[k] + increments[k]`` for all ``k`` at once."""
+    out = np.empty(len(increments) + 1)
+    out[0] = start
+    if factor < 0.01:  # The discounted closed form below would overflow
+        for k, increment in enumerate(increments):
+            out[k + 1] = out[k] * factor + increment
+        return out
+    for begin in range(0, len(increments), _BLOCK_MONTHS):
+        block = increments[begin : begin + _BLOCK_MONTHS]
+        powers = factor ** np.arange(1, len(block) + 1)
+        out[begin + 1 : begin + 1 + len(block)] = powers * (
+            out[begin] + (block / powers).cumsum()
+        )
+    return out
+
+
+def _stop_index(safe_withdraw_minus_spending: np.ndarray) -> int:
+    """Last month kept by the 6-years-after-FIRE cutoff of the simulation."""
+    fire_months = np.cumsum(safe_withdraw_minus_spending[1:] > 0)
+    (done,) = np.nonzero(fire_months >= _MONTHS_AFTER_FIRE)
+    if len(done) == 0:
+        return len(safe_withdraw_minus_spending) - 1
+    return int(done[0]) + 1
+
+
+class Simulation:
+    """Vectorized equivalent of ``calculate_results_for_month``, over the full horizon.
+
+    The horizon is split into constant-parameter segments at each scheduled
+    ``ParameterChange``. Within a segment, income and spending follow from a
+    cumulative product, total saved from a cumulative sum, and net worth from
+    the closed-form solution of its linear recurrence.
+
+    The model is linear in the starting net worth: starting with ``x`` more
+    shifts net worth ``m`` months later by ``x`` times the growth compounded
+    over those months and total saved by ``x``, while income and spending stay
+    the same. ``columns(current_nw=...)`` uses this to re-base one simulation on
+    another starting net worth, only recomputing where the run stops.
+    """
+
+    def __init__(self, data: InputData, n_months: int) -> None:
+        n_months = max(n_months, 0)  # Like the loop, a past target keeps the start
+        n_rows = n_months + 1
+        nw = np.empty(n_rows)
+        income = np.empty(n_rows)
+        extra_income = np.empty(n_rows)
+        spending = np.empty(n_rows)
+        total_saved = np.empty(n_rows)
+        growth_factor = np.empty(n_rows)
+        inflation_factor = np.empty(n_rows)
+
+        rates = {field: getattr(data, field) for field in _RATE_FIELDS}
+        flows = {
+            "income": data.income_per_month,
+            "extra_income": data.extra_income,
+            "spending": data.spending_per_month,
+        }
+        nw[0] = total_saved[0] = data.current_nw
+        income[0], extra_income[0], spending[0] = flows.values()
+        growth_factor[0] = _monthly_factor(rates["growth_rate"])
+        inflation_factor[0] = _monthly_factor(rates["inflation"])
+
+        schedule = ParameterSchedule(data, n_months)
+        # Flows of a month before its changes, needed if the run ends in that month
+        unapplied: dict[int, dict[str, float]] = {}
+        # Constant within a segment, so filled in with one ``np.repeat`` each
+        constants: list[tuple[float, float, float]] = []
+
+        boundaries = sorted({0, n_months, *schedule.events})
+        for start, end in itertools.pairwise(boundaries):
+            if start in schedule.events:
+                unapplied[start] = dict(flows)
+            _apply_updates(schedule.get(start), rates, flows)
+
+            steps = end - start
+            growth = _monthly_factor(rates["growth_rate"])
+            inflation = _monthly_factor(rates["inflation"])
+            salary = _monthly_factor(rates["annual_salary_increase"])
+            segment_income = _compounded(flows["income"], salary, steps)
+            segment_spending = _compounded(flows["spending"], inflation, steps)
+            saving = segment_income[:-1] + flows["extra_income"] - segment_spending[:-1]
+
+            rows = slice(start, end + 1)
+            income[rows] = segment_income
+            spending[rows] = segment_spending
+            total_saved[start + 1 : end + 1] = total_saved[start] + saving.cumsum()
+            nw[rows] = _linear_recurrence(nw[start], growth, saving)
+            constants.append((flows["extra_income"], growth, inflation))
+            flows["income"] = segment_income[-1]
+            flows["spending"] = segment_spending[-1]
+
+        if constants:  # Rows ``start`` up to ``end`` of every segment, and the last
+            lengths = np.diff(boundaries)
+            lengths[-1] += 1
+            extra_income[:], growth_factor[:], inflation_factor[:] = (
+                np.repeat(values, lengths) for values in zip(*constants, strict=True)
+            )
+
+        post_fire_spending = None
+        if data.post_fire_spending_per_month is not None:
+            post_fire_spending = np.cumprod(
+                np.r_[data.post_fire_spending_per_month, inflation_factor[:-1]]
+            )
+
+        self.data = data
+        self._nw = nw
+        self._total_saved = total_saved
+        self._income = income
+        self._extra_income = extra_income
+        self._spending = spending
+        self._post_fire_spending = post_fire_spending
+        self._growth_factor = growth_factor
+        self._unapplied = unapplied
+
+    @cached_property
+    def _compounded_growth(self) -> np.ndarray:
+        return np.cumprod(np.r_[1.0, self._growth_factor[:-1]])
+
+    def columns(self, current_nw: float | None = None) -> dict[str, np.ndarray]:
+        """Columns up to the 6-years-after-FIRE cutoff, like ``simulate_columns``."""
+        nw, total_saved = self._nw, self._total_saved
+        if current_nw is not None and current_nw != self.data.current_nw:
+            offset = current_nw - self.data.current_nw
+            nw = nw + offset * self._compounded_growth
+            total_saved = total_saved + offset
+        income = self._income.copy()
+        extra_income = self._extra_income.copy()
+        spending = self._spending.copy()
+        post_fire_spending = self._post_fire_spending
+
+        # The loop engine checks the cutoff before a month's changes are applied
+        spending_before_changes = spending.copy()
+        for month, before in self._unapplied.items():
+            spending_before_changes[month] = before["spending"]
+        target = (
+            post_fire_spending
+            if post_fire_spending is not None
+            else spending_before_changes
+        )
+        stop = _stop_index(nw * self.data.safe_withdraw_rate / 100 / 12 - target)
+        if stop in self._unapplied:
+            before = self._unapplied[stop]
+            income[stop] = before["income"]
+            extra_income[stop] = before["extra_income"]
+            spending[stop] = before["spending"]
+
+        rows = slice(0, stop + 1)
+        delta_nw = np.r_[0.0, np.diff(nw[rows])]
+        return {
+            "months": np.arange(stop + 1, dtype=float),
+            "nw": nw[rows],
+            "income": income[rows],
+            "extra_income": extra_income[rows],
+            "spending": spending[rows],
+            "post_fire_spending": (
+                post_fire_spending[rows] if post_fire_spending is not None else None
+            ),
+            "delta_nw": delta_nw,
+            "total_saved": total_saved[rows],
+            "growth_factor": self._growth_factor[rows],
+        }
+
+    def frame(self, current_nw: float | None = None) -> ResultsFrame:
+        """``ResultsFrame`` of this simulation, optionally rebased on ``current_nw``."""
+        data = self.data
+        if current_nw is not None and current_nw != data.current_nw:
+            data = data.model_copy(update={"current_nw": current_nw})
+        return ResultsFrame(self.columns(current_nw), data)
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Plain arrays to rebuild this simulation with ``from_arrays``.
+
+        Cheap to send to and from worker processes, unlike the object itself.
+        """
+        arrays = {name: getattr(self, f"_{name}") for name in _SIMULATION_ARRAYS}
+        if arrays["post_fire_spending"] is None:
+            del arrays["post_fire_spending"]
+        arrays["unapplied"] = np.array(
+            [
+                [month, *(before[flow] for flow in _FLOW_FIELDS.values())]
+                for month, before in self._unapplied.items()
+            ]
+        ).reshape(-1, 1 + len(_FLOW_FIELDS))
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, data: InputData, arrays: dict[str, np.ndarray]) -> Simulation:
+        simulation = cls.__new__(cls)
+        simulation.data = data
+        for name in _SIMULATION_ARRAYS:
+            setattr(simulation, f"_{name}", arrays.get(name))
+        simulation._unapplied = {
+            int(month): dict(zip(_FLOW_FIELDS.values(), before, strict=True))
+            for month, *before in arrays["unapplied"].tolist()
+        }
+        return simulation
+
+
+_SIMULATION_ARRAYS = (
+    "nw",
+    "total_saved",
+    "income",
+    "extra_income",
+    "spending",
+    "post_fire_spending",
+    "growth_factor",
+)
+
+
+def simulate_columns(data: InputData, n_months: int) -> dict[str, np.ndarray]:
+    """Vectorized equivalent of ``calculate_results_for_month`` returning arrays."""
+    return Simulation(data, n_months).columns()
+
+
 def calculate_results_for_month(
     data: InputData,
     target: int | datetime.date | None = None,
+    engine: str = "loop",
 ) -> list[Results]:
-    # If target is a date, calculate the target month
-    if isinstance(target, datetime.date):
-        delta_months = (
-            (target.year - data.now.year) * 12 + target.month - data.now.month
-        )
-    elif target is None:
-        delta_months = 100 * 12
-    else:
-        delta_months = target
+    """Simulate the finances month by month.
+
+    ``engine="loop"`` steps through ``Results.next_month`` (applying the
+    ``ParameterSchedule`` with ``Results.with_changes``), while
+    ``engine="numpy"`` computes the whole trajectory with ``simulate_columns``
+    and only wraps the final numbers in (unvalidated) ``Results`` objects. Use
+    ``calculate_results_frame`` to skip creating those objects altogether.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}, choose from {ENGINES}")
+    delta_months = _horizon_months(data, target)
+
+    if engine == "numpy":
+        return ResultsFrame(simulate_columns(data, delta_months), data).to_results()
 
     # Set initial values
     r = Results(
@@ -299,12 +1020,616 @@ def calculate_results_for_month(
         input_data=data,
     )
     results = [r]
+    schedule = ParameterSchedule(data, delta_months)
     done_for = 0
-    for _ in range(1, delta_months + 1):
+    for month in range(delta_months):
+        if month in schedule.events:
+            r = results[-1] = r.with_changes(schedule.events[month])
         r = r.next_month()
         results.append(r)
         if r.safe_withdraw_minus_spending > 0:
             done_for += 1
-            if done_for >= 6 * 12:  # 6 years
+            if done_for >= _MONTHS_AFTER_FIRE:
                 break
     return results
+
+
+def calculate_results_frame(
+    data: InputData,
+    target: int | datetime.date | None = None,
+) -> ResultsFrame:
+    """Like ``calculate_results_for_month`` but returns a columnar ``ResultsFrame``."""
+    return Simulation(data, _horizon_months(data, target)).frame()
+
+
+def _geometric_difference(a: float, b: float, k: float) -> float:
+    """``sum(a ** (k - 1 - j) * b ** j for j in range(k))``, also for real ``k``."""
+    if abs(a - b) <= 1e-12 * abs(a):
+        return k * a ** (k - 1)
+    return (a**k - b**k) / (a - b)
+
+
+class _Segment(NamedTuple):
+    """Closed-form state of a stretch of months without parameter changes."""
+
+    start: int
+    end: int
+    nw: float
+    total_saved: float
+    income: float
+    extra_income: float
+    spending: float
+    post_fire_spending: float | None
+    growth: float
+    inflation: float
+    salary: float
+
+    def nw_at(self, month: float) -> float:
+        """Net worth ``month`` months into the simulation."""
+        k = month - self.start
+        return (
+            self.growth**k * self.nw
+            + self.income * _geometric_difference(self.growth, self.salary, k)
+            + self.extra_income * _geometric_difference(self.growth, 1, k)
+            - self.spending * _geometric_difference(self.growth, self.inflation, k)
+        )
+
+    def gap(self, month: float, safe_withdraw_rate: float) -> float:
+        """``Results.safe_withdraw_minus_spending`` ``month`` months in, as a float."""
+        target = (
+            self.post_fire_spending
+            if self.post_fire_spending is not None
+            else self.spending
+        )
+        safe_withdraw_monthly = self.nw_at(month) * safe_withdraw_rate / 100 / 12
+        return safe_withdraw_monthly - target * self.inflation ** (month - self.start)
+
+    def at(self, month: float, input_data: InputData) -> Results:
+        """Row values ``month`` months into the simulation (``delta_nw`` unset)."""
+        k = month - self.start
+        income_sum = self.income * _geometric_difference(self.salary, 1, k)
+        spending_sum = self.spending * _geometric_difference(self.inflation, 1, k)
+        return Results.model_construct(
+            months=month,
+            nw=self.nw_at(month),
+            income=self.income * self.salary**k,
+            extra_income=self.extra_income,
+            spending=self.spending * self.inflation**k,
+            post_fire_spending=(
+                self.post_fire_spending * self.inflation**k
+                if self.post_fire_spending is not None
+                else None
+            ),
+            delta_nw=0.0,
+            total_saved=(
+                self.total_saved + income_sum + self.extra_income * k - spending_sum
+            ),
+            input_data=input_data,
+        )
+
+
+def _closed_form_segments(data: InputData, n_months: int) -> list[_Segment]:
+    """Split the horizon at each scheduled ``ParameterChange``."""
+    schedule = ParameterSchedule(data, n_months)
+    rates = {field: getattr(data, field) for field in _RATE_FIELDS}
+    flows = {
+        "income": data.income_per_month,
+        "extra_income": data.extra_income,
+        "spending": data.spending_per_month,
+    }
+    nw = total_saved = data.current_nw
+    post_fire_spending = data.post_fire_spending_per_month
+
+    segments = []
+    boundaries = sorted({0, n_months, *schedule.events})
+    for start, end in list(itertools.pairwise(boundaries)) or [(0, 0)]:
+        _apply_updates(schedule.get(start), rates, flows)
+        segment = _Segment(
+            start=start,
+            end=end,
+            nw=nw,
+            total_saved=total_saved,
+            post_fire_spending=post_fire_spending,
+            growth=_monthly_factor(rates["growth_rate"]),
+            inflation=_monthly_factor(rates["inflation"]),
+            salary=_monthly_factor(rates["annual_salary_increase"]),
+            **flows,
+        )
+        segments.append(segment)
+        r = segment.at(end, data)
+        nw, total_saved = r.nw, r.total_saved
+        post_fire_spending = r.post_fire_spending
+        flows["income"], flows["spending"] = r.income, r.spending
+    return segments
+
+
+def _brentq(
+    f: Callable[[float], float],
+    a: float,
+    b: float,
+    xtol: float = 1e-9,
+    maxiter: int = 100,
+) -> tuple[float, int, bool]:
+    """Brent's method for a root of ``f`` in ``[a, b]``.
+
+    Returns ``(root, iterations, converged)``; ``f(a)`` and ``f(b)`` must
+    differ in sign.
+    """
+    fa, fb = f(a), f(b)
+    if fa == 0:
+        return a, 0, True
+    if fb == 0:
+        return b, 0, True
+    if (fa > 0) == (fb > 0):
+        raise ValueError("f(a) and f(b) must have opposite signs")
+    c, fc = a, fa
+    d = e = b - a
+    for iteration in range(1, maxiter + 1):
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2 * np.finfo(float).eps * abs(b) + xtol / 2
+        m = (c - b) / 2
+        if abs(m) <= tol or fb == 0:
+            return b, iteration, True
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:  # Secant step
+                p, q = 2 * m * s, 1 - s
+            else:  # Inverse quadratic interpolation
+                q, r = fa / fc, fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        fb = f(b)
+    return b, maxiter, False
+
+
+def solve_fire_date(
+    data: InputData,
+    target: int | datetime.date | None = None,
+) -> Summary | None:
+    """Compute the ``Summary`` without simulating every month.
+
+    Net worth and spending have closed forms between parameter changes, so the
+    first month in which the safe withdrawal covers the spending is found by
+    bracketing the crossing (yearly steps) and refining it with Brent's method.
+    The result matches ``Summary.from_results(calculate_results_for_month(data))``
+    up to floating point error, as long as FIRE is not lost again once reached.
+    """
+    n_months = _horizon_months(data, target)
+    segments = _closed_form_segments(data, n_months)
+    starts = [segment.start for segment in segments]
+    rate = data.safe_withdraw_rate
+
+    # Only the rows around FIRE become ``Results``, the search and the safe
+    # withdrawals at each age are evaluated on plain floats
+    def segment_at(month: int) -> _Segment:
+        return segments[bisect.bisect_right(starts, month) - 1]
+
+    def row(month: int) -> Results:
+        r = segment_at(month).at(month, data)
+        if month > 0:
+            r.delta_nw = r.nw - segment_at(month - 1).nw_at(month - 1)
+        return r
+
+    index = None
+    for segment in segments:
+        last = segment.end if segment is segments[-1] else segment.end - 1
+
+        def gap(month: float, segment: _Segment = segment) -> float:
+            return segment.gap(month, rate)
+
+        index = _first_month_reaching_zero(gap, segment.start, last)
+        if index is not None:
+            break
+    if index is None:
+        return None
+
+    r: Results | ResultRow
+    if index == 0:
+        r = row(0)
+    else:
+        r = Summary._interpolate_result([row(index - 1), row(index)], 1)
+
+    # The simulation runs until FIRE has been reached for 6 years
+    stop = min(max(index, 1) + _MONTHS_AFTER_FIRE - 1, n_months)
+    calendar = month_calendar(data, stop)
+    safe_withdraw_at_age = {}
+    for month in calendar.birthday_months(stop):
+        yearly = segment_at(month).nw_at(month) * rate / 100
+        safe_withdraw_at_age[round(calendar.ages[month])] = yearly / 12
+    return Summary._from_fire_result(r, safe_withdraw_at_age)
+
+
+def project_batch(
+    inputs: Iterable[InputData],
+    target: int | datetime.date | None = None,
+) -> Iterator[Summary | None]:
+    """The ``Summary`` of every household in ``inputs``, lazily and in order.
+
+    Uses ``solve_fire_date``, so no household is simulated month by month and
+    only one is held in memory at a time (``inputs`` may be a generator).
+    """
+    for data in inputs:
+        yield solve_fire_date(data, target)
+
+
+def _first_month_reaching_zero(
+    f: Callable[[float], float], first: int, last: int
+) -> int | None:
+    """First whole month in ``[first, last]`` with ``f(month) >= 0``."""
+    if f(first) >= 0:
+        return first
+    previous = first
+    for month in [*range(first + 12, last, 12), last]:
+        if month <= previous:
+            continue
+        if f(month) >= 0:
+            root, _, _ = _brentq(f, previous, month)
+            index = min(max(math.ceil(root), previous + 1), month)
+            while index > previous + 1 and f(index - 1) >= 0:
+                index -= 1
+            while f(index) < 0:
+                index += 1
+            return index
+        previous = month
+    return None
+
+
+# Fields of ``InputData`` that ``simulate_paths`` can vary per path
+PathField = Literal[
+    "growth_rate",
+    "spending_per_month",
+    "inflation",
+    "annual_salary_increase",
+    "income_per_month",
+    "extra_income",
+    "current_nw",
+    "safe_withdraw_rate",
+    "post_fire_spending_per_month",
+]
+PATH_FIELDS: tuple[PathField, ...] = get_args(PathField)
+
+# ``shocks(first_month, n_months, paths)`` returns multiplicative shocks to the
+# monthly growth and inflation factors, each of shape ``(n_months, n_paths)``
+ShockSource = Callable[[int, int, slice], tuple[np.ndarray | None, np.ndarray | None]]
+
+
+class SimulationCancelled(Exception):
+    """The caller's ``cancelled()`` returned True, so the simulation stopped early."""
+
+
+class PathResults(NamedTuple):
+    fire_months: np.ndarray  # Fractional month in which FIRE is reached, NaN if never
+    nw_samples: np.ndarray | None  # Net worth every ``sample_every`` months, per path
+    simulated_months: int  # Months stepped, summed over the paths
+
+
+def simulate_paths(
+    data: InputData,
+    n_paths: int,
+    n_months: int = DEFAULT_HORIZON_MONTHS,
+    *,
+    overrides: dict[str, np.ndarray] | None = None,
+    shocks: ShockSource | None = None,
+    sample_every: int | None = None,
+    chunk_size: int = 10_000,
+    cancelled: Callable[[], bool] | None = None,
+) -> PathResults:
+    """Simulate many variations of ``data`` at once, one vector operation per month.
+
+    Each path starts from ``data`` with the ``PATH_FIELDS`` in ``overrides``
+    (arrays of length ``n_paths``) replaced, and follows the same parameter
+    changes. ``shocks`` adds randomness (Monte Carlo) or history (backtests) to
+    the monthly growth and inflation. Paths are processed in chunks of
+    ``chunk_size`` so memory stays bounded for any number of paths. Between
+    chunks and blocks of months, ``cancelled()`` (if given) is checked and a
+    ``SimulationCancelled`` raised when it returns True.
+
+    The FIRE month is interpolated between months exactly like
+    ``Summary.from_results``, so without shocks ``fire_months / 12`` equals
+    ``Summary.years_till_fi``.
+    """
+    overrides = overrides or {}
+    unknown = set(overrides) - set(PATH_FIELDS)
+    if unknown:
+        raise ValueError(f"Cannot vary {sorted(unknown)} per path")
+    events = ParameterSchedule(data, n_months).events
+
+    fire_months = np.full(n_paths, np.nan)
+    nw_samples = None
+    simulated_months = 0
+    if sample_every is not None:
+        nw_samples = np.full((n_months // sample_every + 1, n_paths), np.nan)
+
+    for begin in range(0, n_paths, chunk_size):
+        paths = slice(begin, min(begin + chunk_size, n_paths))
+        size = paths.stop - paths.start
+
+        state: dict[str, np.ndarray] = {}
+        for name in PATH_FIELDS:
+            if name in overrides:
+                state[name] = np.asarray(overrides[name], dtype=float)[paths].copy()
+            else:
+                value = getattr(data, name)
+                state[name] = np.full(size, np.nan if value is None else value)
+        nw = state["current_nw"]
+        income = state["income_per_month"]
+        extra_income = state["extra_income"]
+        spending = state["spending_per_month"]
+        withdraw_rate = state["safe_withdraw_rate"] / 100 / 12
+        factors = {
+            field: (1 + state[field] / 100) ** (1 / 12) for field in _RATE_FIELDS
+        }
+        # Spending to cover after FIRE, the post-FIRE spending where it is given
+        post_fire_spending = state["post_fire_spending_per_month"]
+        has_target = ~np.isnan(post_fire_spending)
+        target = np.where(has_target, post_fire_spending, spending)
+
+        fire = fire_months[paths]
+        previous = nw * withdraw_rate - target
+        fire[previous >= 0] = 0
+        earlier = previous
+        pending = np.isnan(fire).any()
+        if nw_samples is not None:
+            nw_samples[0, paths] = nw
+
+        for block_start in range(0, n_months, _BLOCK_MONTHS):
+            if cancelled is not None and cancelled():
+                raise SimulationCancelled
+            n_block = min(_BLOCK_MONTHS, n_months - block_start)
+            growth_shock, inflation_shock = (
+                shocks(block_start, n_block, paths) if shocks else (None, None)
+            )
+            for k in range(n_block):
+                month = block_start + k
+                if month in events:
+                    for field, value in events[month].items():
+                        if field in _RATE_FIELDS:
+                            factors[field] = np.full(size, _monthly_factor(value))
+                        else:
+                            target_array = {
+                                "income_per_month": income,
+                                "extra_income": extra_income,
+                                "spending_per_month": spending,
+                            }[field]
+                            target_array[:] = value
+                            if field == "spending_per_month":
+                                target[~has_target] = value
+                    previous = nw * withdraw_rate - target
+                    new = np.isnan(fire) & (previous >= 0)
+                    if new.any():
+                        # Between the month before and this month after the
+                        # changes like ``Summary.from_results``, which keeps a
+                        # changed start at month 0
+                        fraction = -earlier[new] / (previous[new] - earlier[new])
+                        fire[new] = np.maximum(month - 1 + fraction, 0)
+                        pending = np.isnan(fire).any()
+                growth = factors["growth_rate"]
+                inflation = factors["inflation"]
+                if growth_shock is not None:
+                    growth = growth * growth_shock[k]
+                if inflation_shock is not None:
+                    inflation = inflation * inflation_shock[k]
+
+                nw *= growth
+                nw += income + extra_income - spending
+                spending *= inflation
+                target *= inflation
+                income *= factors["annual_salary_increase"]
+
+                if pending:  # Else only net worth is still needed, for the samples
+                    current = nw * withdraw_rate - target
+                    new = np.isnan(fire) & (current >= 0)
+                    if new.any():
+                        fraction = -previous[new] / (current[new] - previous[new])
+                        fire[new] = month + fraction
+                        pending = np.isnan(fire).any()
+                    earlier, previous = previous, current
+                if (
+                    nw_samples is not None
+                    and sample_every is not None
+                    and (month + 1) % sample_every == 0
+                ):
+                    nw_samples[(month + 1) // sample_every, paths] = nw
+            simulated_months += n_block * size
+            if nw_samples is None and not pending:
+                break  # Every path reached FIRE, nothing left to compute
+        fire_months[paths] = fire
+
+    return PathResults(fire_months, nw_samples, simulated_months)
+
+
+class SweepResult(NamedTuple):
+    ages: np.ndarray  # FIRE age per cell, NaN if never
+    simulated_months: int  # Months stepped, summed over the cells
+
+
+def sweep(
+    data: InputData,
+    x_field: str,
+    x_values: Iterable[float],
+    y_field: str | None = None,
+    y_values: Iterable[float] = (),
+    n_months: int = DEFAULT_HORIZON_MONTHS,
+    cancelled: Callable[[], bool] | None = None,
+) -> SweepResult:
+    """FIRE age for every combination of ``x_values`` and ``y_values``.
+
+    The ages are an array of shape ``(len(y_values), len(x_values))`` (or
+    ``(len(x_values),)`` without ``y_field``) with NaN where FIRE is never
+    reached. All cells are simulated together by ``simulate_paths``.
+    """
+    x = np.asarray(list(x_values), dtype=float)
+    overrides = {x_field: x}
+    shape: tuple[int, ...] = x.shape
+    if y_field is not None:
+        if y_field == x_field:
+            raise ValueError("Sweep two different fields")
+        y = np.asarray(list(y_values), dtype=float)
+        shape = (len(y), len(x))
+        overrides = {x_field: np.tile(x, len(y)), y_field: np.repeat(y, len(x))}
+    paths = simulate_paths(
+        data, math.prod(shape), n_months, overrides=overrides, cancelled=cancelled
+    )
+    ages = np.array(
+        [
+            (
+                data.age_at(data.now + datetime.timedelta(days=487 / 16 * month))
+                if not math.isnan(month)
+                else math.nan
+            )
+            for month in paths.fire_months.tolist()
+        ]
+    )
+    return SweepResult(ages.reshape(shape), paths.simulated_months)
+
+
+# Fields of ``InputData`` that ``goal_seek`` can solve for
+GoalSeekField = Literal[
+    "spending_per_month",
+    "income_per_month",
+    "extra_income",
+    "current_nw",
+    "growth_rate",
+    "safe_withdraw_rate",
+    "annual_salary_increase",
+    "post_fire_spending_per_month",
+]
+GOAL_SEEK_FIELDS: tuple[GoalSeekField, ...] = get_args(GoalSeekField)
+
+# Whether a higher value of a field brings FIRE closer, for ``goal_seek``
+_FIRE_SOONER_WHEN_HIGHER: dict[GoalSeekField, bool] = {
+    "spending_per_month": False,
+    "income_per_month": True,
+    "extra_income": True,
+    "current_nw": True,
+    "growth_rate": True,
+    "safe_withdraw_rate": True,
+    "annual_salary_increase": True,
+    "post_fire_spending_per_month": False,
+}
+
+# Values that ``goal_seek`` will not look beyond
+_GOAL_SEEK_BOUNDS: dict[GoalSeekField, tuple[float, float]] = {
+    "spending_per_month": (0.0, math.inf),
+    "income_per_month": (0.0, math.inf),
+    "extra_income": (0.0, math.inf),
+    "current_nw": (-math.inf, math.inf),
+    "growth_rate": (-99.0, 100.0),
+    "safe_withdraw_rate": (0.01, 100.0),
+    "annual_salary_increase": (-99.0, 100.0),
+    "post_fire_spending_per_month": (0.0, math.inf),
+}
+
+
+class GoalSeekResult(BaseModel):
+    field: str
+    value: float | None  # None if no value reaches the target
+    fire_age: float | None
+    fire_date: datetime.date | None
+    iterations: int  # Of the root finder, after bracketing
+    evaluations: int  # Number of ``solve_fire_date`` calls in total
+    converged: bool
+
+
+def goal_seek(
+    data: InputData,
+    field: GoalSeekField,
+    fire_age: float | None = None,
+    fire_date: datetime.date | None = None,
+    max_expansions: int = 40,
+    tol: float = 1 / 365.25,
+    cancelled: Callable[[], bool] | None = None,
+) -> GoalSeekResult:
+    """Value of ``field`` at which FIRE is reached at ``fire_age`` (or ``fire_date``).
+
+    Starting from the current value, the search steps (doubling each time) in
+    the direction that moves FIRE towards the target until the target is
+    bracketed, then refines the value with Brent's method. Each evaluation is a
+    ``solve_fire_date`` call, so no months are simulated one by one. When FIRE
+    is never reached, the age at the end of the horizon stands in for the FIRE
+    age, which keeps the search moving towards values that do reach it.
+
+    The result only counts as ``converged`` if FIRE is reached, within ``tol``
+    years of the target. ``cancelled`` is checked before every evaluation, as
+    in ``simulate_paths``.
+    """
+    if field not in _FIRE_SOONER_WHEN_HIGHER:
+        raise ValueError(f"Cannot goal seek {field!r}, choose from {GOAL_SEEK_FIELDS}")
+    if fire_age is not None and fire_date is None:
+        target_age = fire_age
+    elif fire_date is not None and fire_age is None:
+        target_age = data.age_at(fire_date)
+    else:
+        raise ValueError("Specify exactly one of fire_age and fire_date")
+    never_age = data.age + DEFAULT_HORIZON_MONTHS / 12 + 1
+    summaries: dict[float, Summary | None] = {}
+
+    def summary_at(value: float) -> Summary | None:
+        if value not in summaries:
+            if cancelled is not None and cancelled():
+                raise SimulationCancelled
+            summaries[value] = solve_fire_date(data.model_copy(update={field: value}))
+        return summaries[value]
+
+    def miss(value: float) -> float:
+        summary = summary_at(value)
+        return (summary.fire_age if summary else never_age) - target_age
+
+    def on_target(value: float) -> bool:
+        return summary_at(value) is not None and abs(miss(value)) <= tol
+
+    def result(value: float | None, iterations: int, converged: bool):
+        summary = summary_at(value) if value is not None else None
+        return GoalSeekResult(
+            field=field,
+            value=value,
+            fire_age=summary.fire_age if summary else None,
+            fire_date=summary.fire_date if summary else None,
+            iterations=iterations,
+            evaluations=len(summaries),
+            converged=converged,
+        )
+
+    if target_age < data.age:  # FIRE in the past is not a goal any value reaches
+        return result(None, 0, False)
+    lower, upper = _GOAL_SEEK_BOUNDS[field]
+    start = getattr(data, field)
+    if start is None:  # Unset post-FIRE spending means the current spending
+        start = data.spending_per_month
+    a, miss_a = start, miss(start)
+    if miss_a == 0:
+        return result(a, 0, on_target(a))
+    # FIRE too late (miss > 0) means moving the way that brings it closer
+    up = (miss_a > 0) == _FIRE_SOONER_WHEN_HIGHER[field]
+    step = max(abs(start), 1.0) / 4
+    for _ in range(max_expansions):
+        b = min(a + step, upper) if up else max(a - step, lower)
+        miss_b = miss(b)
+        if (miss_b > 0) != (miss_a > 0) or miss_b == 0:
+            break
+        if b in (lower, upper):
+            return result(None, 0, False)
+        a, miss_a, step = b, miss_b, 2 * step
+    else:
+        return result(None, 0, False)
+
+    value, iterations, converged = _brentq(
+        miss, min(a, b), max(a, b), xtol=1e-9 * max(abs(start), 1.0)
+    )
+    return result(value, iterations, converged and on_target(value))
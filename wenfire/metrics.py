@@ -0,0 +1,241 @@
+"""In-process metrics in the Prometheus text format, served at ``/metrics``.
+
+Every replica keeps its own counters and histograms in memory (no client
+library or push gateway), so scrape each replica and aggregate in Prometheus.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from collections.abc import Callable, Iterable
+
+Labels = tuple[str, ...]
+
+# Seconds, from a cached page (~1 ms) to a large Monte Carlo run
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+SIZE_BUCKETS = tuple(2**k for k in range(8, 23, 2))  # 256 B to 4 MiB
+MONTH_BUCKETS = (12, 60, 120, 240, 360, 480, 600, 900, 1200)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50)
+
+
+def _format_labels(names: Labels, values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Labels = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _labels(self, labels: dict[str, str]) -> Labels:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.help}\n# TYPE {self.name} {self.type}\n"
+        return header + "".join(f"{line}\n" for line in self.samples())
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Labels = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = dict(self._values)
+        for key, value in values.items():
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Labels = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = (*buckets, math.inf)
+        # Per label values: the count of every bucket, then the sum
+        self._values: dict[Labels, list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._labels(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 1)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            counts[-1] += value
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = {key: list(counts) for key, counts in self._values.items()}
+        for key, counts in values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts[:-1], strict=True):
+                cumulative += int(count)
+                le = f'le="{_format_value(bound)}"'
+                labels = _format_labels(self.labelnames, key, le)
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(counts[-1])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Gauge(_Metric):
+    """A value that goes up and down: ``set``, or read from ``callback`` when scraped.
+
+    The callback returns a value per tuple of label values.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Labels = (),
+        callback: Callable[[], dict[Labels, float]] | None = None,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.callback = callback
+        self._values: dict[Labels, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._labels(labels)] = value
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = dict(self._values)
+        if self.callback is not None:
+            values |= self.callback()
+        for key, value in values.items():
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class CallbackCounter(Gauge):
+    """A counter kept elsewhere (e.g. ``SimulationCache.hits``), read when scraped."""
+
+    type = "counter"
+
+
+REGISTRY: list[_Metric] = []
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    return "".join(metric.render() for metric in REGISTRY)
+
+
+REQUEST_DURATION = Histogram(
+    "wenfire_request_duration_seconds",
+    "Time from receiving a request to sending its last byte.",
+    ("route", "status"),
+)
+RESPONSE_SIZE = Histogram(
+    "wenfire_response_size_bytes",
+    "Size of the response bodies.",
+    ("route",),
+    SIZE_BUCKETS,
+)
+PROJECTION_MONTHS = Histogram(
+    "wenfire_projection_months",
+    "Months simulated per (uncached) projection.",
+    buckets=MONTH_BUCKETS,
+)
+SIMULATED_MONTHS = Counter(
+    "wenfire_simulated_months_total",
+    "Months simulated, summed over all paths and grid cells (goal seeks and"
+    " batches solve for the FIRE date in closed form, without simulating).",
+    ("kind",),
+)
+PARAMETER_CHANGES = Histogram(
+    "wenfire_parameter_changes",
+    "Parameter changes per (uncached) projection.",
+    buckets=COUNT_BUCKETS,
+)
+EVENT_LOOP_LAG = Histogram(
+    "wenfire_event_loop_lag_seconds",
+    "How late the event loop woke up a sleeping task (blocked by CPU work).",
+    buckets=LATENCY_BUCKETS,
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording the latency and response size per route."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_and_measure(message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            # The route template, so ``/results/year/{year}`` is one series
+            route = getattr(scope.get("route"), "path", None)
+            if route is None:
+                route = "static" if scope.get("endpoint") is not None else "unmatched"
+            seconds = time.perf_counter() - start
+            REQUEST_DURATION.observe(seconds, route=route, status=str(status))
+            RESPONSE_SIZE.observe(size, route=route)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """Record how much later than requested ``asyncio.sleep`` returns, forever."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - start - interval))
@@ -0,0 +1,161 @@
+"""Monte Carlo projections with stochastic investment returns and inflation."""
+
+from __future__ import annotations
+
+import datetime
+from collections.abc import Callable
+from typing import Literal
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from .fire import DEFAULT_HORIZON_MONTHS, InputData, simulate_paths
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Same month length as the loop engine uses to date its rows
+_DAYS_PER_MONTH = 487 / 16
+
+
+class MonteCarloSettings(BaseModel):
+    n_paths: int = Field(default=10_000, ge=1, le=100_000)
+    return_volatility: float = Field(default=15.0, ge=0, le=100)  # Yearly std, %
+    inflation_volatility: float = Field(default=1.0, ge=0, le=50)  # Yearly std, %
+    distribution: Literal["lognormal", "student_t"] = "lognormal"
+    degrees_of_freedom: float = Field(default=5.0, gt=2)  # For ``student_t``
+    seed: int | None = None
+
+
+class MonteCarloResult(BaseModel):
+    n_paths: int
+    success_probability: float  # Fraction of paths that reach FIRE in the horizon
+    fire_age_percentiles: dict[int, float | None]
+    fire_date_percentiles: dict[int, datetime.date | None]
+    fire_age_histogram: dict[str, list[float]]  # Bin ``edges`` and ``counts``
+    band_ages: list[float]  # Age at the start of every year of the bands
+    net_worth_bands: dict[int, list[float]]  # Net worth percentile per year
+    simulated_months: int  # Months stepped, summed over the paths
+
+
+def _standardized(
+    rng: np.random.Generator, shape: tuple[int, int], settings: MonteCarloSettings
+) -> np.ndarray:
+    """Draws with zero mean and unit variance from the configured distribution.
+
+    Normal draws are single precision, which is faster and plenty for shocks.
+    """
+    if settings.distribution == "student_t":
+        df = settings.degrees_of_freedom
+        return rng.standard_t(df, shape) * np.sqrt((df - 2) / df)
+    return rng.standard_normal(shape, dtype=np.float32)
+
+
+def _shock_source(settings: MonteCarloSettings):
+    """Multiplicative shocks ``exp(sigma * z - sigma**2 / 2)`` with standardized ``z``.
+
+    For lognormal draws the shocks have mean one, so the *mean* path follows the
+    inputs and the median one grows slightly slower (``student_t`` draws have
+    the same variance but fatter tails). Returns vary every month; inflation is
+    drawn once per year and held for the twelve months, which is how inflation
+    is usually reported.
+
+    The draws are antithetic: the second half of the paths uses ``-z`` of the
+    first half, which halves the number of random draws and reduces the
+    variance of the estimates. Its shocks follow from the first half's as
+    ``exp(-sigma**2) / shock``, which is cheaper than another ``exp``.
+    """
+    rng = np.random.default_rng(settings.seed)
+    return_sigma = settings.return_volatility / 100 / np.sqrt(12)
+    # Held for a year, so a yearly draw compounds over twelve months
+    inflation_sigma = settings.inflation_volatility / 100 / 12
+
+    def antithetic(n_draws: int, size: int, sigma: float) -> np.ndarray:
+        half = -(-size // 2)
+        out = np.empty((n_draws, size), dtype=np.float32)
+        first, second = out[:, :half], out[:, half:]
+        np.multiply(_standardized(rng, (n_draws, half), settings), sigma, out=first)
+        first -= sigma**2 / 2
+        np.exp(first, out=first)
+        np.divide(np.exp(-(sigma**2)), first[:, : size - half], out=second)
+        return out
+
+    def shocks(first_month: int, n_months: int, paths: slice):
+        size = paths.stop - paths.start
+        growth = None
+        if return_sigma:
+            growth = antithetic(n_months, size, return_sigma)
+        inflation = None
+        if inflation_sigma:
+            yearly = antithetic(-(-n_months // 12), size, inflation_sigma)
+            inflation = np.repeat(yearly, 12, axis=0)[:n_months]
+        return growth, inflation
+
+    return shocks
+
+
+def fire_date_after(data: InputData, months: float) -> datetime.date:
+    """The date ``months`` (fractional) months after ``data.now``."""
+    return data.now + datetime.timedelta(days=_DAYS_PER_MONTH * months)
+
+
+def run_monte_carlo(
+    data: InputData,
+    settings: MonteCarloSettings | None = None,
+    n_months: int = DEFAULT_HORIZON_MONTHS,
+    chunk_size: int = 10_000,
+    cancelled: Callable[[], bool] | None = None,
+) -> MonteCarloResult:
+    """Simulate ``settings.n_paths`` random futures of ``data``.
+
+    ``cancelled`` stops the simulation early, see ``simulate_paths``.
+    """
+    settings = settings or MonteCarloSettings()
+    paths = simulate_paths(
+        data,
+        settings.n_paths,
+        n_months,
+        shocks=_shock_source(settings),
+        sample_every=12,
+        chunk_size=chunk_size,
+        cancelled=cancelled,
+    )
+    fire_months = paths.fire_months
+    reached = ~np.isnan(fire_months)
+
+    # Paths that never reach FIRE count as "later than the horizon"
+    ranked = np.where(reached, fire_months, np.inf)
+    month_percentiles = np.percentile(ranked, PERCENTILES, method="lower")
+    fire_dates = {
+        p: fire_date_after(data, m) if np.isfinite(m) else None
+        for p, m in zip(PERCENTILES, month_percentiles.tolist(), strict=True)
+    }
+    fire_ages = {
+        p: data.age_at(date) if date is not None else None
+        for p, date in fire_dates.items()
+    }
+
+    # Approximate ages (to within a day) are good enough for a histogram
+    ages = data.age + fire_months[reached] * _DAYS_PER_MONTH / 365.25
+    counts, edges = (
+        np.histogram(ages, bins=np.arange(np.floor(ages.min()), ages.max() + 2))
+        if reached.any()
+        else (np.array([]), np.array([]))
+    )
+
+    nw_samples = paths.nw_samples
+    assert nw_samples is not None  # Sampled every year
+    bands = np.percentile(nw_samples, PERCENTILES, axis=1)
+    band_ages = data.age + np.arange(len(nw_samples)) * 12 * _DAYS_PER_MONTH / 365.25
+
+    return MonteCarloResult(
+        n_paths=settings.n_paths,
+        success_probability=float(reached.mean()),
+        fire_age_percentiles=fire_ages,
+        fire_date_percentiles=fire_dates,
+        fire_age_histogram={"edges": edges.tolist(), "counts": counts.tolist()},
+        band_ages=band_ages.tolist(),
+        net_worth_bands={
+            p: band.tolist() for p, band in zip(PERCENTILES, bands, strict=True)
+        },
+        simulated_months=paths.simulated_months,
+    )
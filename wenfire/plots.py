@@ -1,26 +1,92 @@
-from .fire import Results, Summary
+import itertools
 from datetime import datetime
 
+import numpy as np
+
+from .fire import Results, ResultsFrame, Summary, retirement_index
+
+# Themes whose colors are sent along with each chart and applied in the browser
+THEMES = ("light", "dark")
+
 _PLOT_PROPERTIES = dict(width=360, usermeta={"embedOptions": {"actions": False}})
 
 
-def _format_time_from_now(years: float) -> str:
-    """Format years from now into readable text."""
-    if years < 0.1:
-        return "now"
-    else:
-        return f"{years:.1f} yr"
+def _lttb(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of ``n_out`` points of ``y`` picked by Largest-Triangle-Three-Buckets.
+
+    The points are equally spaced (months), so their index serves as x. The
+    first and last point are always kept; every bucket in between contributes
+    the point that spans the largest triangle with the previously kept point and
+    the average of the next bucket.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int).tolist()
+    values = y.tolist()  # Buckets are small, so plain floats beat numpy calls
+    kept = [0]
+    a = 0
+    for i, (start, end) in enumerate(itertools.pairwise(edges)):
+        if i + 2 < len(edges):  # Average of the next bucket
+            next_start, next_end = end, edges[i + 2]
+            next_x = (next_start + next_end - 1) / 2
+            next_y = sum(values[next_start:next_end]) / (next_end - next_start)
+        else:  # The last bucket is followed by the last point
+            next_x, next_y = n - 1, values[-1]
+        ya = values[a]
+        dx, dy = a - next_x, next_y - ya
+        a = max(
+            range(start, end), key=lambda j: abs(dx * (values[j] - ya) - (a - j) * dy)
+        )
+        kept.append(a)
+    kept.append(n - 1)
+    return np.array(kept)
+
+
+def _downsample(frame: ResultsFrame, fields: list[str], max_points: int) -> np.ndarray:
+    """Rows to plot so every series keeps its shape with about ``max_points`` points.
+
+    The union of the LTTB picks of each series, plus the rows around the FIRE
+    date and around each parameter change, whose kinks must stay exact.
+    """
+    n_rows = len(frame)
+    per_series = max(3, max_points // len(fields))
+    keep = [_lttb(np.asarray(frame.column(field)), per_series) for field in fields]
+    index = retirement_index(frame)
+    if index is not None:
+        keep.append(np.array([index - 1, index]))
+    changes = np.array(frame.change_months, dtype=int)
+    keep.append(np.r_[changes - 1, changes])
+    rows = np.unique(np.concatenate(keep))
+    return rows[(rows >= 0) & (rows < n_rows)]
+
 
+def _create_columns(
+    frame: ResultsFrame,
+    series_data: list[tuple[str, str]],
+    max_points: int | None = None,
+) -> dict:
+    """Create the columnar chart data: shared x, age and time columns plus one
+    array of values per series.
 
-def _create_data_point(result, current_date, y_field: str):
-    """Create a standardized data point with date, y-value, age, and time info."""
-    time_years = (result.date - current_date).days / 365.25
+    Dates are milliseconds since the epoch (what ApexCharts uses internally) and
+    values are rounded to what the charts and tooltips can show. With
+    ``max_points``, longer series are downsampled with ``_downsample``.
+    """
+    rows: slice | np.ndarray = slice(None)
+    if max_points is not None and len(frame) > max_points:
+        rows = _downsample(frame, [field for _, field in series_data], max_points)
+    calendar, months = frame.calendar_rows
+    dates = calendar.datetimes[months][rows]
+    times = calendar.years_from_now[months][rows]
     return {
-        "x": result.date.isoformat(),
-        "y": getattr(result, y_field),
-        "age": result.age,
-        "time_from_now": time_years,
-        "time_from_now_text": _format_time_from_now(time_years),
+        "x": dates.astype(np.int64).tolist(),
+        "age": np.round(calendar.ages[months][rows], 3).tolist(),
+        "time_from_now": np.round(times, 3).tolist(),
+        "series": [
+            {"name": name, "data": np.round(frame.column(field)[rows], 2).tolist()}
+            for name, field in series_data
+        ],
     }
 
 
@@ -44,20 +110,17 @@ def _get_theme_colors(theme: str = "light") -> dict:
         }
 
 
-def _create_base_chart_config(
-    chart_data: dict, y_axis_title: str, theme: str = "light"
-) -> dict:
-    """Create base ApexCharts configuration with theme support."""
-    colors = _get_theme_colors(theme)
+def _create_base_chart_config(y_axis_title: str, fire_date: str | None = None) -> dict:
+    """Create base ApexCharts configuration without theme colors.
 
+    The series and the colors of the active theme (see ``THEMES``) are filled
+    in by ``static/utils.js``, so the config is sent once for all themes.
+    """
     config = {
-        "series": chart_data["series"],
         "chart": {
             "type": "area",
             "stacked": False,
             "height": 350,
-            "background": colors["background"],
-            "foreColor": colors["foreground"],
             "zoom": {"type": "x", "enabled": True, "autoScaleYaxis": True},
             "toolbar": {"show": False},
             "animations": {"enabled": True, "easing": "easeinout", "speed": 800},
@@ -77,51 +140,39 @@ def _create_base_chart_config(
         "colors": ["#ff6b35", "#6c5ce7", "#00b894", "#e17055", "#0984e3"],
         "stroke": {"curve": "smooth", "width": 2},
         "grid": {
-            "borderColor": colors["gridColor"],
             "strokeDashArray": 0,
             "xaxis": {"lines": {"show": True}},
             "yaxis": {"lines": {"show": True}},
         },
         "xaxis": {
             "type": "datetime",
-            "title": {"text": "Date", "style": {"color": colors["foreground"]}},
-            "labels": {"style": {"colors": colors["foreground"]}},
+            "title": {"text": "Date"},
         },
         "yaxis": {
-            "title": {"text": y_axis_title, "style": {"color": colors["foreground"]}},
-            "labels": {"style": {"colors": colors["foreground"]}},
+            "title": {"text": y_axis_title},
         },
         "tooltip": {
-            "theme": theme,
             "shared": True,
-            "style": {"fontSize": "12px", "color": colors["tooltipColor"]},
+            "style": {"fontSize": "12px"},
         },
         "legend": {
             "position": "top",
             "horizontalAlign": "left",
-            "labels": {"colors": colors["foreground"]},
         },
     }
 
     # Add FIRE date annotation if available
-    if chart_data.get("fire_date"):
+    if fire_date:
         # Convert ISO date string to timestamp (milliseconds since epoch) for ApexCharts
-        fire_date_dt = datetime.fromisoformat(chart_data["fire_date"])
+        fire_date_dt = datetime.fromisoformat(fire_date)
         fire_date_timestamp = int(fire_date_dt.timestamp() * 1000)
 
         config["annotations"] = {
             "xaxis": [
                 {
                     "x": fire_date_timestamp,
-                    "borderColor": colors["foreground"],
                     "strokeDashArray": 5,
-                    "label": {
-                        "text": "FIRE Date",
-                        "style": {
-                            "color": colors["foreground"],
-                            "background": colors["background"],
-                        },
-                    },
+                    "label": {"text": "FIRE Date"},
                 }
             ]
         }
@@ -129,31 +180,39 @@ def _create_base_chart_config(
     return config
 
 
-def plot_age_vs_net_worth(results: list[Results], summary: Summary):
-    """Generate complete ApexCharts configuration for net worth chart."""
-    current_date = results[0].input_data.now
+def _create_chart(
+    frame: ResultsFrame,
+    series_data: list[tuple[str, str]],
+    y_axis_title: str,
+    summary: Summary,
+    max_points: int | None,
+) -> dict:
+    """Columnar chart data with its theme-neutral config and the theme colors."""
+    return {
+        **_create_columns(frame, series_data, max_points),
+        "config": _create_base_chart_config(
+            y_axis_title, summary.fire_date.isoformat()
+        ),
+        "theme_colors": {theme: _get_theme_colors(theme) for theme in THEMES},
+    }
+
 
-    # Create data series using the helper function
+def plot_age_vs_net_worth(
+    results: ResultsFrame | list[Results],
+    summary: Summary,
+    max_points: int | None = None,
+):
+    """Generate the ApexCharts data and configuration for the net worth chart.
+
+    Pass ``max_points`` to downsample long projections (see ``_downsample``).
+    """
+    frame = ResultsFrame.coerce(results)
     series_data = [
         ("Net Worth", "nw"),
         ("Saved", "total_saved"),
         ("Profits", "total_investment_profits"),
     ]
-
-    series = []
-    for name, field in series_data:
-        data = [_create_data_point(result, current_date, field) for result in results]
-        series.append({"name": name, "data": data})
-
-    chart_data = {
-        "series": series,
-        "fire_date": summary.fire_date.isoformat(),
-    }
-
-    return {
-        "config_light": _create_base_chart_config(chart_data, "Amount ($)", "light"),
-        "config_dark": _create_base_chart_config(chart_data, "Amount ($)", "dark"),
-    }
+    return _create_chart(frame, series_data, "Amount ($)", summary, max_points)
 
 
 def plot_age_vs_monthly_safe_withdraw(results: list[Results], summary: Summary):
@@ -207,11 +266,16 @@ def plot_savings_vs_spending(results: list[Results], summary: Summary):
     }
 
 
-def plot_monthly_financial_flows(results: list[Results], summary: Summary):
-    """Generate complete ApexCharts configuration for monthly financial flows chart."""
-    current_date = results[0].input_data.now
+def plot_monthly_financial_flows(
+    results: ResultsFrame | list[Results],
+    summary: Summary,
+    max_points: int | None = None,
+):
+    """Generate the ApexCharts data and configuration for the monthly flows chart.
 
-    # Create data series using the helper function
+    Pass ``max_points`` to downsample long projections (see ``_downsample``).
+    """
+    frame = ResultsFrame.coerce(results)
     # Use actual_spending which switches to post-FIRE spending after FIRE is reached
     series_data = [
         ("Monthly Safe Withdraw", "safe_withdraw_rule_monthly"),
@@ -220,22 +284,50 @@ def plot_monthly_financial_flows(results: list[Results], summary: Summary):
         ("Savings", "saving"),
         ("Investment Profits", "investment_profits"),
     ]
+    return _create_chart(frame, series_data, "Monthly Amount ($)", summary, max_points)
 
-    series = []
-    for name, field in series_data:
-        data = [_create_data_point(result, current_date, field) for result in results]
-        series.append({"name": name, "data": data})
 
-    chart_data = {
-        "series": series,
-        "fire_date": summary.fire_date.isoformat(),
-    }
+def _create_heatmap_config(series: list, x_axis_title: str, y_axis_title: str) -> dict:
+    """Heatmap variant of the base ApexCharts configuration."""
+    config = _create_base_chart_config(y_axis_title)
+    config["series"] = series
+    config["chart"].update(type="heatmap", zoom={"enabled": False})
+    config["fill"] = {"type": "solid"}
+    config["stroke"] = {"width": 1}
+    config["dataLabels"] = {"enabled": True, "style": {"fontSize": "9px"}}
+    config["colors"] = ["#ff6b35"]
+    config["plotOptions"] = {"heatmap": {"reverseNegativeShade": True}}
+    config["xaxis"].update(type="category")
+    config["xaxis"]["title"]["text"] = x_axis_title
+    config["tooltip"]["shared"] = False
+    return config
+
+
+def plot_sweep_heatmap(
+    x_field: str,
+    x_values: list[float],
+    y_field: str | None,
+    y_values: list[float],
+    fire_ages: list,
+):
+    """Generate ApexCharts heatmap configuration of the FIRE age per sweep cell.
 
+    ``fire_ages`` is a row of ages per ``y_values`` (a single row without
+    ``y_field``), with ``None`` where FIRE is never reached.
+    """
+    rows = fire_ages if y_field is not None else [fire_ages]
+    names = [f"{y:g}" for y in y_values] if y_field is not None else ["FIRE Age"]
+    series = [
+        {
+            "name": name,
+            "data": [
+                {"x": f"{x:g}", "y": round(age, 1) if age is not None else None}
+                for x, age in zip(x_values, row, strict=True)
+            ],
+        }
+        for name, row in zip(names, rows, strict=True)
+    ]
     return {
-        "config_light": _create_base_chart_config(
-            chart_data, "Monthly Amount ($)", "light"
-        ),
-        "config_dark": _create_base_chart_config(
-            chart_data, "Monthly Amount ($)", "dark"
-        ),
+        "config": _create_heatmap_config(series, x_field, y_field or ""),
+        "theme_colors": {theme: _get_theme_colors(theme) for theme in THEMES},
     }
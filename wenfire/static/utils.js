@@ -176,16 +176,42 @@ function setupChartRendering() {
         return '$' + (val / 1_000_000).toFixed(0) + 'M';
     };
 
-    const enhanceConfig = (config) => {
-        if (config.yaxis?.labels) {
-            config.yaxis.labels.formatter = formatCurrency;
+    const formatTimeFromNow = (years) => years < 0.1 ? 'now' : `${years.toFixed(1)} yr`;
+
+    // Combine the columnar chart data and the active theme into an ApexCharts config
+    const buildConfig = (plotData, theme) => {
+        const config = structuredClone(plotData.config);
+        const colors = plotData.theme_colors[theme] || plotData.theme_colors.light;
+        const { x, age, time_from_now: timeFromNow } = plotData;
+
+        if (plotData.series) {
+            config.series = plotData.series.map(s => ({
+                name: s.name,
+                data: s.data.map((y, i) => [x[i], y]),
+            }));
+        }
+        Object.assign(config.chart, { background: colors.background, foreColor: colors.foreground });
+        config.grid = { ...config.grid, borderColor: colors.gridColor };
+        for (const axis of [config.xaxis, config.yaxis]) {
+            axis.title = { ...axis.title, style: { color: colors.foreground } };
+            axis.labels = { ...axis.labels, style: { colors: colors.foreground } };
+        }
+        config.legend = { ...config.legend, labels: { colors: colors.foreground } };
+        config.tooltip = { ...config.tooltip, theme, style: { ...config.tooltip.style, color: colors.tooltipColor } };
+        config.annotations?.xaxis?.forEach(annotation => {
+            annotation.borderColor = colors.foreground;
+            annotation.label.style = { color: colors.foreground, background: colors.background };
+        });
+        if (config.stroke && config.chart.type === 'heatmap') {
+            config.stroke.colors = [colors.background];
         }
-        if (config.tooltip) {
-            config.tooltip.custom = ({ series, seriesIndex, dataPointIndex, w }) => {
-                const data = w.config.series[seriesIndex].data[dataPointIndex];
-                const date = new Date(w.globals.seriesX[seriesIndex][dataPointIndex]);
 
-                const title = `<div class="apexcharts-tooltip-title" style="font-family: inherit; font-size: 12px;">${date.toLocaleDateString()} (Age: ${data.age.toFixed(1)}, ${data.time_from_now_text})</div>`;
+        if (config.chart.type !== 'heatmap') {
+            config.yaxis.labels.formatter = formatCurrency;
+            config.tooltip.custom = ({ series, dataPointIndex, w }) => {
+                const date = new Date(x[dataPointIndex]);
+
+                const title = `<div class="apexcharts-tooltip-title" style="font-family: inherit; font-size: 12px;">${date.toLocaleDateString()} (Age: ${age[dataPointIndex].toFixed(1)}, ${formatTimeFromNow(timeFromNow[dataPointIndex])})</div>`;
 
                 const items = series.map((s, i) => s[dataPointIndex] !== undefined ?
                     `<div class="apexcharts-tooltip-series-group apexcharts-active" style="order: 1; display: flex;">
@@ -205,6 +231,7 @@ function setupChartRendering() {
         }
         return config;
     };
+    window.buildChartConfig = buildConfig;
 
     const renderChart = (chartKey, containerId, dataKey) => {
         const container = document.querySelector(containerId);
@@ -218,15 +245,16 @@ function setupChartRendering() {
 
         const plotData = window.chartData[dataKey];
         const theme = document.documentElement.getAttribute('data-bs-theme') || 'light';
-        const config = enhanceConfig(theme === 'dark' ? plotData.config_dark : plotData.config_light);
+        const config = buildConfig(plotData, theme);
 
         window.chartInstances[chartKey] = new ApexCharts(container, config);
         window.chartInstances[chartKey].render().then(() => {
-            container.addEventListener('dblclick', () => {
-                window.chartInstances[chartKey].resetSeries();
-                const dates = config.series[0].data.map(d => new Date(d.x).getTime());
-                window.chartInstances[chartKey].zoomX(Math.min(...dates), Math.max(...dates));
-            });
+            // Assign (not add) the handler, so re-renders do not stack listeners
+            container.ondblclick = () => {
+                const chart = window.chartInstances[chartKey];
+                chart.resetSeries();
+                chart.zoomX(plotData.x[0], plotData.x[plotData.x.length - 1]);
+            };
         }).catch(error => console.error(`Error rendering ${chartKey} chart:`, error));
     };
 
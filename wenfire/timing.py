@@ -0,0 +1,126 @@
+"""Per-request timing of the stages of a request, and opt-in profiling.
+
+``TimingMiddleware`` gives every request a ``StageTimer`` (``request.state.timer``)
+and reports its stages in a ``Server-Timing`` header, which browsers show in
+the network tab. Handlers call ``timer.lap("stage")`` at the end of each stage;
+the time until the handler's first lap and the rendering after it returns are
+added as ``parse`` and ``render``.
+
+Two environment variables make it more verbose:
+
+- ``WENFIRE_TIMING_SAMPLE_RATE``: fraction of requests (e.g. ``0.01``) whose
+  breakdown is logged to the ``wenfire.timing`` logger at ``INFO`` level
+- ``WENFIRE_DEBUG=1``: allows adding ``profile=1`` to any query to get a
+  ``cProfile`` report of that request instead of its response (run with
+  ``WENFIRE_EXECUTOR=inline`` to include the simulations)
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import math
+import os
+import pstats
+import random
+import time
+from urllib.parse import parse_qs
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """Durations of consecutive stages, measured with ``lap``."""
+
+    def __init__(self) -> None:
+        self.start = self._last = time.perf_counter()
+        self.stages: dict[str, float] = {}  # Seconds per stage
+
+    def lap(self, stage: str) -> None:
+        """End ``stage`` (and start the next one) now."""
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        """The stages and total as a ``Server-Timing`` header value (in ms)."""
+        stages = [*self.stages.items(), ("total", self.total)]
+        return ", ".join(f"{name};dur={seconds * 1e3:.2f}" for name, seconds in stages)
+
+
+def _parse_sample_rate(value: str) -> float:
+    try:
+        rate = float(value)
+    except ValueError:
+        rate = math.nan
+    if not 0 <= rate <= 1:
+        raise ValueError(
+            f"WENFIRE_TIMING_SAMPLE_RATE must be a fraction from 0 to 1, not {value!r}"
+        )
+    return rate
+
+
+# Fraction of the requests whose breakdown is logged
+SAMPLE_RATE = _parse_sample_rate(os.environ.get("WENFIRE_TIMING_SAMPLE_RATE", "0"))
+
+
+def _debug() -> bool:
+    return os.environ.get("WENFIRE_DEBUG", "") not in ("", "0")
+
+
+class TimingMiddleware:
+    """ASGI middleware adding a ``StageTimer`` and ``Server-Timing`` to requests."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timer = StageTimer()
+        scope.setdefault("state", {})["timer"] = timer
+        if _debug() and "profile" in parse_qs(scope["query_string"].decode()):
+            await self._profile(scope, receive, send)
+            return
+
+        async def send_with_timing(message) -> None:
+            if message["type"] == "http.response.start":
+                if timer.stages:  # The handler lapped, the rest is rendering
+                    timer.lap("render")
+                header = timer.server_timing().encode()
+                headers = [*message.get("headers", []), (b"server-timing", header)]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+        if SAMPLE_RATE and random.random() < SAMPLE_RATE:
+            logger.info("%s %s", scope["path"], timer.server_timing())
+
+    async def _profile(self, scope, receive, send) -> None:
+        """Run the request under ``cProfile`` and respond with the report."""
+
+        async def discard(message) -> None:
+            pass
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.disable()
+        report = io.StringIO()
+        stats = pstats.Stats(profiler, stream=report)
+        stats.sort_stats("cumulative").print_stats(50)
+        body = report.getvalue().encode()
+        headers = [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})